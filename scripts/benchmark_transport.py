@@ -0,0 +1,6 @@
+"""Compare HTTP transport modes; see `cip_core.server.transport_bench`."""
+
+from cip_core.server.transport_bench import main
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""Calibrate a profile detection threshold from labelled historical layer vectors."""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from cip_core.sdk.calibration import calibrate_threshold
+from cip_core.sdk.wrappers import load_registry
+
+
+def _npy_batches(layers: Path, labels: Path, chunk_rows: int) -> Iterator[tuple[Any, Any]]:
+    matrix = np.load(layers, mmap_mode="r")
+    flags = np.load(labels, mmap_mode="r")
+    if matrix.shape[0] != flags.shape[0]:
+        raise ValueError(f"{layers} and {labels} have different row counts")
+    for start in range(0, matrix.shape[0], chunk_rows):
+        yield matrix[start : start + chunk_rows], flags[start : start + chunk_rows]
+
+
+def _csv_batches(
+    path: Path, layer_names: list[str], label_column: str, chunk_rows: int
+) -> Iterator[tuple[Any, Any]]:
+    with path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        values: list[list[float]] = []
+        flags: list[bool] = []
+        for record in reader:
+            values.append([float(record[name]) for name in layer_names])
+            flags.append(record[label_column].strip().lower() in {"1", "true", "yes"})
+            if len(values) >= chunk_rows:
+                yield values, flags
+                values, flags = [], []
+        if values:
+            yield values, flags
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("profile_name")
+    parser.add_argument("--profiles-dir", default="profiles")
+    parser.add_argument("--mode", choices=["friction", "emergence"], default="friction")
+    parser.add_argument("--csv", type=Path, help="CSV with one column per layer plus a label")
+    parser.add_argument("--label-column", default="label")
+    parser.add_argument("--layers", type=Path, help=".npy (rows, layers) layer matrix")
+    parser.add_argument("--labels", type=Path, help=".npy boolean label vector")
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--beta", type=float, default=1.0)
+    parser.add_argument("--max-alert-rate", type=float, default=None)
+    parser.add_argument("--memory-budget-mb", type=int, default=256)
+    args = parser.parse_args()
+
+    registry = load_registry(args.profiles_dir)
+    if args.csv is not None:
+        layer_names = registry.get(args.profile_name).layer_names
+        batches = _csv_batches(args.csv, layer_names, args.label_column, args.chunk_rows)
+    elif args.layers is not None and args.labels is not None:
+        batches = _npy_batches(args.layers, args.labels, args.chunk_rows)
+    else:
+        print("Provide --csv or both --layers and --labels", file=sys.stderr)
+        return 2
+
+    report = calibrate_threshold(
+        registry=registry,
+        profile_name=args.profile_name,
+        batches=batches,
+        mode=args.mode,
+        beta=args.beta,
+        max_alert_rate=args.max_alert_rate,
+        memory_budget_bytes=args.memory_budget_mb * 1024 * 1024,
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
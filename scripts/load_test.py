@@ -0,0 +1,6 @@
+"""Load-test the streamable-http server; see `cip_core.server.loadgen`."""
+
+from cip_core.server.loadgen import main
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,44 @@
+"""Score a memory-mapped .npy layer matrix into columnar .npy outputs."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from cip_core.sdk.offline import score_npy_dataset
+from cip_core.sdk.wrappers import load_registry
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("profile_name")
+    parser.add_argument("input", type=Path, help=".npy (rows, layers) layer matrix")
+    parser.add_argument("output_dir", type=Path)
+    parser.add_argument("--profiles-dir", default="profiles")
+    parser.add_argument("--mode", choices=["friction", "emergence"], default="friction")
+    parser.add_argument("--chunk-rows", type=int, default=65_536)
+    parser.add_argument("--f-time", type=float, default=1.0)
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="ignore an existing checkpoint and rescore from row 0",
+    )
+    args = parser.parse_args()
+
+    summary = score_npy_dataset(
+        registry=load_registry(args.profiles_dir),
+        profile_name=args.profile_name,
+        input_path=args.input,
+        output_dir=args.output_dir,
+        mode=args.mode,
+        chunk_rows=args.chunk_rows,
+        resume=not args.restart,
+        f_time=args.f_time,
+    )
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -14,8 +14,45 @@ class Settings(BaseSettings):
     cip_port: int = 8010
     cip_log_level: str = "info"
     cip_allow_insecure_bind: bool = False
+    cip_workers: int = 1
+    cip_stateless_http: bool = False
+    cip_json_response: bool = False
+    cip_json_encoder: str = "framework"
+    cip_warmup: bool = True
 
     cip_profiles_dir: str = "profiles"
+    cip_max_profile_yaml_bytes: int = 256 * 1024
+    cip_max_profile_batch_documents: int = 100
+    cip_profile_validation_cache_size: int = 512
+
+    cip_max_uncertainty_samples: int = 100_000
+    cip_max_batch_rows: int = 100_000
+
+    cip_history_db_path: str | None = None
+    cip_history_retention_days: float = 30.0
+    cip_history_batch_size: int = 256
+    cip_history_queue_size: int = 10_000
+    cip_history_compaction_rows: int = 100_000
+
+    cip_audit_log_path: str | None = None
+    cip_audit_max_bytes: int = 10 * 1024 * 1024
+    cip_audit_backup_count: int = 5
+    cip_audit_queue_size: int = 10_000
+
+    cip_shadow_candidates: str | None = None
+    cip_shadow_sample_rate: float = 1.0
+    cip_shadow_queue_size: int = 10_000
+    cip_shadow_max_queued_rows: int = 100_000
+
+    cip_client_id_header: str = "x-cip-client-id"
+    cip_rate_limit_client_rps: float = 0.0
+    cip_rate_limit_client_rows_per_second: float = 0.0
+    cip_rate_limit_profile_rps: float = 0.0
+    cip_rate_limit_profile_rows_per_second: float = 0.0
+    cip_rate_limit_burst_seconds: float = 1.0
+
+    cip_debug_profile_enabled: bool = False
+    cip_admin_token: str | None = None
 
 
 
@@ -4,14 +4,14 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import yaml
-
 from cip_core.domain_profiles.models import DomainProfile
 from cip_core.domain_profiles.validator import validate_profile_payload
 
 
 def load_profile_yaml(profile_yaml: str) -> DomainProfile:
     """Load and validate profile YAML string."""
+    import yaml  # deferred: scoring-only SDK callers never parse YAML
+
     payload = yaml.safe_load(profile_yaml)
     if not isinstance(payload, dict):
         raise ValueError("profile YAML root must be a mapping")
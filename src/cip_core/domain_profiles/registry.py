@@ -2,17 +2,45 @@
 
 from __future__ import annotations
 
+import copy
 from pathlib import Path
 
 from cip_core.domain_profiles.loader import load_profiles_from_directory
 from cip_core.domain_profiles.models import DomainProfile
+from cip_core.observability.tracing import span
+
+VERSION_SEPARATOR = "@"
+
+
+def _version_key(version: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in version.split("."))
+
+
+def split_profile_ref(ref: str, version: str | None = None) -> tuple[str, str | None]:
+    """Split `name@version` into its parts; an explicit `version` must agree."""
+    name, separator, pinned = ref.partition(VERSION_SEPARATOR)
+    if not separator:
+        return ref, version
+    if version is not None and version != pinned:
+        raise KeyError(f"Conflicting versions for '{name}': '{pinned}' and '{version}'")
+    return name, pinned
 
 
 class DomainProfileRegistry:
-    """Registry for validated domain profiles."""
+    """Registry for validated domain profiles.
+
+    Several versions of one domain can be registered side by side. Lookups take a
+    bare name (latest version), `name@version`, or a name plus `version`, and are
+    all single dict reads. Discovery listings are rebuilt on registration, not on
+    every call.
+    """
 
     def __init__(self, profiles: list[DomainProfile] | None = None) -> None:
         self._profiles: dict[str, DomainProfile] = {}
+        self._versions: dict[str, dict[str, DomainProfile]] = {}
+        self._latest: dict[str, DomainProfile] = {}
+        self._listing: tuple[dict[str, object], ...] = ()
+        self._all_listing: tuple[dict[str, object], ...] = ()
         for profile in profiles or []:
             self.register(profile)
 
@@ -22,22 +50,64 @@ class DomainProfileRegistry:
         return cls(load_profiles_from_directory(directory))
 
     def register(self, profile: DomainProfile) -> None:
-        """Register a profile by domain_name."""
-        if profile.domain_name in self._profiles:
-            raise ValueError(f"Profile '{profile.domain_name}' already registered")
-        self._profiles[profile.domain_name] = profile
-
-    def get(self, domain_name: str) -> DomainProfile:
-        """Return a profile or raise KeyError."""
-        if domain_name not in self._profiles:
+        """Register a profile by domain_name and version."""
+        ref = f"{profile.domain_name}{VERSION_SEPARATOR}{profile.version}"
+        if ref in self._profiles:
+            raise ValueError(f"Profile '{ref}' already registered")
+        self._profiles[ref] = profile
+        versions = self._versions.setdefault(profile.domain_name, {})
+        versions[profile.version] = profile
+        latest = self._latest.get(profile.domain_name)
+        if latest is None or _version_key(profile.version) > _version_key(latest.version):
+            self._latest[profile.domain_name] = profile
+        self._rebuild_listings()
+
+    def _rebuild_listings(self) -> None:
+        listing: list[dict[str, object]] = []
+        all_listing: list[dict[str, object]] = []
+        for name in sorted(self._versions):
+            ordered = sorted(self._versions[name], key=_version_key)
+            listing.append({**self._latest[name].descriptor(), "versions": ordered})
+            all_listing.extend(
+                {**self._versions[name][version].descriptor(), "latest": version == ordered[-1]}
+                for version in ordered
+            )
+        self._listing = tuple(listing)
+        self._all_listing = tuple(all_listing)
+
+    def get(self, domain_name: str, version: str | None = None) -> DomainProfile:
+        """Return a profile (latest unless pinned) or raise KeyError."""
+        with span("registry.get", profile=domain_name, version=version):
+            name, version = split_profile_ref(domain_name, version)
+            if version is None:
+                profile = self._latest.get(name)
+            else:
+                profile = self._profiles.get(f"{name}{VERSION_SEPARATOR}{version}")
+            if profile is not None:
+                return profile
+            if name not in self._versions:
+                raise KeyError(
+                    f"Unknown domain profile '{name}'. Available: {sorted(self._versions)}"
+                )
             raise KeyError(
-                f"Unknown domain profile '{domain_name}'. Available: {sorted(self._profiles)}"
+                f"Unknown version '{version}' of domain profile '{name}'. "
+                f"Available: {sorted(self._versions[name], key=_version_key)}"
             )
-        return self._profiles[domain_name]
 
-    def list(self) -> list[dict[str, object]]:
-        """Return profile descriptors for discovery tools."""
-        return [self._profiles[name].descriptor() for name in sorted(self._profiles)]
+    def versions(self, domain_name: str) -> list[str]:
+        """Return registered versions of a domain, oldest first."""
+        if domain_name not in self._versions:
+            raise KeyError(f"Unknown domain profile '{domain_name}'")
+        return sorted(self._versions[domain_name], key=_version_key)
+
+    def list(self, all_versions: bool = False) -> list[dict[str, object]]:
+        """Return profile descriptors for discovery tools.
+
+        One descriptor per domain (its latest version, plus `versions`), or one per
+        registered version when `all_versions` is set. Entries are copies (including
+        `versions`, `layer_names` and `thresholds`), so callers may modify them.
+        """
+        return copy.deepcopy(list(self._all_listing if all_versions else self._listing))
 
     def __len__(self) -> int:
-        return len(self._profiles)
+        return len(self._versions)
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 from typing import Any
 
-import yaml
 from pydantic import ValidationError
 
 from cip_core.domain_profiles.models import DomainProfile
@@ -29,6 +28,8 @@ def validate_profile_payload(
 
 def validate_profile_yaml(profile_yaml: str) -> tuple[bool, list[str], DomainProfile | None]:
     """Validate profile YAML text against canonical contract."""
+    import yaml
+
     try:
         payload = yaml.safe_load(profile_yaml)
     except yaml.YAMLError as exc:
@@ -1,5 +1,21 @@
 """Mantic runtime wrappers."""
 
+from cip_core.mantic.batch import (
+    DetectionBatch,
+    decode_packed_layers,
+    run_batch_detection,
+    score_batch,
+)
+from cip_core.mantic.counterfactual import run_threshold_distance
 from cip_core.mantic.runtime import run_detection
+from cip_core.mantic.uncertainty import run_uncertainty
 
-__all__ = ["run_detection"]
+__all__ = [
+    "DetectionBatch",
+    "decode_packed_layers",
+    "run_batch_detection",
+    "run_detection",
+    "run_threshold_distance",
+    "run_uncertainty",
+    "score_batch",
+]
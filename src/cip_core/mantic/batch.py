@@ -0,0 +1,342 @@
+"""Batch detection over layer matrices, including packed binary inputs."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import sys
+from collections.abc import Iterator, Mapping, Sequence
+from typing import IO, Any, Literal
+
+import numpy as np
+
+from cip_core.domain_profiles.models import DomainProfile
+from cip_core.mantic.runtime import (
+    _extract_clamped_fields,
+    _extract_rejected_fields,
+    run_detection,
+)
+from cip_core.mantic.vectorized import (
+    HIERARCHY_LEVELS,
+    BatchScores,
+    ScoringParams,
+    coerce_layer_matrix,
+    resolve_scoring_params,
+    score_matrix,
+)
+from cip_core.models.responses import AuditSummary
+from cip_core.observability.tracing import span
+
+PACKED_DTYPES = {
+    "float32": np.dtype("<f4"),
+    "float64": np.dtype("<f8"),
+}
+
+LayerMatrix = Sequence[Sequence[float]] | np.ndarray
+
+
+def decode_packed_layers(
+    buffer: bytes | bytearray | memoryview | str,
+    rows: int,
+    layer_count: int,
+    dtype: str = "float32",
+) -> np.ndarray:
+    """View a packed little-endian float buffer as a (rows, layer_count) matrix.
+
+    `buffer` is raw bytes / a memoryview in-process, or base64 text over MCP. Raw
+    buffers are wrapped without copying; no per-element Python floats are built.
+    """
+    if dtype not in PACKED_DTYPES:
+        raise ValueError(f"dtype must be one of {sorted(PACKED_DTYPES)}")
+    if rows < 0:
+        raise ValueError("rows must be >= 0")
+
+    if isinstance(buffer, str):
+        try:
+            buffer = base64.b64decode(buffer, validate=True)
+        except (binascii.Error, ValueError) as exc:
+            raise ValueError("layer_values_b64 is not valid base64") from exc
+
+    item = PACKED_DTYPES[dtype]
+    expected = rows * layer_count * item.itemsize
+    actual = memoryview(buffer).nbytes
+    if actual != expected:
+        raise ValueError(
+            f"packed buffer has {actual} bytes; expected {expected} "
+            f"({rows} rows x {layer_count} layers x {item.itemsize}-byte {dtype})"
+        )
+    return np.frombuffer(buffer, dtype=item).reshape(rows, layer_count)
+
+
+def build_batch_audit(params: ScoringParams) -> AuditSummary:
+    """Return the audit envelope shared by every row of a batch."""
+    return AuditSummary(
+        overrides_applied=params.overrides_applied,
+        clamped_fields=_extract_clamped_fields(params.overrides_applied),
+        rejected_fields=_extract_rejected_fields(params.overrides_applied),
+        calibration={
+            "domain_name": params.profile.domain_name,
+            "mode": params.mode,
+            "source": "cip-mantic-core",
+        },
+    )
+
+
+class EnvelopeView(Mapping[str, Any]):
+    """Lazy per-row view that builds the stable envelope dict only when read as a mapping.
+
+    Scalar columns (`m_score`, `alert`, `limiting_factor`, ...) are served straight
+    from the batch arrays without materializing anything.
+    """
+
+    __slots__ = ("_batch", "_envelope", "index")
+
+    def __init__(self, batch: DetectionBatch, index: int) -> None:
+        self._batch = batch
+        self.index = index
+        self._envelope: dict[str, Any] | None = None
+
+    @property
+    def m_score(self) -> float:
+        return float(self._batch.m_score[self.index])
+
+    @property
+    def alert(self) -> bool:
+        return bool(self._batch.alert[self.index])
+
+    @property
+    def limiting_factor(self) -> str:
+        return self._batch.limiting_categories[self._batch.limiting_codes[self.index]]
+
+    @property
+    def dominant(self) -> str:
+        return self._batch.dominant_categories[self._batch.dominant_codes[self.index]]
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._envelope is not None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the full `DetectionEnvelope` dict for this row, building it once."""
+        if self._envelope is None:
+            self._envelope = self._batch.materialize(self.index)
+        return self._envelope
+
+    def __getitem__(self, key: str) -> Any:
+        return self.to_dict()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+
+class DetectionBatch:
+    """Array-backed batch results: parallel typed columns instead of per-row dicts.
+
+    Categorical columns (`limiting_factor`, `dominant`) are stored as int8 codes
+    into interned category tuples. Row envelopes are produced lazily by
+    `__getitem__`, which re-runs `run_detection` for that row with the same
+    overrides so the materialized dict is exactly the single-call contract.
+    """
+
+    def __init__(
+        self,
+        params: ScoringParams,
+        layer_values: np.ndarray,
+        m_score: np.ndarray,
+        alert: np.ndarray,
+        detection_statistic: np.ndarray,
+        limiting_codes: np.ndarray,
+        attribution: np.ndarray,
+        coherence: np.ndarray,
+        dominant_codes: np.ndarray,
+        request: dict[str, Any],
+    ) -> None:
+        self.params = params
+        self.layer_values = layer_values
+        self.m_score = m_score
+        self.alert = alert
+        self.detection_statistic = detection_statistic
+        self.limiting_codes = limiting_codes
+        self.attribution = attribution
+        self.coherence = coherence
+        self.dominant_codes = dominant_codes
+        self.limiting_categories = tuple(sys.intern(name) for name in params.layer_names)
+        self.dominant_categories = tuple(sys.intern(level) for level in HIERARCHY_LEVELS)
+        self._request = request
+        self._audit: AuditSummary | None = None
+
+    @classmethod
+    def from_scores(
+        cls, params: ScoringParams, scores: BatchScores, request: dict[str, Any]
+    ) -> DetectionBatch:
+        """Pack `score_matrix` output into compact column dtypes."""
+        return cls(
+            params=params,
+            layer_values=scores.layer_values,
+            m_score=scores.m_score,
+            alert=scores.alert,
+            detection_statistic=scores.detection_statistic.astype(np.float32),
+            limiting_codes=scores.limiting_index.astype(np.int8),
+            attribution=scores.attribution.astype(np.float32),
+            coherence=scores.coherence.astype(np.float32),
+            dominant_codes=scores.dominant_index.astype(np.int8),
+            request=request,
+        )
+
+    def __len__(self) -> int:
+        return int(self.m_score.shape[0])
+
+    def __getitem__(self, index: int) -> EnvelopeView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("batch row index out of range")
+        return EnvelopeView(self, index)
+
+    def __iter__(self) -> Iterator[EnvelopeView]:
+        for index in range(len(self)):
+            yield EnvelopeView(self, index)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the result columns (excluding the input matrix)."""
+        return sum(
+            column.nbytes
+            for column in (
+                self.m_score,
+                self.alert,
+                self.detection_statistic,
+                self.limiting_codes,
+                self.attribution,
+                self.coherence,
+                self.dominant_codes,
+            )
+        )
+
+    @property
+    def audit(self) -> AuditSummary:
+        if self._audit is None:
+            self._audit = build_batch_audit(self.params)
+        return self._audit
+
+    def materialize(self, index: int) -> dict[str, Any]:
+        """Build the full single-call envelope dict for one row."""
+        return run_detection(
+            profile=self.params.profile,
+            layer_values=self.layer_values[index].tolist(),
+            mode=self.params.mode,
+            **self._request,
+        )
+
+    def row_record(self, index: int) -> dict[str, Any]:
+        """Compact JSON-ready record for one row."""
+        return {
+            "row": index,
+            "m_score": float(self.m_score[index]),
+            "alert": bool(self.alert[index]),
+            "detection_statistic": float(self.detection_statistic[index]),
+            "limiting_factor": self.limiting_categories[self.limiting_codes[index]],
+            "dominant": self.dominant_categories[self.dominant_codes[index]],
+            "coherence": float(self.coherence[index]),
+            "layer_attribution": dict(
+                zip(self.limiting_categories, self.attribution[index].tolist(), strict=True)
+            ),
+        }
+
+    def to_columns(self) -> dict[str, Any]:
+        """Return the columnar `results` block used by the batch tool."""
+        layer_names = self.limiting_categories
+        return {
+            "m_score": self.m_score.tolist(),
+            "alert": self.alert.tolist(),
+            "detection_statistic": self.detection_statistic.tolist(),
+            "limiting_factor": [layer_names[code] for code in self.limiting_codes.tolist()],
+            "dominant": [self.dominant_categories[code] for code in self.dominant_codes.tolist()],
+            "coherence": self.coherence.tolist(),
+            "layer_attribution": {
+                name: self.attribution[:, col].tolist() for col, name in enumerate(layer_names)
+            },
+        }
+
+    def to_payload(self) -> dict[str, Any]:
+        """Return the columnar batch response payload."""
+        return {
+            "status": "ok",
+            "contract_version": "1.0.0",
+            "domain_profile": self.params.profile.descriptor(),
+            "mode": self.params.mode,
+            "rows": len(self),
+            "threshold": self.params.threshold,
+            "results": self.to_columns(),
+            "audit": self.audit.model_dump(),
+        }
+
+    def iter_ndjson(self, *, envelopes: bool = False) -> Iterator[str]:
+        """Yield one JSON line per row: compact records, or full envelopes if requested."""
+        for index in range(len(self)):
+            record = self.materialize(index) if envelopes else self.row_record(index)
+            yield json.dumps(record, separators=(",", ":")) + "\n"
+
+    def write_ndjson(self, stream: IO[str], *, envelopes: bool = False) -> int:
+        """Write all rows to `stream` as NDJSON and return the number of lines."""
+        count = 0
+        for line in self.iter_ndjson(envelopes=envelopes):
+            stream.write(line)
+            count += 1
+        return count
+
+
+def score_batch(
+    profile: DomainProfile,
+    layer_values: LayerMatrix,
+    mode: Literal["friction", "emergence"],
+    f_time: float = 1.0,
+    threshold_override: dict[str, float] | None = None,
+    temporal_config: dict[str, Any] | None = None,
+    interaction_mode: Literal["dynamic", "base"] = "dynamic",
+    interaction_override: dict[str, float] | list[float] | None = None,
+    interaction_override_mode: Literal["scale", "replace"] = "scale",
+) -> DetectionBatch:
+    """Score a layer matrix in one vectorized pass into a `DetectionBatch`."""
+    request = {
+        "f_time": f_time,
+        "threshold_override": threshold_override,
+        "temporal_config": temporal_config,
+        "interaction_mode": interaction_mode,
+        "interaction_override": interaction_override,
+        "interaction_override_mode": interaction_override_mode,
+    }
+    with span("mantic.score_batch", profile=profile.domain_name, mode=mode) as current:
+        params = resolve_scoring_params(profile, mode, **request)
+        matrix = coerce_layer_matrix(layer_values, len(profile.layer_names))
+        current.set_attribute("batch_size", int(matrix.shape[0]))
+        return DetectionBatch.from_scores(params, score_matrix(params, matrix), request)
+
+
+def run_batch_detection(
+    profile: DomainProfile,
+    layer_values: LayerMatrix,
+    mode: Literal["friction", "emergence"],
+    f_time: float = 1.0,
+    threshold_override: dict[str, float] | None = None,
+    temporal_config: dict[str, Any] | None = None,
+    interaction_mode: Literal["dynamic", "base"] = "dynamic",
+    interaction_override: dict[str, float] | list[float] | None = None,
+    interaction_override_mode: Literal["scale", "replace"] = "scale",
+) -> dict[str, Any]:
+    """Score a layer matrix in one vectorized pass and return columnar results."""
+    return score_batch(
+        profile=profile,
+        layer_values=layer_values,
+        mode=mode,
+        f_time=f_time,
+        threshold_override=threshold_override,
+        temporal_config=temporal_config,
+        interaction_mode=interaction_mode,
+        interaction_override=interaction_override,
+        interaction_override_mode=interaction_override_mode,
+    ).to_payload()
@@ -0,0 +1,185 @@
+"""Closed-form threshold distance solver for intervention planning.
+
+Alerts fire on the detection statistic, not on M: the cross-layer range
+(max - min) in friction mode and the floor (min) in emergence mode, compared
+against the detection threshold T. Moving one layer j to value v while the other
+layers keep their min `lo` and max `hi` gives
+
+    friction:   stat(v) = max(v, hi) - min(v, lo)  <= T  iff  v in [hi - T, lo + T]
+    emergence:  stat(v) = min(v, lo)               >  T  iff  lo > T and v > T
+
+so the single-layer move onto the alert boundary is closed-form per layer, and is
+feasible when the target stays inside the [0, 1] clamp. Any further move in the
+same direction flips `alert`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import numpy as np
+
+from cip_core.domain_profiles.models import DomainProfile
+from cip_core.mantic.vectorized import (
+    ScoringParams,
+    coerce_layer_matrix,
+    resolve_scoring_params,
+    score_matrix,
+)
+
+
+@dataclass(frozen=True)
+class ThresholdDistance:
+    """Per-row, per-layer solution arrays from `solve_threshold_distance`."""
+
+    m_score: np.ndarray
+    detection_statistic: np.ndarray
+    alert: np.ndarray
+    gap: np.ndarray
+    required_delta: np.ndarray
+    target_value: np.ndarray
+    feasible: np.ndarray
+    cheapest_layer: np.ndarray
+    cheapest_delta: np.ndarray
+
+
+def _others_extrema(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(rows, layers) min and max of every row excluding each layer in turn."""
+    rows = np.arange(matrix.shape[0])[:, None]
+    ordered = np.sort(matrix, axis=1)
+    is_min = np.zeros(matrix.shape, dtype=bool)
+    is_max = np.zeros(matrix.shape, dtype=bool)
+    is_min[rows, matrix.argmin(axis=1)[:, None]] = True
+    is_max[rows, matrix.argmax(axis=1)[:, None]] = True
+    lo = np.where(is_min, ordered[:, [1]], ordered[:, [0]])
+    hi = np.where(is_max, ordered[:, [-2]], ordered[:, [-1]])
+    return lo, hi
+
+
+def solve_threshold_distance(params: ScoringParams, matrix: np.ndarray) -> ThresholdDistance:
+    """Solve the minimal single-layer move onto the alert boundary for every row.
+
+    `required_delta` moves the detection statistic exactly onto the threshold
+    (the last non-alerting value); it is NaN for layers whose value cannot change
+    the alert state. `cheapest_layer` is -1 (and `cheapest_delta` NaN) when no
+    single layer can flip the row inside [0, 1].
+    """
+    scores = score_matrix(params, matrix)
+    threshold = params.threshold
+    values = matrix.astype(np.float64)
+    alert = scores.alert[:, None]
+
+    if values.shape[1] < 2:
+        target = np.full(values.shape, threshold)
+        possible = np.ones(values.shape, dtype=bool)
+    else:
+        lo, hi = _others_extrema(values)
+        if params.mode == "friction":
+            low_edge, high_edge = hi - threshold, lo + threshold
+            # Round the edges inward so the rescored range never exceeds T by an ulp.
+            low_edge = np.where(hi - low_edge > threshold, np.nextafter(low_edge, 2.0), low_edge)
+            high_edge = np.where(
+                high_edge - lo > threshold, np.nextafter(high_edge, -1.0), high_edge
+            )
+            # Other layers alone already span more than T: j cannot end the alert.
+            possible = hi - lo <= threshold
+            nearest_edge = np.where(
+                np.abs(values - low_edge) <= np.abs(high_edge - values), low_edge, high_edge
+            )
+            # Alerting rows clip j into the window; quiet rows push j to its nearer
+            # edge, falling back to the other edge when the nearer one leaves [0, 1].
+            other_edge = np.where(nearest_edge == low_edge, high_edge, low_edge)
+            nearest_ok = (nearest_edge >= 0.0) & (nearest_edge <= 1.0)
+            quiet_target = np.where(nearest_ok, nearest_edge, other_edge)
+            target = np.where(alert, np.clip(values, low_edge, high_edge), quiet_target)
+        else:
+            possible = lo > threshold
+            target = np.full(values.shape, threshold)
+
+    required = np.where(possible, target - values, np.nan)
+    target = np.where(possible, target, np.nan)
+    feasible = possible & (target >= 0.0) & (target <= 1.0)
+
+    cost = np.where(feasible, np.abs(required), np.inf)
+    cheapest = cost.argmin(axis=1)
+    rows = np.arange(values.shape[0])
+    has_move = np.isfinite(cost[rows, cheapest])
+
+    return ThresholdDistance(
+        m_score=scores.m_score,
+        detection_statistic=scores.detection_statistic,
+        alert=scores.alert,
+        gap=threshold - scores.detection_statistic,
+        required_delta=required,
+        target_value=target,
+        feasible=feasible,
+        cheapest_layer=np.where(has_move, cheapest, -1),
+        cheapest_delta=np.where(has_move, required[rows, cheapest], np.nan),
+    )
+
+
+def _optional_float(value: float) -> float | None:
+    return float(value) if np.isfinite(value) else None
+
+
+def run_threshold_distance(
+    profile: DomainProfile,
+    layer_values: Sequence[Sequence[float]] | Sequence[float],
+    mode: Literal["friction", "emergence"],
+    f_time: float = 1.0,
+    threshold_override: dict[str, float] | None = None,
+    temporal_config: dict[str, Any] | None = None,
+    interaction_mode: Literal["dynamic", "base"] = "dynamic",
+    interaction_override: dict[str, float] | list[float] | None = None,
+    interaction_override_mode: Literal["scale", "replace"] = "scale",
+) -> dict[str, Any]:
+    """Return per-layer threshold distances for one vector or a batch of vectors."""
+    params = resolve_scoring_params(
+        profile,
+        mode,
+        f_time=f_time,
+        threshold_override=threshold_override,
+        temporal_config=temporal_config,
+        interaction_mode=interaction_mode,
+        interaction_override=interaction_override,
+        interaction_override_mode=interaction_override_mode,
+    )
+    matrix = coerce_layer_matrix(layer_values, len(profile.layer_names))
+    solution = solve_threshold_distance(params, matrix)
+    layer_names = profile.layer_names
+
+    rows: list[dict[str, Any]] = []
+    for idx in range(matrix.shape[0]):
+        cheapest = int(solution.cheapest_layer[idx])
+        rows.append(
+            {
+                "m_score": float(solution.m_score[idx]),
+                "detection_statistic": float(solution.detection_statistic[idx]),
+                "alert": bool(solution.alert[idx]),
+                "gap": float(solution.gap[idx]),
+                "layers": {
+                    name: {
+                        "current_value": float(matrix[idx, col]),
+                        "required_delta": _optional_float(solution.required_delta[idx, col]),
+                        "target_value": _optional_float(solution.target_value[idx, col]),
+                        "feasible": bool(solution.feasible[idx, col]),
+                    }
+                    for col, name in enumerate(layer_names)
+                },
+                "cheapest_layer": layer_names[cheapest] if cheapest >= 0 else None,
+                "cheapest_delta": _optional_float(solution.cheapest_delta[idx]),
+            }
+        )
+
+    return {
+        "status": "ok",
+        "domain_profile": profile.descriptor(),
+        "mode": mode,
+        "threshold": params.threshold,
+        "f_time": params.f_time,
+        "count": len(rows),
+        "rows": rows,
+        "overrides_applied": params.overrides_applied,
+    }
@@ -0,0 +1,125 @@
+"""Canonicalized, memoized resolution of temporal kernel configs.
+
+Callers commonly resend the same `temporal_config` (e.g. one `s_curve` with fixed
+parameters) on every request. `resolve_temporal_config` validates it with the
+mantic-thinking governance rules and evaluates f(t) once per canonical config,
+keeping the multiplier plus the clamp/reject audit metadata in a bounded LRU.
+Profile allowlists are still enforced per call by `_enforce_temporal_allowlist`
+before anything here is consulted.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from cip_core.utils.lru import LRUCache
+
+# generic_detect validates temporal configs against the "generic" allowlist; the
+# profile allowlist is enforced separately by `_enforce_temporal_allowlist`.
+GENERIC_DOMAIN_KEY = "generic"
+
+def _reject_non_json(value: Any) -> Any:
+    raise TypeError(f"{type(value).__name__} is not canonicalizable")
+
+
+def canonical_key(value: Any) -> str | None:
+    """Return a stable key for JSON-like override payloads, or None if uncacheable.
+
+    Mapping keys are sorted so equal configs in any insertion order share a key.
+    Ints and floats stay distinct (`1` vs `1.0`) since the audit echoes them back.
+    """
+    try:
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), default=_reject_non_json)
+    except (TypeError, ValueError):
+        return None
+
+
+def _copy_meta(meta: dict[str, Any]) -> dict[str, Any]:
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in meta.items()}
+
+
+@dataclass(frozen=True)
+class TemporalResolution:
+    """Validated temporal config, its f(t) (None if not computable) and audit metadata."""
+
+    kernel_f_time: float | None
+    applied: dict[str, Any] | None
+    rejected: dict[str, Any]
+    clamped: dict[str, Any]
+
+    def effective_f_time(self, f_time: float) -> float:
+        """f(t) when the kernel was evaluated, otherwise the caller's `f_time`."""
+        return self.kernel_f_time if self.kernel_f_time is not None else f_time
+
+    def audit_entry(self, requested: dict[str, Any]) -> dict[str, Any]:
+        """Fresh `overrides_applied["temporal_config"]` block for one response."""
+        return {
+            "requested": requested,
+            "applied": dict(self.applied) if self.applied is not None else None,
+            "rejected": _copy_meta(self.rejected) or None,
+            "clamped": _copy_meta(self.clamped) or None,
+        }
+
+
+def _import_temporal():
+    try:
+        from mantic_thinking.core.mantic_kernel import compute_temporal_kernel
+        from mantic_thinking.core.validators import validate_temporal_config
+    except ImportError as exc:  # pragma: no cover
+        raise RuntimeError("mantic-thinking is not installed") from exc
+    return validate_temporal_config, compute_temporal_kernel
+
+
+def _evaluate_temporal_config(temporal_config: dict[str, Any]) -> TemporalResolution:
+    validate_temporal_config, compute_temporal_kernel = _import_temporal()
+    validated, rejected, clamped = validate_temporal_config(
+        temporal_config, domain=GENERIC_DOMAIN_KEY
+    )
+    for key, reason in (
+        ("kernel_type", "kernel_type required and must be a valid kernel type"),
+        ("t", "t required for temporal_config"),
+    ):
+        if key not in validated and key not in rejected:
+            rejected[key] = {"requested": temporal_config.get(key), "reason": reason}
+    if "kernel_type" in validated and "t" in validated:
+        return TemporalResolution(
+            kernel_f_time=compute_temporal_kernel(**validated),
+            applied=validated,
+            rejected=rejected,
+            clamped=clamped,
+        )
+    return TemporalResolution(None, None, rejected, clamped)
+
+
+_TEMPORAL_CACHE = LRUCache(max_entries=1024)
+
+
+def resolve_temporal_config(temporal_config: dict[str, Any]) -> TemporalResolution:
+    """Validate `temporal_config` and evaluate f(t), memoized per canonical config."""
+    key = canonical_key(temporal_config)
+    if key is None:
+        return _evaluate_temporal_config(temporal_config)
+    return _TEMPORAL_CACHE.get_or_compute(key, lambda: _evaluate_temporal_config(temporal_config))
+
+
+def with_temporal_audit(
+    overrides_applied: dict[str, Any], temporal_entry: dict[str, Any]
+) -> dict[str, Any]:
+    """Insert a `temporal_config` audit block where `build_overrides_audit` puts it."""
+    spliced: dict[str, Any] = {}
+    if "threshold_overrides" in overrides_applied:
+        spliced["threshold_overrides"] = overrides_applied["threshold_overrides"]
+    spliced["temporal_config"] = temporal_entry
+    for key, value in overrides_applied.items():
+        spliced.setdefault(key, value)
+    return spliced
+
+
+def temporal_cache_stats() -> dict[str, int]:
+    return _TEMPORAL_CACHE.stats()
+
+
+def clear_temporal_cache() -> None:
+    _TEMPORAL_CACHE.clear()
@@ -5,7 +5,9 @@ from __future__ import annotations
 from typing import Any, Literal
 
 from cip_core.domain_profiles.models import DomainProfile
+from cip_core.mantic.overrides import resolve_temporal_config, with_temporal_audit
 from cip_core.models.responses import AuditSummary, DetectionEnvelope
+from cip_core.observability.tracing import span
 
 
 def _validate_layer_values(layer_values: list[float], layer_count: int) -> list[float]:
@@ -109,33 +111,88 @@ def run_detection(
     interaction_override_mode: Literal["scale", "replace"] = "scale",
 ) -> dict[str, Any]:
     """Run constrained Mantic detection and return normalized envelope."""
+    with span(
+        "mantic.run_detection",
+        profile=profile.domain_name,
+        profile_version=profile.version,
+        mode=mode,
+        layer_count=len(profile.layer_names),
+    ) as current:
+        envelope = _run_detection(
+            profile=profile,
+            layer_values=layer_values,
+            mode=mode,
+            f_time=f_time,
+            threshold_override=threshold_override,
+            temporal_config=temporal_config,
+            interaction_mode=interaction_mode,
+            interaction_override=interaction_override,
+            interaction_override_mode=interaction_override_mode,
+        )
+        current.set_attribute("m_score", envelope["result"].get("m_score"))
+        return envelope
+
+
+def _run_detection(
+    profile: DomainProfile,
+    layer_values: list[float],
+    mode: Literal["friction", "emergence"],
+    f_time: float,
+    threshold_override: dict[str, float] | None,
+    temporal_config: dict[str, Any] | None,
+    interaction_mode: Literal["dynamic", "base"],
+    interaction_override: dict[str, float] | list[float] | None,
+    interaction_override_mode: Literal["scale", "replace"],
+) -> dict[str, Any]:
     if mode not in {"friction", "emergence"}:
         raise ValueError("mode must be 'friction' or 'emergence'")
 
     normalized_values = _validate_layer_values(layer_values, len(profile.layer_names))
     _enforce_temporal_allowlist(profile, temporal_config)
 
+    # Resolve f(t) from the memoized config and splice its audit block back in, so
+    # generic_detect does not re-validate and re-evaluate the same kernel.
+    temporal = None
+    if temporal_config and isinstance(temporal_config, dict):
+        temporal = resolve_temporal_config(temporal_config)
+        f_time = temporal.effective_f_time(f_time)
+
     try:
         from mantic_thinking.tools.generic_detect import detect
     except ImportError as exc:  # pragma: no cover
         raise RuntimeError("mantic-thinking is not installed") from exc
 
-    result = detect(
-        domain_name=profile.domain_name,
-        layer_names=profile.layer_names,
-        weights=profile.weights,
-        layer_values=normalized_values,
-        mode=mode,
-        f_time=f_time,
-        threshold_override=threshold_override,
-        temporal_config=temporal_config,
-        interaction_mode=interaction_mode,
-        interaction_override=interaction_override,
-        interaction_override_mode=interaction_override_mode,
-        layer_hierarchy=profile.hierarchy,
-        detection_threshold=profile.detection_threshold,
-    )
+    with span("mantic.detect", profile=profile.domain_name, mode=mode):
+        result = detect(
+            domain_name=profile.domain_name,
+            layer_names=profile.layer_names,
+            weights=profile.weights,
+            layer_values=normalized_values,
+            mode=mode,
+            f_time=f_time,
+            threshold_override=threshold_override,
+            temporal_config=temporal_config if temporal is None else None,
+            interaction_mode=interaction_mode,
+            interaction_override=interaction_override,
+            interaction_override_mode=interaction_override_mode,
+            layer_hierarchy=profile.hierarchy,
+            detection_threshold=profile.detection_threshold,
+        )
+    if temporal is not None:
+        result["overrides_applied"] = with_temporal_audit(
+            result.get("overrides_applied") or {}, temporal.audit_entry(temporal_config)
+        )
 
+    with span("mantic.envelope"):
+        return _build_envelope(profile, mode, normalized_values, result)
+
+
+def _build_envelope(
+    profile: DomainProfile,
+    mode: str,
+    normalized_values: list[float],
+    result: dict[str, Any],
+) -> dict[str, Any]:
     overrides_applied = result.get("overrides_applied") or {}
     audit = AuditSummary(
         overrides_applied=overrides_applied,
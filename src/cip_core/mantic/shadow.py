@@ -0,0 +1,329 @@
+"""Off-request-path shadow scoring of candidate profile versions.
+
+Primary detections return as usual; a sampled copy of their inputs is queued to a
+background worker that scores them under both the served version and a candidate
+version and aggregates how the two diverge.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from cip_core.domain_profiles.models import DomainProfile
+from cip_core.domain_profiles.registry import DomainProfileRegistry, split_profile_ref
+from cip_core.mantic.batch import score_batch
+from cip_core.persistence.writer import BatchWriter
+
+logger = logging.getLogger(__name__)
+
+# |M-score delta| histogram resolution; quantiles are read off bin upper edges.
+_DELTA_BINS = np.concatenate([np.linspace(0.0, 0.1, 101)[1:], np.linspace(0.1, 1.0, 91)[1:]])
+_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def parse_shadow_candidates(spec: str | None) -> dict[str, str]:
+    """Parse `name@version,name@version` into a domain -> candidate version mapping."""
+    candidates: dict[str, str] = {}
+    for ref in filter(None, (item.strip() for item in (spec or "").split(","))):
+        name, version = split_profile_ref(ref)
+        if not version:
+            raise ValueError(f"shadow candidate '{ref}' must be name@version")
+        candidates[name] = version
+    return candidates
+
+
+@dataclass
+class _ShadowItem:
+    primary: DomainProfile
+    candidate: DomainProfile
+    mode: str
+    request: dict[str, Any]
+    layer_values: np.ndarray
+
+
+@dataclass
+class _Divergence:
+    """Running divergence of one primary -> candidate version pair."""
+
+    rows: int = 0
+    delta_sum: float = 0.0
+    delta_sq_sum: float = 0.0
+    delta_min: float = float("inf")
+    delta_max: float = float("-inf")
+    abs_histogram: np.ndarray = field(
+        default_factory=lambda: np.zeros(len(_DELTA_BINS) + 1, dtype=np.int64)
+    )
+    alerts_primary: int = 0
+    alerts_candidate: int = 0
+    alerts_gained: int = 0
+    alerts_lost: int = 0
+    limiting_changes: int = 0
+    limiting_transitions: Counter[str] = field(default_factory=Counter)
+
+    def update(self, primary, candidate) -> None:
+        delta = candidate.m_score.astype(np.float64) - primary.m_score.astype(np.float64)
+        self.rows += int(delta.size)
+        self.delta_sum += float(delta.sum())
+        self.delta_sq_sum += float(np.square(delta).sum())
+        self.delta_min = min(self.delta_min, float(delta.min()))
+        self.delta_max = max(self.delta_max, float(delta.max()))
+        self.abs_histogram += np.bincount(
+            np.searchsorted(_DELTA_BINS, np.abs(delta)), minlength=len(self.abs_histogram)
+        )
+
+        self.alerts_primary += int(primary.alert.sum())
+        self.alerts_candidate += int(candidate.alert.sum())
+        self.alerts_gained += int((candidate.alert & ~primary.alert).sum())
+        self.alerts_lost += int((primary.alert & ~candidate.alert).sum())
+
+        changed = np.flatnonzero(primary.limiting_codes != candidate.limiting_codes)
+        self.limiting_changes += int(changed.size)
+        for before, after in zip(
+            primary.limiting_codes[changed].tolist(),
+            candidate.limiting_codes[changed].tolist(),
+            strict=True,
+        ):
+            self.limiting_transitions[
+                f"{primary.limiting_categories[before]}->{candidate.limiting_categories[after]}"
+            ] += 1
+
+    def _abs_quantile(self, q: float) -> float:
+        target = q * self.rows
+        index = int(np.searchsorted(np.cumsum(self.abs_histogram), target))
+        return float(_DELTA_BINS[min(index, len(_DELTA_BINS) - 1)])
+
+    def summary(self) -> dict[str, Any]:
+        if not self.rows:
+            return {"rows": 0}
+        mean = self.delta_sum / self.rows
+        variance = max(0.0, self.delta_sq_sum / self.rows - mean * mean)
+        flips = self.alerts_gained + self.alerts_lost
+        return {
+            "rows": self.rows,
+            "m_score_delta": {
+                "mean": mean,
+                "std": variance**0.5,
+                "min": self.delta_min,
+                "max": self.delta_max,
+                **{f"abs_p{round(q * 100)}": self._abs_quantile(q) for q in _QUANTILES},
+            },
+            "alerts": {
+                "primary": self.alerts_primary,
+                "candidate": self.alerts_candidate,
+                "gained": self.alerts_gained,
+                "lost": self.alerts_lost,
+                "flip_rate": flips / self.rows,
+            },
+            "limiting_factor": {
+                "changed": self.limiting_changes,
+                "change_rate": self.limiting_changes / self.rows,
+                "transitions": dict(self.limiting_transitions.most_common()),
+            },
+        }
+
+
+def _as_rows(layer_values: Any) -> Any:
+    """View one vector or a matrix as a row sequence without copying its values."""
+    if isinstance(layer_values, np.ndarray):
+        return layer_values if layer_values.ndim == 2 else layer_values.reshape(1, -1)
+    if len(layer_values) and isinstance(layer_values[0], (list, tuple, np.ndarray)):
+        return layer_values
+    return [layer_values]
+
+
+class ShadowScorer:
+    """Sample detection inputs and compare served vs candidate profile versions.
+
+    `submit` is called on the request path and only samples and enqueues; scoring
+    happens on a `BatchWriter` thread. Queued items with the same profiles, mode and
+    overrides are stacked and scored in one vectorized pass per version. Row
+    indices are sampled before anything is copied, so only sampled rows are
+    materialized. The queue is bounded by `max_queue` items and by
+    `max_queued_rows` rows awaiting scoring; samples that would exceed either are
+    dropped and counted.
+    """
+
+    def __init__(
+        self,
+        registry: DomainProfileRegistry,
+        candidates: Mapping[str, str],
+        *,
+        sample_rate: float = 1.0,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        max_queue: int = 10_000,
+        max_queued_rows: int = 100_000,
+        seed: int | None = None,
+    ) -> None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if max_queued_rows < 1:
+            raise ValueError("max_queued_rows must be >= 1")
+        self._candidates = {
+            name: registry.get(name, version) for name, version in candidates.items()
+        }
+        self._sample_rate = sample_rate
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._seen = 0
+        self._sampled = 0
+        self._max_queued_rows = max_queued_rows
+        self._queued_rows = 0
+        self._skipped = Counter[str]()
+        self._divergence: dict[tuple[str, str, str], _Divergence] = {}
+        self._writer = BatchWriter(
+            self._score,
+            name="cip-shadow-scorer",
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            max_queue=max_queue,
+        )
+
+    @property
+    def sample_rate(self) -> float:
+        return self._sample_rate
+
+    def set_sample_rate(self, sample_rate: float) -> None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self._sample_rate = sample_rate
+
+    def submit(
+        self,
+        profile: DomainProfile,
+        layer_values: Any,
+        *,
+        mode: str,
+        **request: Any,
+    ) -> int:
+        """Queue a sample of one detection's (or one batch's) rows; return rows queued."""
+        candidate = self._candidates.get(profile.domain_name)
+        if candidate is None:
+            return 0
+        rows = _as_rows(layer_values)
+        count = len(rows)
+        width = len(rows[0]) if count else 0
+        with self._lock:
+            self._seen += count
+            if candidate.version == profile.version:
+                self._skipped["same_version"] += count
+                return 0
+            if len(candidate.layer_names) != width:
+                self._skipped["layer_mismatch"] += count
+                return 0
+            if self._sample_rate < 1.0:
+                picked = np.flatnonzero(self._rng.random(count) < self._sample_rate)
+            else:
+                picked = np.arange(count)
+            if not picked.size:
+                return 0
+            if self._queued_rows + picked.size > self._max_queued_rows:
+                self._skipped["queue_full"] += int(picked.size)
+                return 0
+            self._queued_rows += int(picked.size)
+        # Copy only the sampled rows: the caller may reuse its buffer afterwards.
+        if isinstance(rows, np.ndarray):
+            matrix = rows[picked].astype(np.float64)
+        else:
+            matrix = np.array([rows[index] for index in picked.tolist()], dtype=np.float64)
+        item = _ShadowItem(profile, candidate, mode, dict(request), matrix)
+        if not self._writer.submit(item):
+            with self._lock:
+                self._queued_rows -= int(picked.size)
+            return 0
+        with self._lock:
+            self._sampled += int(picked.size)
+        return int(picked.size)
+
+    def _score(self, items: list[_ShadowItem]) -> None:
+        try:
+            self._score_groups(items)
+        finally:
+            with self._lock:
+                self._queued_rows -= sum(item.layer_values.shape[0] for item in items)
+
+    def _score_groups(self, items: list[_ShadowItem]) -> None:
+        groups: dict[tuple[Any, ...], list[_ShadowItem]] = {}
+        for item in items:
+            key = (
+                item.primary.version,
+                item.candidate.domain_name,
+                item.candidate.version,
+                item.mode,
+                json.dumps(item.request, sort_keys=True, default=str),
+            )
+            groups.setdefault(key, []).append(item)
+
+        for group in groups.values():
+            first = group[0]
+            matrix = np.concatenate([item.layer_values for item in group])
+            # One rejected group (e.g. a candidate whose allowlist refuses the
+            # request's overrides) must not drop the rest of the batch.
+            try:
+                primary = score_batch(first.primary, matrix, first.mode, **first.request)
+                candidate = score_batch(first.candidate, matrix, first.mode, **first.request)
+            except Exception:
+                logger.exception(
+                    "shadow scoring of %s %s -> %s failed",
+                    first.primary.domain_name,
+                    first.primary.version,
+                    first.candidate.version,
+                )
+                with self._lock:
+                    self._skipped["candidate_error"] += int(matrix.shape[0])
+                continue
+            pair = (first.primary.domain_name, first.primary.version, first.candidate.version)
+            with self._lock:
+                self._divergence.setdefault(pair, _Divergence()).update(primary, candidate)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every queued sample has been scored; False on timeout."""
+        return self._writer.flush(timeout)
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def reset(self) -> None:
+        """Clear divergence statistics (queued samples are still scored)."""
+        with self._lock:
+            self._seen = 0
+            self._sampled = 0
+            self._skipped.clear()
+            self._divergence.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return sampling counters, queue state and per-version-pair divergence."""
+        with self._lock:
+            comparisons = [
+                {
+                    "domain_name": name,
+                    "primary_version": primary_version,
+                    "candidate_version": candidate_version,
+                    **divergence.summary(),
+                }
+                for (name, primary_version, candidate_version), divergence in sorted(
+                    self._divergence.items()
+                )
+            ]
+            counters = {
+                "seen_rows": self._seen,
+                "sampled_rows": self._sampled,
+                "queued_rows": self._queued_rows,
+                "max_queued_rows": self._max_queued_rows,
+                "skipped_rows": dict(self._skipped),
+            }
+        return {
+            "sample_rate": self._sample_rate,
+            "candidates": {name: profile.version for name, profile in self._candidates.items()},
+            **counters,
+            "queue": self._writer.stats(),
+            "comparisons": comparisons,
+        }
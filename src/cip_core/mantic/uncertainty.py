@@ -0,0 +1,186 @@
+"""Monte Carlo propagation of layer-value uncertainty through the Mantic kernel."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Sequence
+from typing import Any, Literal
+
+import numpy as np
+
+from cip_core.domain_profiles.models import DomainProfile
+from cip_core.mantic.vectorized import coerce_layer_matrix, resolve_scoring_params, score_matrix
+
+DEFAULT_SAMPLES = 10_000
+_PERCENTILES = (5, 25, 50, 75, 95)
+_MIN_CHUNKS_BEFORE_STOP = 2
+# The Wald alert-probability SE is 0 while every draw agrees (p_hat 0 or 1), so a
+# rare alert regime could "converge" after two small chunks; never stop earlier.
+_MIN_SAMPLES_BEFORE_STOP = 1_000
+
+
+def _validate_std(layer_std: Sequence[float], layer_count: int) -> np.ndarray:
+    std = np.asarray(layer_std, dtype=np.float64)
+    if std.shape != (layer_count,):
+        raise ValueError(
+            f"layer_std length ({std.size}) must match profile layer count ({layer_count})"
+        )
+    if not np.isfinite(std).all() or (std < 0).any():
+        raise ValueError("layer_std entries must be finite and non-negative")
+    return std
+
+
+def _validate_intervals(
+    layer_intervals: Sequence[Sequence[float]], layer_count: int
+) -> tuple[np.ndarray, np.ndarray]:
+    bounds = np.asarray(layer_intervals, dtype=np.float64)
+    if bounds.shape != (layer_count, 2):
+        raise ValueError(
+            f"layer_intervals must contain {layer_count} [low, high] pairs, "
+            "one per profile layer"
+        )
+    if not np.isfinite(bounds).all():
+        raise ValueError("layer_intervals entries must be finite")
+    low, high = bounds[:, 0], bounds[:, 1]
+    if (low > high).any():
+        raise ValueError("layer_intervals low bound must not exceed high bound")
+    return low, high
+
+
+def run_uncertainty(
+    profile: DomainProfile,
+    layer_values: Sequence[float],
+    mode: Literal["friction", "emergence"],
+    layer_std: Sequence[float] | None = None,
+    layer_intervals: Sequence[Sequence[float]] | None = None,
+    samples: int = DEFAULT_SAMPLES,
+    seed: int = 0,
+    chunk_size: int = 1_000,
+    tolerance: float = 0.005,
+    deadline_ms: float | None = None,
+    f_time: float = 1.0,
+    threshold_override: dict[str, float] | None = None,
+    temporal_config: dict[str, Any] | None = None,
+    interaction_mode: Literal["dynamic", "base"] = "dynamic",
+    interaction_override: dict[str, float] | list[float] | None = None,
+    interaction_override_mode: Literal["scale", "replace"] = "scale",
+) -> dict[str, Any]:
+    """Sample layer values, score every draw and summarize the M-score distribution.
+
+    Layer uncertainty is either a per-layer standard deviation around `layer_values`
+    (normal draws) or a per-layer `[low, high]` interval (uniform draws); draws are
+    clamped to [0, 1] like any other input. Sampling stops early once the standard
+    errors of the mean M-score and the alert probability both fall below
+    `tolerance` (checked only after a minimum sample count), or when `deadline_ms`
+    elapses.
+    """
+    if (layer_std is None) == (layer_intervals is None):
+        raise ValueError("provide exactly one of layer_std or layer_intervals")
+    if samples < 1:
+        raise ValueError("samples must be >= 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    if tolerance < 0:
+        raise ValueError("tolerance must be >= 0")
+    try:
+        ndim = np.ndim(layer_values)
+    except ValueError:
+        ndim = -1
+    if ndim != 1:
+        raise ValueError("layer_values must be a single layer vector (1-D)")
+
+    started = time.perf_counter()
+    layer_count = len(profile.layer_names)
+    params = resolve_scoring_params(
+        profile,
+        mode,
+        f_time=f_time,
+        threshold_override=threshold_override,
+        temporal_config=temporal_config,
+        interaction_mode=interaction_mode,
+        interaction_override=interaction_override,
+        interaction_override_mode=interaction_override_mode,
+    )
+    point = coerce_layer_matrix(layer_values, layer_count)
+    point_scores = score_matrix(params, point)
+
+    if layer_std is not None:
+        std = _validate_std(layer_std, layer_count)
+    else:
+        low, high = _validate_intervals(layer_intervals, layer_count)
+
+    # With no alerts in n draws the ~95% upper bound on p is 3/n (rule of three),
+    # so require enough draws for that bound to fall within `tolerance` as well.
+    min_samples = max(
+        _MIN_CHUNKS_BEFORE_STOP * chunk_size,
+        _MIN_SAMPLES_BEFORE_STOP,
+        math.ceil(3.0 / tolerance) if tolerance > 0 else samples,
+    )
+    rng = np.random.default_rng(seed)
+    m_scores = np.empty(samples, dtype=np.float64)
+    alert_count = 0
+    drawn = 0
+    stop_reason = "max_samples"
+
+    while drawn < samples:
+        size = min(chunk_size, samples - drawn)
+        if layer_std is not None:
+            draws = rng.normal(point[0], std, size=(size, layer_count))
+        else:
+            draws = rng.uniform(low, high, size=(size, layer_count))
+        scores = score_matrix(params, np.clip(draws, 0.0, 1.0))
+
+        m_scores[drawn : drawn + size] = scores.m_score
+        alert_count += int(scores.alert.sum())
+        drawn += size
+
+        if drawn >= samples:
+            break
+        if deadline_ms is not None and (time.perf_counter() - started) * 1000 >= deadline_ms:
+            stop_reason = "deadline"
+            break
+        if drawn >= min_samples:
+            p_hat = alert_count / drawn
+            m_se = float(m_scores[:drawn].std(ddof=1)) / math.sqrt(drawn)
+            p_se = math.sqrt(p_hat * (1 - p_hat) / drawn)
+            if m_se < tolerance and p_se < tolerance:
+                stop_reason = "converged"
+                break
+
+    sampled = m_scores[:drawn]
+    alert_probability = alert_count / drawn
+    percentiles = np.percentile(sampled, _PERCENTILES)
+
+    return {
+        "status": "ok",
+        "domain_profile": profile.descriptor(),
+        "mode": mode,
+        "threshold": params.threshold,
+        "point_estimate": {
+            "layer_values": point[0].tolist(),
+            "m_score": float(point_scores.m_score[0]),
+            "alert": bool(point_scores.alert[0]),
+        },
+        "distribution": {
+            "mean": float(sampled.mean()),
+            "std": float(sampled.std(ddof=1)) if drawn > 1 else 0.0,
+            "min": float(sampled.min()),
+            "max": float(sampled.max()),
+            "percentiles": {
+                f"p{pct}": float(value)
+                for pct, value in zip(_PERCENTILES, percentiles, strict=True)
+            },
+        },
+        "alert_probability": alert_probability,
+        "alert_probability_se": math.sqrt(alert_probability * (1 - alert_probability) / drawn),
+        "sampling": {
+            "seed": seed,
+            "requested_samples": samples,
+            "samples_used": drawn,
+            "chunk_size": chunk_size,
+            "stop_reason": stop_reason,
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+        },
+        "overrides_applied": params.overrides_applied,
+    }
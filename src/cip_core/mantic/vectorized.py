@@ -0,0 +1,295 @@
+"""Vectorized Mantic scoring over layer matrices.
+
+`run_detection` scores one layer vector per call through `generic_detect`. Batch
+and planning workloads instead resolve the governed overrides once with the same
+mantic-thinking validators and evaluate M = sum(W * L * I) * f(t) / k_n across a
+whole (rows, layers) matrix in a single numpy pass.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from typing import Any, Literal
+
+import numpy as np
+
+from cip_core.domain_profiles.models import DomainProfile
+from cip_core.mantic.overrides import (
+    canonical_key,
+    resolve_temporal_config,
+    with_temporal_audit,
+)
+from cip_core.mantic.runtime import _enforce_temporal_allowlist
+from cip_core.utils.lru import LRUCache
+
+_K_N = 1.0
+
+_PARAMS_CACHE = LRUCache(max_entries=256)
+
+# Level order matches generic_detect's layer_visibility tie-breaking.
+HIERARCHY_LEVELS = ("Micro", "Meso", "Macro", "Meta")
+
+
+@dataclass(frozen=True)
+class ScoringParams:
+    """Governed kernel inputs shared by every row of a batch."""
+
+    profile: DomainProfile
+    mode: Literal["friction", "emergence"]
+    weights: np.ndarray
+    interaction: np.ndarray
+    f_time: float
+    threshold: float
+    overrides_applied: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def layer_names(self) -> list[str]:
+        return self.profile.layer_names
+
+    @property
+    def level_membership(self) -> np.ndarray:
+        """(layers, levels) one-hot map of each layer onto `HIERARCHY_LEVELS`."""
+        membership = np.zeros((len(self.layer_names), len(HIERARCHY_LEVELS)))
+        for row, name in enumerate(self.layer_names):
+            level = self.profile.hierarchy.get(name)
+            if level in HIERARCHY_LEVELS:
+                membership[row, HIERARCHY_LEVELS.index(level)] = 1.0
+        return membership
+
+    @property
+    def coefficients(self) -> np.ndarray:
+        """Per-layer partial derivative dM/dL = W * I * f(t) / k_n."""
+        return self.weights * self.interaction * (self.f_time / _K_N)
+
+
+@dataclass(frozen=True)
+class BatchScores:
+    """Column arrays produced by `score_matrix`, one entry per input row."""
+
+    layer_values: np.ndarray
+    m_score: np.ndarray
+    spatial_component: np.ndarray
+    detection_statistic: np.ndarray
+    alert: np.ndarray
+    limiting_index: np.ndarray
+    attribution: np.ndarray
+    coherence: np.ndarray
+    dominant_index: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.m_score.shape[0])
+
+
+def _import_validators():
+    try:
+        from mantic_thinking.core import validators
+    except ImportError as exc:  # pragma: no cover
+        raise RuntimeError("mantic-thinking is not installed") from exc
+    return validators
+
+
+def coerce_layer_matrix(
+    layer_values: Sequence[Sequence[float]] | Sequence[float] | np.ndarray,
+    layer_count: int,
+) -> np.ndarray:
+    """Return a clamped (rows, layer_count) float matrix or raise ValueError.
+
+    A single flat vector is promoted to a one-row matrix. Floating-point arrays
+    (including views over packed buffers) are validated in place and keep their
+    dtype; anything else is converted to float64.
+    """
+    if isinstance(layer_values, np.ndarray) and np.issubdtype(layer_values.dtype, np.floating):
+        matrix = layer_values
+    else:
+        try:
+            matrix = np.asarray(layer_values, dtype=np.float64)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("layer_values must be numeric") from exc
+
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.ndim != 2 or matrix.shape[1] != layer_count:
+        raise ValueError(
+            f"layer_values shape {tuple(matrix.shape)} must be (rows, {layer_count}) "
+            "to match profile layer count"
+        )
+    if not np.isfinite(matrix).all():
+        bad_row = int(np.argwhere(~np.isfinite(matrix))[0][0])
+        raise ValueError(f"layer_values[{bad_row}] must contain only finite numbers")
+
+    return np.clip(matrix, 0.0, 1.0)
+
+
+def resolve_scoring_params(
+    profile: DomainProfile,
+    mode: Literal["friction", "emergence"],
+    f_time: float = 1.0,
+    threshold_override: dict[str, float] | None = None,
+    temporal_config: dict[str, Any] | None = None,
+    interaction_mode: Literal["dynamic", "base"] = "dynamic",
+    interaction_override: dict[str, float] | list[float] | None = None,
+    interaction_override_mode: Literal["scale", "replace"] = "scale",
+) -> ScoringParams:
+    """Apply the same override governance as `generic_detect`, once per batch.
+
+    Resolved params are memoized per profile version, mode and canonical overrides
+    (temporal config and interaction overrides included); hits hand back a copy of
+    the audit dict so responses never share mutable state.
+    """
+    if mode not in {"friction", "emergence"}:
+        raise ValueError("mode must be 'friction' or 'emergence'")
+    _enforce_temporal_allowlist(profile, temporal_config)
+
+    request = (
+        f_time,
+        threshold_override,
+        temporal_config,
+        interaction_mode,
+        interaction_override,
+        interaction_override_mode,
+    )
+    overrides_key = canonical_key(request)
+    if overrides_key is None:
+        return _resolve_scoring_params(profile, mode, *request)
+    key = (id(profile), profile.domain_name, profile.version, mode, overrides_key)
+    params = _PARAMS_CACHE.get_or_compute(
+        key, lambda: _resolve_scoring_params(profile, mode, *request)
+    )
+    if params.profile is not profile:
+        # id() reuse after the cached profile was collected.
+        return _resolve_scoring_params(profile, mode, *request)
+    return replace(params, overrides_applied=copy.deepcopy(params.overrides_applied))
+
+
+def _resolve_scoring_params(
+    profile: DomainProfile,
+    mode: Literal["friction", "emergence"],
+    f_time: float,
+    threshold_override: dict[str, float] | None,
+    temporal_config: dict[str, Any] | None,
+    interaction_mode: Literal["dynamic", "base"],
+    interaction_override: dict[str, float] | list[float] | None,
+    interaction_override_mode: Literal["scale", "replace"],
+) -> ScoringParams:
+    validators = _import_validators()
+    layer_names = profile.layer_names
+    n_layers = len(layer_names)
+
+    default_threshold = profile.detection_threshold
+    threshold = default_threshold
+    threshold_info: dict[str, Any] = {}
+    ignored_threshold_keys: list[str] = []
+    if threshold_override and isinstance(threshold_override, dict):
+        for key, requested in threshold_override.items():
+            if key == "detection":
+                threshold, _, threshold_info[key] = validators.clamp_threshold_override(
+                    requested, default_threshold
+                )
+            else:
+                ignored_threshold_keys.append(key)
+
+    temporal = None
+    if temporal_config and isinstance(temporal_config, dict):
+        temporal = resolve_temporal_config(temporal_config)
+        f_time = temporal.effective_f_time(f_time)
+
+    f_time_used, _, f_time_info = validators.clamp_f_time(f_time)
+
+    if isinstance(interaction_override, (list, tuple)):
+        if len(interaction_override) != n_layers:
+            raise ValueError(
+                f"interaction_override list length ({len(interaction_override)}) "
+                f"must match layer count ({n_layers})"
+            )
+        if n_layers != 4:
+            interaction_override = dict(zip(layer_names, interaction_override, strict=True))
+
+    identity = [1.0] * n_layers
+    interaction, interaction_audit = validators.resolve_interaction_coefficients(
+        layer_names,
+        I_base=identity,
+        I_dynamic=identity,
+        interaction_mode=interaction_mode,
+        interaction_override=interaction_override,
+        interaction_override_mode=interaction_override_mode,
+    )
+
+    threshold_audit = None
+    if threshold_info or ignored_threshold_keys:
+        threshold_audit = {
+            "overrides": {
+                key: {
+                    "requested": info.get("requested"),
+                    "used": info.get("used"),
+                    "was_clamped": info.get("was_clamped", False),
+                }
+                for key, info in threshold_info.items()
+            },
+            "was_clamped": any(info.get("was_clamped", False) for info in threshold_info.values()),
+            "ignored_keys": ignored_threshold_keys or None,
+        }
+
+    overrides_applied = validators.build_overrides_audit(
+        threshold_overrides=threshold_override or None,
+        temporal_config=temporal_config if temporal is None else None,
+        threshold_info=threshold_audit,
+        f_time_info=f_time_info,
+        interaction=interaction_audit,
+    )
+    if temporal is not None:
+        overrides_applied = with_temporal_audit(
+            overrides_applied, temporal.audit_entry(temporal_config)
+        )
+
+    raw_weights = np.asarray(profile.weights, dtype=np.float64)
+    weights = raw_weights / raw_weights.sum()
+    interaction = np.array(interaction, dtype=np.float64)
+    # Cached params are shared between batches.
+    weights.setflags(write=False)
+    interaction.setflags(write=False)
+    return ScoringParams(
+        profile=profile,
+        mode=mode,
+        weights=weights,
+        interaction=interaction,
+        f_time=float(f_time_used),
+        threshold=float(threshold),
+        overrides_applied=overrides_applied,
+    )
+
+
+def score_matrix(params: ScoringParams, matrix: np.ndarray) -> BatchScores:
+    """Score a clamped (rows, layers) matrix in one vectorized pass.
+
+    `detection_statistic` is the quantity `generic_detect` compares against the
+    detection threshold: the cross-layer range in friction mode and the alignment
+    floor (weakest layer) in emergence mode. `coherence` and `dominant_index`
+    mirror `layer_coupling.coherence` and `layer_visibility.dominant`.
+    """
+    contributions = matrix * (params.weights * params.interaction)
+    spatial = contributions.sum(axis=1)
+    m_score = spatial * (params.f_time / _K_N)
+
+    attribution = np.zeros_like(contributions)
+    positive = spatial > 1e-10
+    np.divide(contributions, spatial[:, None], out=attribution, where=positive[:, None])
+
+    floor = matrix.min(axis=1)
+    statistic = matrix.max(axis=1) - floor if params.mode == "friction" else floor
+
+    coherence = np.round(np.maximum(0.0, 1.0 - matrix.std(axis=1) / 0.5), 2)
+    dominant = (contributions @ params.level_membership).argmax(axis=1)
+
+    return BatchScores(
+        layer_values=matrix,
+        m_score=m_score,
+        spatial_component=spatial,
+        detection_statistic=statistic,
+        alert=statistic > params.threshold,
+        limiting_index=matrix.argmin(axis=1),
+        attribution=attribution,
+        coherence=coherence,
+        dominant_index=dominant,
+    )
@@ -0,0 +1,32 @@
+"""Pre-encoded JSON for tool responses (`DetectionEnvelope`, `AuditSummary`, batch payloads).
+
+For a dict result the framework encodes the payload twice: `pydantic_core.to_json`
+for the text content and `to_jsonable_python` for the structured content. The
+`pydantic` encoder produces that exact text once, with the same call, and the
+payload is handed through as the structured content unchanged.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+import pydantic_core
+
+JsonEncoder = Callable[[Any], str]
+
+JSON_ENCODERS = ("framework", "pydantic")
+
+
+def encode_pydantic(payload: Any) -> str:
+    """The framework's tool-result text encoding (Rust serializer, `str` fallback)."""
+    return pydantic_core.to_json(payload, fallback=str).decode()
+
+
+def get_json_encoder(name: str) -> JsonEncoder | None:
+    """Return the pre-encoder called `name`; None selects the framework path."""
+    if name == "framework":
+        return None
+    if name == "pydantic":
+        return encode_pydantic
+    raise ValueError(f"unknown JSON encoder '{name}'. Available: {list(JSON_ENCODERS)}")
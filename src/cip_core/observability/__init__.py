@@ -0,0 +1,54 @@
+"""Tracing hooks and on-demand profiling for server, runtime and SDK calls.
+
+Tracing is imported eagerly because the scoring runtime uses it on every call.
+Profiling (cProfile + tracemalloc) is resolved lazily, so importing the runtime
+never pays for it.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from cip_core.observability.tracing import (
+    InMemorySpanExporter,
+    Span,
+    SpanExporter,
+    current_trace_id,
+    get_span_exporter,
+    new_trace_id,
+    set_span_exporter,
+    span,
+    trace_context,
+)
+
+if TYPE_CHECKING:
+    from cip_core.observability.profiling import RequestProfiler
+
+_LAZY_EXPORTS = {"RequestProfiler": "profiling"}
+
+__all__ = [
+    "InMemorySpanExporter",
+    "RequestProfiler",
+    "Span",
+    "SpanExporter",
+    "current_trace_id",
+    "get_span_exporter",
+    "new_trace_id",
+    "set_span_exporter",
+    "span",
+    "trace_context",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,182 @@
+"""On-demand deterministic profiling of live requests (cProfile + tracemalloc)."""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+_DEFAULT_MODULES = ("cip_core", "mantic_thinking")
+
+
+def _matches(filename: str, modules: tuple[str, ...]) -> bool:
+    normalized = filename.replace("\\", "/")
+    return any(f"/{module}/" in normalized for module in modules)
+
+
+def _short_path(filename: str, modules: tuple[str, ...]) -> str:
+    normalized = filename.replace("\\", "/")
+    for module in modules:
+        marker = f"/{module}/"
+        if marker in normalized:
+            return module + "/" + normalized.split(marker, 1)[1]
+    return normalized
+
+
+class RequestProfiler:
+    """Profile the next N requests or the next T seconds of requests.
+
+    Requests wrapped in `profile_request()` are profiled only while a session is
+    armed. One request is profiled at a time; concurrent requests run unprofiled
+    and are counted as skipped. Allocation counts come from tracemalloc snapshot
+    diffs taken around each profiled request.
+    """
+
+    def __init__(
+        self,
+        modules: tuple[str, ...] = _DEFAULT_MODULES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._modules = modules
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._profile: cProfile.Profile | None = None
+        self._allocations: Counter[str] = Counter()
+        self._allocated_bytes: Counter[str] = Counter()
+        self._remaining: int | None = None
+        self._deadline: float | None = None
+        self._profiled = 0
+        self._skipped = 0
+        self._elapsed = 0.0
+        self._started_at: float | None = None
+
+    @property
+    def active(self) -> bool:
+        with self._lock:
+            return self._active_locked()
+
+    def _active_locked(self) -> bool:
+        if self._profile is None:
+            return False
+        if self._remaining is not None and self._remaining <= 0:
+            return False
+        return self._deadline is None or self._clock() < self._deadline
+
+    def start(self, requests: int | None = None, seconds: float | None = None) -> None:
+        """Arm a new session, discarding any previous results."""
+        if requests is None and seconds is None:
+            raise ValueError("provide requests and/or seconds")
+        if requests is not None and requests < 1:
+            raise ValueError("requests must be >= 1")
+        if seconds is not None and seconds <= 0:
+            raise ValueError("seconds must be > 0")
+        with self._lock:
+            self._reset()
+            self._profile = cProfile.Profile()
+            self._remaining = requests
+            self._started_at = self._clock()
+            self._deadline = self._started_at + seconds if seconds is not None else None
+
+    def stop(self) -> None:
+        """Disarm the session; collected results stay available to `report`."""
+        with self._lock:
+            self._remaining = 0
+
+    @contextmanager
+    def profile_request(self) -> Iterator[None]:
+        """Profile the enclosed request if a session is armed and no other is running."""
+        with self._lock:
+            armed = self._active_locked()
+            if armed and not self._busy.acquire(blocking=False):
+                self._skipped += 1
+                armed = False
+            if armed and self._remaining is not None:
+                self._remaining -= 1
+            profile = self._profile
+        if not armed or profile is None:
+            yield
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - start
+            after = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            self._record(before, after, elapsed)
+            self._busy.release()
+
+    def _record(
+        self, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, elapsed: float
+    ) -> None:
+        counts: Counter[str] = Counter()
+        sizes: Counter[str] = Counter()
+        for diff in after.compare_to(before, "lineno"):
+            frame = diff.traceback[0]
+            if diff.count_diff <= 0 or not _matches(frame.filename, self._modules):
+                continue
+            site = f"{_short_path(frame.filename, self._modules)}:{frame.lineno}"
+            counts[site] += diff.count_diff
+            sizes[site] += diff.size_diff
+        with self._lock:
+            self._profiled += 1
+            self._elapsed += elapsed
+            self._allocations.update(counts)
+            self._allocated_bytes.update(sizes)
+
+    def report(self, top_n: int = 20) -> dict[str, Any]:
+        """Return the session state plus hottest functions and allocation sites."""
+        with self._lock:
+            profile = self._profile
+            state = {
+                "active": self._active_locked(),
+                "profiled_requests": self._profiled,
+                "skipped_requests": self._skipped,
+                "remaining_requests": self._remaining,
+                "seconds_remaining": (
+                    max(0.0, self._deadline - self._clock()) if self._deadline else None
+                ),
+                "profiled_seconds": round(self._elapsed, 6),
+            }
+            allocations = [
+                {"site": site, "count": count, "bytes": self._allocated_bytes[site]}
+                for site, count in self._allocations.most_common(top_n)
+            ]
+
+        functions: list[dict[str, Any]] = []
+        if profile is not None and self._profiled:
+            stats = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+            rows = [
+                (filename, lineno, name, ncalls, tottime, cumtime)
+                for (filename, lineno, name), (_, ncalls, tottime, cumtime, _) in stats.items()
+                if _matches(filename, self._modules)
+            ]
+            rows.sort(key=lambda row: row[5], reverse=True)
+            functions = [
+                {
+                    "function": f"{_short_path(filename, self._modules)}:{lineno}({name})",
+                    "calls": ncalls,
+                    "total_ms": round(tottime * 1000, 3),
+                    "cumulative_ms": round(cumtime * 1000, 3),
+                }
+                for filename, lineno, name, ncalls, tottime, cumtime in rows[:top_n]
+            ]
+        return {**state, "functions": functions, "allocations": allocations}
@@ -0,0 +1,180 @@
+"""Minimal tracing hooks: nested spans with trace IDs and pluggable exporters.
+
+Nothing is recorded until an exporter is installed with `set_span_exporter`, so
+the default cost of `span(...)` is one global read. Spans nest through a context
+variable, which also carries the trace ID across `await` and `asyncio.to_thread`.
+Domain MCPs correlate their own work with core spans by wrapping calls in
+`trace_context(trace_id)`.
+"""
+
+from __future__ import annotations
+
+import logging
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Protocol, runtime_checkable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """One timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_ns: int = 0
+    end_ns: int | None = None
+    status: str = "ok"
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float | None:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "attributes": dict(self.attributes),
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class _NoOpSpan:
+    """Span stand-in used while no exporter is installed."""
+
+    __slots__ = ()
+
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoOpSpan()
+
+
+@runtime_checkable
+class SpanExporter(Protocol):
+    """Receives every finished span."""
+
+    def export(self, span: Span) -> None:
+        """Handle one finished span; must not raise into the traced code."""
+        raise NotImplementedError
+
+
+class InMemorySpanExporter:
+    """Keep finished spans in memory (bounded) for tests and debugging."""
+
+    def __init__(self, max_spans: int = 10_000) -> None:
+        self._max_spans = max_spans
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+            if len(self._spans) > self._max_spans:
+                del self._spans[: len(self._spans) - self._max_spans]
+
+    @property
+    def spans(self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def find(self, name: str) -> list[Span]:
+        return [span for span in self.spans if span.name == name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+_exporter: SpanExporter | None = None
+_current_span: ContextVar[Span | None] = ContextVar("cip_current_span", default=None)
+_trace_id: ContextVar[str | None] = ContextVar("cip_trace_id", default=None)
+
+
+def set_span_exporter(exporter: SpanExporter | None) -> SpanExporter | None:
+    """Install `exporter` (None disables tracing) and return the previous one."""
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    return previous
+
+
+def get_span_exporter() -> SpanExporter | None:
+    return _exporter
+
+
+def new_trace_id() -> str:
+    return secrets.token_hex(16)
+
+
+def current_trace_id() -> str | None:
+    """Return the active span's trace ID, else the ID set by `trace_context`."""
+    active = _current_span.get()
+    return active.trace_id if active is not None else _trace_id.get()
+
+
+@contextmanager
+def trace_context(trace_id: str | None = None) -> Iterator[str]:
+    """Run the enclosed block under `trace_id` (a fresh one when None)."""
+    trace_id = trace_id or new_trace_id()
+    token = _trace_id.set(trace_id)
+    try:
+        yield trace_id
+    finally:
+        _trace_id.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | _NoOpSpan]:
+    """Time the enclosed block as a child of the active span, if tracing is enabled."""
+    exporter = _exporter
+    if exporter is None:
+        yield _NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    trace_id = parent.trace_id if parent is not None else (_trace_id.get() or new_trace_id())
+    current = Span(
+        name=name,
+        trace_id=trace_id,
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id if parent is not None else None,
+        attributes={key: value for key, value in attributes.items() if value is not None},
+        start_ns=time.perf_counter_ns(),
+    )
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.status = "error"
+        current.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        current.end_ns = time.perf_counter_ns()
+        _current_span.reset(token)
+        try:
+            exporter.export(current)
+        except Exception:
+            logger.exception("span exporter failed")
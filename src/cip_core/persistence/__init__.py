@@ -0,0 +1,17 @@
+"""Off-request-path persistence for detection history and audit records."""
+
+from cip_core.persistence.audit_sink import (
+    AuditSink,
+    RotatingJsonlAuditSink,
+    build_audit_record,
+)
+from cip_core.persistence.history import DetectionHistoryStore
+from cip_core.persistence.writer import BatchWriter
+
+__all__ = [
+    "AuditSink",
+    "BatchWriter",
+    "DetectionHistoryStore",
+    "RotatingJsonlAuditSink",
+    "build_audit_record",
+]
@@ -0,0 +1,147 @@
+"""Pluggable sinks that persist governance audit records off the request path."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
+
+from cip_core.persistence.writer import BatchWriter
+
+
+@runtime_checkable
+class AuditSink(Protocol):
+    """Destination for audit records; `emit` must not block the caller."""
+
+    def emit(self, record: dict[str, Any]) -> bool:
+        """Accept one audit record; return False if it was dropped."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush accepted records and release resources."""
+        raise NotImplementedError
+
+    def stats(self) -> dict[str, Any]:
+        """Return delivery counters."""
+        raise NotImplementedError
+
+
+def build_audit_record(
+    envelope: dict[str, Any],
+    *,
+    tool: str,
+    entity_id: str | None = None,
+    clock: Callable[[], float] = time.time,
+) -> dict[str, Any] | None:
+    """Return an audit record for an envelope that clamped or rejected overrides.
+
+    Envelopes whose overrides were all applied as requested yield None.
+    """
+    audit = envelope.get("audit")
+    if envelope.get("status") != "ok" or not audit:
+        return None
+    if not audit.get("clamped_fields") and not audit.get("rejected_fields"):
+        return None
+    profile = envelope.get("domain_profile", {})
+    return {
+        "timestamp": clock(),
+        "tool": tool,
+        "profile": profile.get("domain_name"),
+        "profile_version": profile.get("version"),
+        "mode": envelope.get("mode"),
+        "entity_id": entity_id,
+        "clamped_fields": audit.get("clamped_fields", []),
+        "rejected_fields": audit.get("rejected_fields", []),
+        "overrides_applied": audit.get("overrides_applied", {}),
+    }
+
+
+class RotatingJsonlAuditSink:
+    """Append-only JSONL audit log written in batches by a background thread.
+
+    Records wait in a bounded queue (`max_queue`); when it is full new records are
+    dropped and counted rather than slowing the request. The active file is
+    rotated to `<name>.1` ... `<name>.<backup_count>` once it exceeds `max_bytes`.
+    `close` drains the queue before returning.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        max_queue: int = 10_000,
+    ) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+        if backup_count < 0:
+            raise ValueError("backup_count must be >= 0")
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._rotations = 0
+        self._stream = self._path.open("a", encoding="utf-8")
+        self._size = self._path.stat().st_size
+        self._writer = BatchWriter(
+            self._write_batch,
+            name="cip-audit-writer",
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            max_queue=max_queue,
+            on_stop=self._close_stream,
+        )
+
+    def emit(self, record: dict[str, Any]) -> bool:
+        return self._writer.submit(record)
+
+    def _rotate(self) -> None:
+        self._stream.close()
+        if self._backup_count == 0:
+            self._path.unlink(missing_ok=True)
+        else:
+            for index in range(self._backup_count - 1, 0, -1):
+                source = self._path.with_name(f"{self._path.name}.{index}")
+                if source.exists():
+                    os.replace(source, self._path.with_name(f"{self._path.name}.{index + 1}"))
+            os.replace(self._path, self._path.with_name(f"{self._path.name}.1"))
+        self._stream = self._path.open("a", encoding="utf-8")
+        self._size = 0
+        self._rotations += 1
+
+    def _write_batch(self, records: list[dict[str, Any]]) -> None:
+        for record in records:
+            line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+            size = len(line.encode("utf-8"))
+            if self._size and self._size + size > self._max_bytes:
+                self._rotate()
+            self._stream.write(line)
+            self._size += size
+        self._stream.flush()
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Wait until accepted records are written to disk."""
+        return self._writer.flush(timeout)
+
+    def _close_stream(self) -> None:
+        self._stream.close()
+
+    def close(self) -> None:
+        # The stream is closed by the writer thread after its last batch, so a
+        # join that times out never leaves the worker writing to a closed file.
+        self._writer.close()
+
+    def stats(self) -> dict[str, Any]:
+        writer = self._writer.stats()
+        return {
+            "sink": "jsonl",
+            "path": str(self._path),
+            "rotations": self._rotations,
+            **writer,
+        }
@@ -0,0 +1,282 @@
+"""Embedded SQLite (WAL) store for detection envelopes with paginated queries."""
+
+from __future__ import annotations
+
+import base64
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from cip_core.persistence.writer import BatchWriter
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    profile TEXT NOT NULL,
+    profile_version TEXT NOT NULL,
+    entity_id TEXT,
+    mode TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    alert INTEGER NOT NULL,
+    m_score REAL NOT NULL,
+    envelope TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_detections_entity
+    ON detections (profile, entity_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_detections_alert
+    ON detections (profile, alert, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_detections_created ON detections (created_at);
+"""
+
+_INSERT = """
+INSERT INTO detections
+    (profile, profile_version, entity_id, mode, created_at, alert, m_score, envelope)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_COLUMNS = "id, profile, profile_version, entity_id, mode, created_at, alert, m_score, envelope"
+
+
+def envelope_alert(envelope: dict[str, Any]) -> bool:
+    """Return the alert state of a detection envelope for either mode."""
+    result = envelope.get("result", {})
+    if envelope.get("mode") == "emergence":
+        return bool(result.get("window_detected"))
+    return result.get("alert") is not None
+
+
+def _encode_cursor(created_at: float, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at!r}:{row_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA busy_timeout=5000")
+    return connection
+
+
+class DetectionHistoryStore:
+    """Persist detection envelopes off the request path and query them by index.
+
+    `record` only enqueues; a `BatchWriter` thread inserts queued envelopes in one
+    transaction per batch. Reads use a separate connection, which WAL mode lets run
+    concurrently with the writer, and see only committed rows; call `flush` first
+    for read-your-writes. Rows older than `retention_days` are compacted by the
+    writer thread once `compaction_interval` seconds or `compaction_rows` inserts
+    have passed since the last compaction, checked after every batch and when idle,
+    so a store that is never idle still compacts.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        retention_days: float | None = 30.0,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        max_queue: int = 10_000,
+        compaction_interval: float = 3600.0,
+        compaction_rows: int | None = 100_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if retention_days is not None and retention_days <= 0:
+            raise ValueError("retention_days must be > 0 or None")
+        if compaction_rows is not None and compaction_rows < 1:
+            raise ValueError("compaction_rows must be >= 1 or None")
+        self._path = str(path)
+        Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+        self._retention_seconds = retention_days * 86_400 if retention_days else None
+        self._compaction_interval = compaction_interval
+        self._compaction_rows = compaction_rows
+        self._rows_since_compaction = 0
+        self._clock = clock
+        self._last_compaction = clock()
+        self._compacted = 0
+
+        self._write_conn = _connect(self._path)
+        self._write_conn.executescript(_SCHEMA)
+        self._write_lock = threading.Lock()
+        self._read_conn = _connect(self._path)
+        self._read_lock = threading.Lock()
+        self._writer = BatchWriter(
+            self._insert_batch,
+            name="cip-history-writer",
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            max_queue=max_queue,
+            on_idle=self._maybe_compact,
+        )
+
+    # -- writes -----------------------------------------------------------
+
+    def record(self, envelope: dict[str, Any], entity_id: str | None = None) -> bool:
+        """Queue a successful detection envelope; return False if it was dropped."""
+        if envelope.get("status") != "ok":
+            return False
+        result = envelope.get("result", {})
+        profile = envelope.get("domain_profile", {})
+        row = (
+            profile.get("domain_name", ""),
+            profile.get("version", ""),
+            entity_id,
+            envelope.get("mode", ""),
+            self._clock(),
+            int(envelope_alert(envelope)),
+            float(result.get("m_score", 0.0)),
+            envelope,
+        )
+        return self._writer.submit(row)
+
+    def _insert_batch(self, rows: list[tuple]) -> None:
+        encoded = [(*row[:-1], json.dumps(row[-1], separators=(",", ":"))) for row in rows]
+        with self._write_lock:
+            self._write_conn.execute("BEGIN")
+            try:
+                self._write_conn.executemany(_INSERT, encoded)
+            except Exception:
+                self._write_conn.execute("ROLLBACK")
+                raise
+            self._write_conn.execute("COMMIT")
+        self._rows_since_compaction += len(rows)
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        rows_due = (
+            self._compaction_rows is not None
+            and self._rows_since_compaction >= self._compaction_rows
+        )
+        if rows_due or self._clock() - self._last_compaction >= self._compaction_interval:
+            self.compact()
+
+    def compact(self, now: float | None = None) -> int:
+        """Delete rows older than the retention window and return how many went."""
+        now = self._clock() if now is None else now
+        self._last_compaction = now
+        self._rows_since_compaction = 0
+        if self._retention_seconds is None:
+            return 0
+        with self._write_lock:
+            cursor = self._write_conn.execute(
+                "DELETE FROM detections WHERE created_at < ?", (now - self._retention_seconds,)
+            )
+            deleted = cursor.rowcount
+            if deleted:
+                self._write_conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        self._compacted += deleted
+        return deleted
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Wait until queued envelopes are committed."""
+        return self._writer.flush(timeout)
+
+    def close(self) -> None:
+        """Flush pending writes and close both connections."""
+        self._writer.close()
+        with self._write_lock:
+            self._write_conn.close()
+        with self._read_lock:
+            self._read_conn.close()
+
+    # -- reads ------------------------------------------------------------
+
+    def _page(
+        self, where: str, params: list[Any], limit: int, cursor: str | None
+    ) -> dict[str, Any]:
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        if cursor is not None:
+            created_at, row_id = _decode_cursor(cursor)
+            where += " AND (created_at < ? OR (created_at = ? AND id < ?))"
+            params = [*params, created_at, created_at, row_id]
+        query = (
+            f"SELECT {_COLUMNS} FROM detections WHERE {where} "
+            "ORDER BY created_at DESC, id DESC LIMIT ?"
+        )
+        with self._read_lock:
+            rows = self._read_conn.execute(query, [*params, limit + 1]).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        items = [
+            {
+                "id": row[0],
+                "profile": row[1],
+                "profile_version": row[2],
+                "entity_id": row[3],
+                "mode": row[4],
+                "created_at": row[5],
+                "alert": bool(row[6]),
+                "m_score": row[7],
+                "envelope": json.loads(row[8]),
+            }
+            for row in rows
+        ]
+        next_cursor = _encode_cursor(rows[-1][5], rows[-1][0]) if has_more else None
+        return {"count": len(items), "items": items, "next_cursor": next_cursor}
+
+    def entity_history(
+        self,
+        profile: str,
+        entity_id: str,
+        *,
+        limit: int = 50,
+        cursor: str | None = None,
+        mode: str | None = None,
+        version: str | None = None,
+    ) -> dict[str, Any]:
+        """Return an entity's detections for a profile (optionally one version), newest first."""
+        where, params = "profile = ? AND entity_id = ?", [profile, entity_id]
+        if version is not None:
+            where += " AND profile_version = ?"
+            params.append(version)
+        if mode is not None:
+            where += " AND mode = ?"
+            params.append(mode)
+        return self._page(where, params, limit, cursor)
+
+    def recent_alerts(
+        self,
+        profile: str,
+        *,
+        limit: int = 50,
+        cursor: str | None = None,
+        since: float | None = None,
+        version: str | None = None,
+    ) -> dict[str, Any]:
+        """Return alerting detections for a profile (optionally one version), newest first."""
+        where, params = "profile = ? AND alert = 1", [profile]
+        if version is not None:
+            where += " AND profile_version = ?"
+            params.append(version)
+        if since is not None:
+            where += " AND created_at >= ?"
+            params.append(since)
+        return self._page(where, params, limit, cursor)
+
+    def stats(self) -> dict[str, Any]:
+        """Return writer counters, row count and compaction totals."""
+        with self._read_lock:
+            (rows,) = self._read_conn.execute("SELECT COUNT(*) FROM detections").fetchone()
+        return {
+            "path": self._path,
+            "rows": rows,
+            "retention_days": (
+                self._retention_seconds / 86_400 if self._retention_seconds else None
+            ),
+            "compacted": self._compacted,
+            "writer": self._writer.stats(),
+        }
@@ -0,0 +1,181 @@
+"""Background worker that drains a bounded queue and writes records in batches."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BatchWriter:
+    """Collect records off the request path and hand them to `handler` in batches.
+
+    `submit` never blocks: when the bounded queue is full the record is dropped and
+    counted. The worker thread waits up to `flush_interval` seconds to fill a batch
+    of `batch_size` records, then calls `handler(batch)`. Handler exceptions are
+    logged and counted without stopping the worker. `close` drains everything that
+    was accepted before returning; `on_stop` then runs on the worker thread, so
+    resources the handler writes to are released only after the last batch.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[Any]], None],
+        *,
+        name: str,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        max_queue: int = 10_000,
+        on_idle: Callable[[], None] | None = None,
+        on_stop: Callable[[], None] | None = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if max_queue < 1:
+            raise ValueError("max_queue must be >= 1")
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be > 0")
+        self._handler = handler
+        self._on_idle = on_idle
+        self._on_stop = on_stop
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        # Serializes the closed check with the enqueue, so nothing lands behind _STOP.
+        self._submit_lock = threading.Lock()
+        self._accepted = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._batches = 0
+        self._peak_queued = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, record: Any) -> bool:
+        """Enqueue one record; return False if it was dropped."""
+        with self._submit_lock:
+            accepted = not self._closed
+            if accepted:
+                try:
+                    self._queue.put_nowait(record)
+                except queue.Full:
+                    accepted = False
+        if not accepted:
+            with self._lock:
+                self._dropped += 1
+            return False
+        depth = self._queue.qsize()
+        with self._lock:
+            self._accepted += 1
+            self._peak_queued = max(self._peak_queued, depth)
+        return True
+
+    def _write(self, batch: list[Any]) -> None:
+        try:
+            self._handler(batch)
+        except Exception:
+            logger.exception("%s batch write failed", self._thread.name)
+            with self._lock:
+                self._failed += len(batch)
+        else:
+            with self._lock:
+                self._written += len(batch)
+                self._batches += 1
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                if self._on_idle is not None:
+                    try:
+                        self._on_idle()
+                    except Exception:
+                        logger.exception("%s idle task failed", self._thread.name)
+                continue
+
+            batch: list[Any] = []
+            stop = first is _STOP
+            if not stop:
+                batch.append(first)
+            deadline = time.monotonic() + self._flush_interval
+            while not stop and len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+            if stop:
+                if self._on_stop is not None:
+                    try:
+                        self._on_stop()
+                    except Exception:
+                        logger.exception("%s stop task failed", self._thread.name)
+                return
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every accepted record has been handled.
+
+        Returns False on timeout, and returns immediately once the writer is closed
+        (True only if nothing is left unhandled), since `close` owns the drain.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Wait on the queue's own task_done condition rather than polling.
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks and not self._closed:
+                if deadline is None:
+                    self._queue.all_tasks_done.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+            return not self._queue.unfinished_tasks
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Stop accepting records, drain the queue and join the worker thread."""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+        with self._queue.all_tasks_done:
+            self._queue.all_tasks_done.notify_all()
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth, high-water mark and accepted/written/dropped/failed counters."""
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "peak_queued": self._peak_queued,
+                "capacity": self._queue.maxsize,
+                "accepted": self._accepted,
+                "written": self._written,
+                "dropped": self._dropped,
+                "failed": self._failed,
+                "batches": self._batches,
+                "closed": self._closed,
+            }
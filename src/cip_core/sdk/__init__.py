@@ -1,16 +1,88 @@
-"""SDK utilities for downstream domain MCP repos."""
+"""SDK utilities for downstream domain MCP repos.
 
-from cip_core.sdk.translator import DomainTranslator, TranslationResult
-from cip_core.sdk.wrappers import (
-    detect_from_translator,
-    load_registry,
-    safe_detect,
-)
+Exports are resolved lazily, so `import cip_core.sdk` is cheap and a caller that
+only scores never imports the async, caching or offline-dataset helpers.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from cip_core.sdk.async_wrappers import (
+        AsyncDomainTranslator,
+        adetect_from_translator,
+        adetect_many,
+    )
+    from cip_core.sdk.cache import CachingTranslator, context_fingerprint
+    from cip_core.sdk.calibration import calibrate_threshold
+    from cip_core.sdk.cohort import ScoredCohort
+    from cip_core.sdk.offline import score_npy_dataset
+    from cip_core.sdk.rollup import GroupRollup, rollup_groups
+    from cip_core.sdk.translator import BatchDomainTranslator, DomainTranslator, TranslationResult
+    from cip_core.sdk.wrappers import (
+        detect_from_translator,
+        detect_stream_from_translator,
+        load_registry,
+        safe_detect,
+        safe_detect_batch,
+        safe_score_batch,
+    )
+
+_EXPORTS = {
+    "AsyncDomainTranslator": "async_wrappers",
+    "adetect_from_translator": "async_wrappers",
+    "adetect_many": "async_wrappers",
+    "CachingTranslator": "cache",
+    "context_fingerprint": "cache",
+    "calibrate_threshold": "calibration",
+    "ScoredCohort": "cohort",
+    "score_npy_dataset": "offline",
+    "GroupRollup": "rollup",
+    "rollup_groups": "rollup",
+    "BatchDomainTranslator": "translator",
+    "DomainTranslator": "translator",
+    "TranslationResult": "translator",
+    "detect_from_translator": "wrappers",
+    "detect_stream_from_translator": "wrappers",
+    "load_registry": "wrappers",
+    "safe_detect": "wrappers",
+    "safe_detect_batch": "wrappers",
+    "safe_score_batch": "wrappers",
+}
 
 __all__ = [
+    "AsyncDomainTranslator",
+    "BatchDomainTranslator",
+    "CachingTranslator",
     "DomainTranslator",
+    "GroupRollup",
+    "ScoredCohort",
     "TranslationResult",
+    "adetect_from_translator",
+    "adetect_many",
+    "calibrate_threshold",
+    "context_fingerprint",
     "detect_from_translator",
+    "detect_stream_from_translator",
     "load_registry",
+    "rollup_groups",
     "safe_detect",
+    "safe_detect_batch",
+    "safe_score_batch",
+    "score_npy_dataset",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,145 @@
+"""Async SDK wrappers for translators backed by I/O-bound domain connectors."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from collections.abc import Iterable, Mapping
+from typing import Any, Literal, Protocol
+
+from cip_core.domain_profiles.registry import DomainProfileRegistry
+from cip_core.mantic.runtime import run_detection
+from cip_core.sdk.translator import DomainTranslator, TranslationResult
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDomainTranslator(Protocol):
+    """Protocol for translators whose `translate` awaits connectors before returning."""
+
+    async def translate(self, raw_context: Mapping[str, Any]) -> TranslationResult:
+        """Translate raw context into ordered layer values."""
+        raise NotImplementedError
+
+
+def _error_result(message: str, *, code: str) -> dict[str, Any]:
+    return {
+        "status": "error",
+        "error": {
+            "code": code,
+            "message": message,
+        },
+    }
+
+
+async def _translate(
+    translator: AsyncDomainTranslator | DomainTranslator,
+    raw_context: Mapping[str, Any],
+) -> TranslationResult:
+    if inspect.iscoroutinefunction(translator.translate):
+        return await translator.translate(raw_context)
+    # Blocking translators run in a worker thread so their I/O still overlaps.
+    return await asyncio.to_thread(translator.translate, raw_context)
+
+
+async def adetect_from_translator(
+    registry: DomainProfileRegistry,
+    profile_name: str,
+    translator: AsyncDomainTranslator | DomainTranslator,
+    raw_context: Mapping[str, Any],
+    mode: Literal["friction", "emergence"],
+    f_time: float = 1.0,
+    threshold_override: dict[str, float] | None = None,
+    temporal_config: dict[str, Any] | None = None,
+    interaction_mode: Literal["dynamic", "base"] = "dynamic",
+    interaction_override: dict[str, float] | list[float] | None = None,
+    interaction_override_mode: Literal["scale", "replace"] = "scale",
+) -> dict[str, Any]:
+    """Await translation through a domain adapter, then run safe detection."""
+    profile = registry.get(profile_name)
+    translation = await _translate(translator, raw_context)
+    return run_detection(
+        profile=profile,
+        layer_values=translation.layer_values,
+        mode=mode,
+        f_time=f_time,
+        threshold_override=threshold_override,
+        temporal_config=temporal_config,
+        interaction_mode=interaction_mode,
+        interaction_override=interaction_override,
+        interaction_override_mode=interaction_override_mode,
+    )
+
+
+async def adetect_many(
+    registry: DomainProfileRegistry,
+    profile_name: str,
+    translator: AsyncDomainTranslator | DomainTranslator,
+    raw_contexts: Iterable[Mapping[str, Any]],
+    mode: Literal["friction", "emergence"],
+    concurrency: int = 16,
+    timeout: float | None = None,
+    f_time: float = 1.0,
+    threshold_override: dict[str, float] | None = None,
+    temporal_config: dict[str, Any] | None = None,
+    interaction_mode: Literal["dynamic", "base"] = "dynamic",
+    interaction_override: dict[str, float] | list[float] | None = None,
+    interaction_override_mode: Literal["scale", "replace"] = "scale",
+) -> list[dict[str, Any]]:
+    """Translate and detect many contexts with at most `concurrency` translations in flight.
+
+    A fixed pool of `concurrency` workers pulls contexts from `raw_contexts` as
+    they free up, so a large (or lazy) iterable never becomes one task per
+    context; each context is scored as soon as its translation completes.
+    Failures never cancel siblings: a translation slower than `timeout` seconds
+    yields a `timeout` error entry and any other exception yields a
+    `translation_error` or `runtime_error` entry. Results are returned in input
+    order.
+
+    `timeout` cancels coroutine translators only. A blocking translator runs in a
+    worker thread that cannot be interrupted: its entry still reports `timeout`,
+    but the thread keeps running (and holding a default-executor slot) until
+    `translate` returns.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+
+    profile = registry.get(profile_name)
+    pending = enumerate(raw_contexts)
+    # Keyed by input position: workers finish out of order and the input may be lazy.
+    results: dict[int, dict[str, Any]] = {}
+
+    async def _one(raw_context: Mapping[str, Any]) -> dict[str, Any]:
+        try:
+            translation = await asyncio.wait_for(
+                _translate(translator, raw_context), timeout=timeout
+            )
+        except TimeoutError:
+            return _error_result(f"translation exceeded timeout of {timeout}s", code="timeout")
+        except Exception as exc:
+            logger.warning("translation failed: %s", exc)
+            return _error_result(str(exc), code="translation_error")
+
+        try:
+            return run_detection(
+                profile=profile,
+                layer_values=translation.layer_values,
+                mode=mode,
+                f_time=f_time,
+                threshold_override=threshold_override,
+                temporal_config=temporal_config,
+                interaction_mode=interaction_mode,
+                interaction_override=interaction_override,
+                interaction_override_mode=interaction_override_mode,
+            )
+        except Exception as exc:
+            return _error_result(str(exc), code="runtime_error")
+
+    async def _worker() -> None:
+        # Workers share one iterator; the event loop never interleaves `next` calls.
+        for index, raw_context in pending:
+            results[index] = await _one(raw_context)
+
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    return [results[index] for index in range(len(results))]
@@ -0,0 +1,172 @@
+"""Memoizing wrapper for domain translators keyed by raw-context fingerprint."""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+import numpy as np
+
+from cip_core.sdk.translator import (
+    BatchDomainTranslator,
+    DomainTranslator,
+    TranslationResult,
+    translate_chunk,
+)
+
+
+def _fingerprint_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    if isinstance(value, (dt.date, dt.time)):
+        return value.isoformat()
+    # str()/repr() of arbitrary objects embeds ids or drops state, which would make
+    # equal contexts miss and different contexts collide.
+    raise TypeError(f"cannot fingerprint value of type {type(value).__name__}")
+
+
+def context_fingerprint(raw_context: Mapping[str, Any], version: str) -> str:
+    """Return a stable SHA-256 of a raw context mapping plus translator version tag.
+
+    Keys are sorted so equal mappings hash identically regardless of insertion order.
+    Raises TypeError for values without a value-based JSON form (JSON scalars and
+    containers, sets, numpy values, dates and times).
+    """
+    payload = json.dumps(
+        raw_context,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=_fingerprint_default,
+    )
+    return hashlib.sha256(f"{version}\0{payload}".encode()).hexdigest()
+
+
+class CachingTranslator:
+    """LRU + TTL memoizing wrapper around any `DomainTranslator`.
+
+    The cache keeps a private deep copy of each `TranslationResult` and every hit
+    returns a fresh deep copy of it, so no caller can change what later hits see.
+    Contexts that cannot be fingerprinted (see
+    `context_fingerprint`) bypass the cache and are counted as `uncacheable`. Bump
+    `version` whenever the wrapped translator's mapping logic changes.
+    """
+
+    def __init__(
+        self,
+        translator: DomainTranslator | BatchDomainTranslator,
+        *,
+        version: str,
+        max_entries: int = 1024,
+        ttl_seconds: float | None = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0 or None")
+        self._translator = translator
+        self._version = version
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, TranslationResult]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._uncacheable = 0
+
+    def _key(self, raw_context: Mapping[str, Any]) -> str | None:
+        try:
+            return context_fingerprint(raw_context, self._version)
+        except TypeError:
+            with self._lock:
+                self._uncacheable += 1
+            return None
+
+    def _lookup(self, key: str) -> TranslationResult | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        stored_at, result = entry
+        if self._ttl is not None and self._clock() - stored_at > self._ttl:
+            del self._entries[key]
+            self._expirations += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return result.model_copy(deep=True)
+
+    def _store(self, key: str, result: TranslationResult) -> TranslationResult:
+        self._entries[key] = (self._clock(), result.model_copy(deep=True))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+        return result
+
+    def translate(self, raw_context: Mapping[str, Any]) -> TranslationResult:
+        """Return a cached translation or translate and cache it."""
+        key = self._key(raw_context)
+        if key is None:
+            return self._translator.translate(raw_context)
+        with self._lock:
+            cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        result = self._translator.translate(raw_context)
+        with self._lock:
+            return self._store(key, result)
+
+    def translate_many(
+        self, raw_contexts: Sequence[Mapping[str, Any]]
+    ) -> list[TranslationResult]:
+        """Serve hits from cache and forward only the misses to the wrapped translator."""
+        keys = [self._key(raw_context) for raw_context in raw_contexts]
+        with self._lock:
+            results: list[TranslationResult | None] = [
+                None if key is None else self._lookup(key) for key in keys
+            ]
+        missing = [idx for idx, result in enumerate(results) if result is None]
+        if missing:
+            translated = translate_chunk(
+                self._translator, [raw_contexts[idx] for idx in missing]
+            )
+            with self._lock:
+                for idx, result in zip(missing, translated, strict=True):
+                    key = keys[idx]
+                    results[idx] = result if key is None else self._store(key, result)
+        return results  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        """Drop all cached translations (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "version": self._version,
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "uncacheable": self._uncacheable,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
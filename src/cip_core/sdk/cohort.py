@@ -0,0 +1,376 @@
+"""Persistent scored cohort that re-scores only the entities that changed."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+
+from cip_core.domain_profiles.registry import DomainProfileRegistry
+from cip_core.mantic.runtime import run_detection
+from cip_core.mantic.vectorized import (
+    ScoringParams,
+    coerce_layer_matrix,
+    resolve_scoring_params,
+    score_matrix,
+)
+
+_INITIAL_CAPACITY = 1024
+
+
+class ScoredCohort:
+    """Layer vectors and scores per entity ID, kept current from daily deltas.
+
+    Rows live in contiguous arrays indexed through an entity-ID map; removals
+    swap the last row into the freed slot so storage stays dense. `apply_delta`
+    scores only new rows and updated rows whose layer values actually changed,
+    and adjusts the running aggregates and top-K alert list from the old and new
+    values of those rows instead of rescanning the cohort. When the registry
+    serves a different profile version, every row is invalidated and rescored on
+    the next delta or `refresh()`.
+    """
+
+    def __init__(
+        self,
+        registry: DomainProfileRegistry,
+        profile_name: str,
+        mode: Literal["friction", "emergence"],
+        top_k: int = 100,
+        f_time: float = 1.0,
+        threshold_override: dict[str, float] | None = None,
+        temporal_config: dict[str, Any] | None = None,
+        interaction_mode: Literal["dynamic", "base"] = "dynamic",
+        interaction_override: dict[str, float] | list[float] | None = None,
+        interaction_override_mode: Literal["scale", "replace"] = "scale",
+    ) -> None:
+        if top_k < 1:
+            raise ValueError("top_k must be >= 1")
+        self._registry = registry
+        self._profile_name = profile_name
+        self._mode = mode
+        self._top_k = top_k
+        self._request: dict[str, Any] = {
+            "f_time": f_time,
+            "threshold_override": threshold_override,
+            "temporal_config": temporal_config,
+            "interaction_mode": interaction_mode,
+            "interaction_override": interaction_override,
+            "interaction_override_mode": interaction_override_mode,
+        }
+        self._params = self._resolve_params()
+        layer_count = len(self._params.layer_names)
+
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._layer_values = np.zeros((_INITIAL_CAPACITY, layer_count), dtype=np.float64)
+        self._m_score = np.zeros(_INITIAL_CAPACITY, dtype=np.float64)
+        self._statistic = np.zeros(_INITIAL_CAPACITY, dtype=np.float64)
+        self._alert = np.zeros(_INITIAL_CAPACITY, dtype=np.bool_)
+        self._limiting = np.zeros(_INITIAL_CAPACITY, dtype=np.int8)
+
+        self._alert_count = 0
+        self._m_sum = 0.0
+        self._m_sq_sum = 0.0
+        self._limiting_counts = np.zeros(layer_count, dtype=np.int64)
+        self._top: list[str] | None = []
+
+    # -- properties -------------------------------------------------------
+
+    @property
+    def profile_version(self) -> str:
+        return self._params.profile.version
+
+    @property
+    def layer_names(self) -> list[str]:
+        return self._params.layer_names
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self._rows
+
+    # -- scoring ----------------------------------------------------------
+
+    def _resolve_params(self) -> ScoringParams:
+        profile = self._registry.get(self._profile_name)
+        return resolve_scoring_params(profile, self._mode, **self._request)
+
+    def _reserve(self, size: int) -> None:
+        capacity = self._m_score.shape[0]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        layer_values = np.zeros((capacity, self._layer_values.shape[1]), dtype=np.float64)
+        layer_values[: len(self)] = self._layer_values[: len(self)]
+        self._layer_values = layer_values
+        for name in ("_m_score", "_statistic", "_alert", "_limiting"):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[: len(self)] = old[: len(self)]
+            setattr(self, name, grown)
+
+    def _account(self, rows: np.ndarray, sign: int) -> None:
+        """Add (`sign`=1) or subtract (`sign`=-1) rows from the running aggregates."""
+        if rows.size == 0:
+            return
+        scores = self._m_score[rows]
+        self._alert_count += sign * int(np.count_nonzero(self._alert[rows]))
+        self._m_sum += sign * float(scores.sum())
+        self._m_sq_sum += sign * float(np.square(scores).sum())
+        self._limiting_counts += sign * np.bincount(
+            self._limiting[rows], minlength=self._limiting_counts.size
+        )
+
+    def _score_rows(self, rows: np.ndarray) -> None:
+        scores = score_matrix(self._params, self._layer_values[rows])
+        self._m_score[rows] = scores.m_score
+        self._statistic[rows] = scores.detection_statistic
+        self._alert[rows] = scores.alert
+        self._limiting[rows] = scores.limiting_index
+
+    def _rescore_all(self) -> None:
+        rows = np.arange(len(self))
+        self._alert_count = 0
+        self._m_sum = 0.0
+        self._m_sq_sum = 0.0
+        self._limiting_counts[:] = 0
+        self._score_rows(rows)
+        self._account(rows, 1)
+        self._top = None
+
+    def refresh(self) -> bool:
+        """Rescore every row if the registry now serves a different profile version."""
+        params = self._resolve_params()
+        if params.profile.version == self._params.profile.version:
+            return False
+        if params.layer_names != self._params.layer_names:
+            raise ValueError(
+                f"profile {self._profile_name!r} {params.profile.version} changed layer names; "
+                "build a new cohort"
+            )
+        self._params = params
+        self._rescore_all()
+        return True
+
+    # -- deltas -----------------------------------------------------------
+
+    def _remove(self, entity_id: str) -> None:
+        row = self._rows.pop(entity_id)
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+            for array in (
+                self._layer_values,
+                self._m_score,
+                self._statistic,
+                self._alert,
+                self._limiting,
+            ):
+                array[row] = array[last]
+        self._ids.pop()
+
+    def apply_delta(
+        self,
+        upserts: Mapping[str, Sequence[float]] | None = None,
+        removals: Iterable[str] | None = None,
+    ) -> dict[str, Any]:
+        """Apply removed, updated and new entities and rescore only what changed.
+
+        Removals are applied before upserts, so an ID present in both is re-added.
+        Unknown removal IDs are counted and ignored. Returns counts for the delta.
+        """
+        invalidated = self.refresh()
+
+        requested_removals = list(dict.fromkeys(removals or ()))
+        removed_ids = [entity_id for entity_id in requested_removals if entity_id in self._rows]
+        previous_top = set(self._top or ())
+        touched_top = any(entity_id in previous_top for entity_id in removed_ids)
+        if removed_ids:
+            self._account(np.fromiter((self._rows[i] for i in removed_ids), dtype=np.int64), -1)
+            for entity_id in removed_ids:
+                self._remove(entity_id)
+
+        upserts = upserts or {}
+        ids = list(upserts)
+        layer_count = len(self.layer_names)
+        matrix = (
+            coerce_layer_matrix([upserts[entity_id] for entity_id in ids], layer_count)
+            if ids
+            else np.zeros((0, layer_count))
+        )
+
+        existing = [
+            (pos, self._rows[entity_id])
+            for pos, entity_id in enumerate(ids)
+            if entity_id in self._rows
+        ]
+        updated_rows = np.zeros(0, dtype=np.int64)
+        if existing:
+            positions = np.fromiter((pos for pos, _ in existing), dtype=np.int64)
+            rows = np.fromiter((row for _, row in existing), dtype=np.int64)
+            changed = np.any(self._layer_values[rows] != matrix[positions], axis=1)
+            updated_rows = rows[changed]
+            self._account(updated_rows, -1)
+            self._layer_values[updated_rows] = matrix[positions[changed]]
+
+        new_positions = [pos for pos, entity_id in enumerate(ids) if entity_id not in self._rows]
+        start = len(self)
+        self._reserve(start + len(new_positions))
+        for offset, pos in enumerate(new_positions):
+            self._rows[ids[pos]] = start + offset
+            self._ids.append(ids[pos])
+        new_rows = np.arange(start, start + len(new_positions), dtype=np.int64)
+        if new_positions:
+            self._layer_values[new_rows] = matrix[new_positions]
+
+        rescored = np.concatenate([updated_rows, new_rows])
+        if rescored.size:
+            touched_top = touched_top or any(self._ids[row] in previous_top for row in updated_rows)
+            self._score_rows(rescored)
+            self._account(rescored, 1)
+        self._update_top(rescored, invalidate=touched_top or invalidated)
+
+        return {
+            "profile_version": self.profile_version,
+            "invalidated": invalidated,
+            "added": len(new_positions),
+            "updated": int(updated_rows.size),
+            "unchanged": len(existing) - int(updated_rows.size),
+            "removed": len(removed_ids),
+            "unknown_removals": len(requested_removals) - len(removed_ids),
+            "rescored": int(rescored.size) if not invalidated else len(self),
+            "size": len(self),
+        }
+
+    # -- top-K ------------------------------------------------------------
+
+    def _rank(self, rows: np.ndarray) -> list[str]:
+        alerting = rows[self._alert[rows]]
+        if alerting.size > self._top_k:
+            keep = np.argpartition(-self._m_score[alerting], self._top_k - 1)[: self._top_k]
+            alerting = alerting[keep]
+        order = np.lexsort((alerting, -self._m_score[alerting]))
+        return [self._ids[row] for row in alerting[order]]
+
+    def _update_top(self, rescored: np.ndarray, invalidate: bool) -> None:
+        # A previous top-K member that was removed or rescored may have dropped out,
+        # so the list is rebuilt lazily; otherwise the new top-K is drawn from the old
+        # members plus the freshly scored rows.
+        if invalidate or self._top is None:
+            self._top = None
+            return
+        if rescored.size == 0:
+            return
+        candidates = np.concatenate(
+            [np.fromiter((self._rows[i] for i in self._top), dtype=np.int64), rescored]
+        )
+        self._top = self._rank(np.unique(candidates))
+
+    def top_alerts(self) -> list[dict[str, Any]]:
+        """Return up to `top_k` alerting entities ordered by descending M score."""
+        if self._top is None:
+            self._top = self._rank(np.arange(len(self)))
+        return [
+            {"entity_id": entity_id, "m_score": float(self._m_score[self._rows[entity_id]])}
+            for entity_id in self._top
+        ]
+
+    # -- reads ------------------------------------------------------------
+
+    def aggregates(self) -> dict[str, Any]:
+        """Return running cohort aggregates maintained across deltas."""
+        size = len(self)
+        mean = self._m_sum / size if size else 0.0
+        variance = max(0.0, self._m_sq_sum / size - mean * mean) if size else 0.0
+        return {
+            "size": size,
+            "alerts": self._alert_count,
+            "alert_rate": self._alert_count / size if size else 0.0,
+            "m_score_mean": mean,
+            "m_score_std": float(np.sqrt(variance)),
+            "limiting_factor_counts": dict(
+                zip(self.layer_names, self._limiting_counts.tolist(), strict=True)
+            ),
+        }
+
+    def get(self, entity_id: str) -> dict[str, Any]:
+        """Return the stored layer values and scores for one entity."""
+        row = self._rows[entity_id]
+        return {
+            "entity_id": entity_id,
+            "layer_values": self._layer_values[row].tolist(),
+            "m_score": float(self._m_score[row]),
+            "detection_statistic": float(self._statistic[row]),
+            "alert": bool(self._alert[row]),
+            "limiting_factor": self.layer_names[self._limiting[row]],
+        }
+
+    def envelope(self, entity_id: str) -> dict[str, Any]:
+        """Return the full single-call detection envelope for one entity."""
+        return run_detection(
+            profile=self._params.profile,
+            layer_values=self._layer_values[self._rows[entity_id]].tolist(),
+            mode=self._mode,
+            **self._request,
+        )
+
+    # -- persistence ------------------------------------------------------
+
+    def save(self, path: str | Path) -> None:
+        """Write layer vectors, scores and the profile version to an `.npz` file."""
+        size = len(self)
+        meta = {
+            "profile_name": self._profile_name,
+            "profile_version": self.profile_version,
+            "mode": self._mode,
+            "top_k": self._top_k,
+            "request": self._request,
+        }
+        with open(path, "wb") as fp:
+            np.savez(
+                fp,
+                meta=np.array(json.dumps(meta)),
+                ids=np.array(self._ids, dtype=str),
+                layer_values=self._layer_values[:size],
+                m_score=self._m_score[:size],
+                statistic=self._statistic[:size],
+                alert=self._alert[:size],
+                limiting=self._limiting[:size],
+            )
+
+    @classmethod
+    def load(cls, registry: DomainProfileRegistry, path: str | Path) -> ScoredCohort:
+        """Restore a saved cohort; rows are rescored if the profile version moved on."""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            cohort = cls(
+                registry,
+                meta["profile_name"],
+                meta["mode"],
+                top_k=meta["top_k"],
+                **meta["request"],
+            )
+            ids = data["ids"].tolist()
+            size = len(ids)
+            cohort._reserve(size)
+            cohort._ids = ids
+            cohort._rows = {entity_id: row for row, entity_id in enumerate(ids)}
+            cohort._layer_values[:size] = data["layer_values"]
+            cohort._m_score[:size] = data["m_score"]
+            cohort._statistic[:size] = data["statistic"]
+            cohort._alert[:size] = data["alert"]
+            cohort._limiting[:size] = data["limiting"]
+
+        if meta["profile_version"] != cohort.profile_version:
+            cohort._rescore_all()
+        else:
+            cohort._account(np.arange(size), 1)
+            cohort._top = None
+        return cohort
@@ -0,0 +1,167 @@
+"""Offline scoring of memory-mapped `.npy` layer matrices with resumable checkpoints."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from cip_core.domain_profiles.registry import DomainProfileRegistry
+from cip_core.mantic.vectorized import coerce_layer_matrix, resolve_scoring_params, score_matrix
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def _job_signature(
+    input_path: Path, rows: int, profile_name: str, version: str, mode: str, overrides: dict
+) -> dict[str, Any]:
+    overrides_hash = hashlib.sha256(
+        json.dumps(overrides, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return {
+        "input": str(input_path.resolve()),
+        "rows": rows,
+        "profile_name": profile_name,
+        "profile_version": version,
+        "mode": mode,
+        "overrides_sha256": overrides_hash,
+    }
+
+
+def _write_checkpoint(path: Path, payload: dict[str, Any]) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def score_npy_dataset(
+    registry: DomainProfileRegistry,
+    profile_name: str,
+    input_path: str | Path,
+    output_dir: str | Path,
+    mode: Literal["friction", "emergence"],
+    chunk_rows: int = 65_536,
+    resume: bool = True,
+    f_time: float = 1.0,
+    threshold_override: dict[str, float] | None = None,
+    temporal_config: dict[str, Any] | None = None,
+    interaction_mode: Literal["dynamic", "base"] = "dynamic",
+    interaction_override: dict[str, float] | list[float] | None = None,
+    interaction_override_mode: Literal["scale", "replace"] = "scale",
+) -> dict[str, Any]:
+    """Score a (rows, layers) `.npy` file chunk by chunk into memory-mapped columns.
+
+    Writes `m_score.npy` (float64), `alert.npy` (bool), `limiting_factor.npy`
+    (int8 layer index) and `attribution.npy` (float32, rows x layers) to
+    `output_dir`. Input and outputs are memory-mapped, so resident memory is bounded
+    by `chunk_rows` regardless of file size. After every chunk the outputs are
+    flushed and `checkpoint.json` records the next row; a rerun with `resume=True`
+    continues from there when the checkpoint matches the same input, profile
+    version, mode and overrides.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be >= 1")
+
+    input_path = Path(input_path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = output_dir / CHECKPOINT_FILE
+
+    profile = registry.get(profile_name)
+    layer_names = profile.layer_names
+    layer_count = len(layer_names)
+    params = resolve_scoring_params(
+        profile,
+        mode,
+        f_time=f_time,
+        threshold_override=threshold_override,
+        temporal_config=temporal_config,
+        interaction_mode=interaction_mode,
+        interaction_override=interaction_override,
+        interaction_override_mode=interaction_override_mode,
+    )
+
+    source = np.load(input_path, mmap_mode="r")
+    if source.ndim != 2 or source.shape[1] != layer_count:
+        raise ValueError(
+            f"{input_path} has shape {source.shape}; expected (rows, {layer_count})"
+        )
+    rows = int(source.shape[0])
+    if rows == 0:
+        raise ValueError(f"{input_path} contains no rows")
+    signature = _job_signature(
+        input_path, rows, profile.domain_name, profile.version, mode, params.overrides_applied
+    )
+
+    start_row = 0
+    if resume and checkpoint_path.exists():
+        checkpoint = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+        if checkpoint.get("job") != signature:
+            raise ValueError(
+                f"{checkpoint_path} belongs to a different job; rerun with resume=False"
+            )
+        start_row = int(checkpoint["next_row"])
+    resumed_from = start_row
+
+    file_mode = "r+" if start_row > 0 else "w+"
+    columns = {
+        "m_score": open_memmap(
+            output_dir / "m_score.npy", mode=file_mode, dtype=np.float64, shape=(rows,)
+        ),
+        "alert": open_memmap(
+            output_dir / "alert.npy", mode=file_mode, dtype=np.bool_, shape=(rows,)
+        ),
+        "limiting_factor": open_memmap(
+            output_dir / "limiting_factor.npy", mode=file_mode, dtype=np.int8, shape=(rows,)
+        ),
+        "attribution": open_memmap(
+            output_dir / "attribution.npy",
+            mode=file_mode,
+            dtype=np.float32,
+            shape=(rows, layer_count),
+        ),
+    }
+
+    chunks = 0
+    for start in range(start_row, rows, chunk_rows):
+        stop = min(rows, start + chunk_rows)
+        scores = score_matrix(params, coerce_layer_matrix(source[start:stop], layer_count))
+        columns["m_score"][start:stop] = scores.m_score
+        columns["alert"][start:stop] = scores.alert
+        columns["limiting_factor"][start:stop] = scores.limiting_index
+        columns["attribution"][start:stop] = scores.attribution
+        for column in columns.values():
+            column.flush()
+        chunks += 1
+        _write_checkpoint(
+            checkpoint_path,
+            {"job": signature, "layer_names": layer_names, "next_row": stop, "complete": False},
+        )
+
+    _write_checkpoint(
+        checkpoint_path,
+        {"job": signature, "layer_names": layer_names, "next_row": rows, "complete": True},
+    )
+
+    alert_count = int(
+        sum(
+            int(np.count_nonzero(columns["alert"][start : start + chunk_rows]))
+            for start in range(0, rows, chunk_rows)
+        )
+    )
+    return {
+        "status": "ok",
+        "domain_profile": profile.descriptor(),
+        "mode": mode,
+        "rows": rows,
+        "alerts": alert_count,
+        "chunks_processed": chunks,
+        "resumed_from_row": resumed_from,
+        "layer_names": layer_names,
+        "outputs": {name: str(output_dir / f"{name}.npy") for name in columns},
+    }
@@ -0,0 +1,300 @@
+"""Streaming group-by roll-up of entity layer vectors into group-level detections."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any, Literal
+
+import numpy as np
+
+from cip_core.domain_profiles.registry import DomainProfileRegistry
+from cip_core.mantic.batch import DetectionBatch, score_batch
+from cip_core.mantic.vectorized import coerce_layer_matrix, resolve_scoring_params, score_matrix
+
+Aggregation = Literal["mean", "weighted", "worst_case"]
+AGGREGATIONS: tuple[str, ...] = ("mean", "weighted", "worst_case")
+
+_INITIAL_GROUPS = 64
+
+
+class GroupRollup:
+    """Aggregate entity layer vectors per group key and score each group.
+
+    Entities arrive in chunks through `add`, each chunk is scored once to count
+    member alerts, and only per-group accumulators are kept, so memory grows with
+    the number of groups, not the number of entities. Aggregations:
+
+    - `mean`: mean layer vector of the group's members.
+    - `weighted`: weight-averaged layer vector (`weights` required, >= 0).
+    - `worst_case`: the member vector with the highest detection statistic, i.e.
+      the member closest to (or furthest past) the detection threshold; ties keep
+      the first member seen.
+
+    `score` then scores every group's aggregated vector in one vectorized pass.
+    """
+
+    def __init__(
+        self,
+        registry: DomainProfileRegistry,
+        profile_name: str,
+        mode: Literal["friction", "emergence"],
+        aggregation: Aggregation = "mean",
+        f_time: float = 1.0,
+        threshold_override: dict[str, float] | None = None,
+        temporal_config: dict[str, Any] | None = None,
+        interaction_mode: Literal["dynamic", "base"] = "dynamic",
+        interaction_override: dict[str, float] | list[float] | None = None,
+        interaction_override_mode: Literal["scale", "replace"] = "scale",
+        profile_version: str | None = None,
+    ) -> None:
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"aggregation must be one of {list(AGGREGATIONS)}")
+        self._aggregation = aggregation
+        self._request: dict[str, Any] = {
+            "f_time": f_time,
+            "threshold_override": threshold_override,
+            "temporal_config": temporal_config,
+            "interaction_mode": interaction_mode,
+            "interaction_override": interaction_override,
+            "interaction_override_mode": interaction_override_mode,
+        }
+        self._params = resolve_scoring_params(
+            registry.get(profile_name, profile_version), mode, **self._request
+        )
+        layer_count = len(self._params.layer_names)
+
+        self._keys: list[str] = []
+        self._codes: dict[str, int] = {}
+        self._entities = 0
+        self._members = np.zeros(_INITIAL_GROUPS, dtype=np.int64)
+        self._member_alerts = np.zeros(_INITIAL_GROUPS, dtype=np.int64)
+        self._weight = np.zeros(_INITIAL_GROUPS, dtype=np.float64)
+        # Weighted layer sums for mean/weighted; best member vector for worst_case.
+        self._vectors = np.zeros((_INITIAL_GROUPS, layer_count), dtype=np.float64)
+        self._worst_statistic = np.full(_INITIAL_GROUPS, -np.inf)
+
+    @property
+    def aggregation(self) -> str:
+        return self._aggregation
+
+    @property
+    def entities(self) -> int:
+        return self._entities
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, group_key: object) -> bool:
+        return group_key in self._codes
+
+    def _reserve(self, size: int) -> None:
+        capacity = self._members.shape[0]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("_members", "_member_alerts", "_weight", "_vectors", "_worst_statistic"):
+            old = getattr(self, name)
+            fill = -np.inf if name == "_worst_statistic" else 0
+            grown = np.full((capacity, *old.shape[1:]), fill, dtype=old.dtype)
+            grown[: len(old)] = old
+            setattr(self, name, grown)
+
+    def _encode_keys(self, group_keys: Sequence[str]) -> np.ndarray:
+        codes = self._codes
+        keys = self._keys
+        encoded = np.empty(len(group_keys), dtype=np.int64)
+        for row, key in enumerate(group_keys):
+            code = codes.get(key)
+            if code is None:
+                code = codes[key] = len(keys)
+                keys.append(key)
+            encoded[row] = code
+        return encoded
+
+    def _coerce_weights(
+        self, weights: Sequence[float] | np.ndarray | None, rows: int
+    ) -> np.ndarray | None:
+        if self._aggregation != "weighted":
+            if weights is not None:
+                raise ValueError("weights are only used with aggregation='weighted'")
+            return None
+        if weights is None:
+            raise ValueError("weights are required with aggregation='weighted'")
+        try:
+            array = np.asarray(weights, dtype=np.float64)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("weights must be numeric") from exc
+        if array.shape != (rows,):
+            raise ValueError(f"weights must have one value per row ({rows})")
+        if not np.isfinite(array).all() or (array < 0).any():
+            raise ValueError("weights must be finite and >= 0")
+        return array
+
+    def add(
+        self,
+        group_keys: Sequence[str],
+        layer_values: Sequence[Sequence[float]] | np.ndarray,
+        weights: Sequence[float] | np.ndarray | None = None,
+    ) -> None:
+        """Fold one chunk of entities (row i belongs to `group_keys[i]`) into the groups."""
+        if len(group_keys) == 0 and len(layer_values) == 0:
+            return
+        matrix = coerce_layer_matrix(layer_values, len(self._params.layer_names))
+        rows = int(matrix.shape[0])
+        if len(group_keys) != rows:
+            raise ValueError(f"group_keys has {len(group_keys)} entries for {rows} rows")
+        weight = self._coerce_weights(weights, rows)
+
+        codes = self._encode_keys(group_keys)
+        groups = len(self._keys)
+        self._reserve(groups)
+        scores = score_matrix(self._params, matrix)
+
+        self._entities += rows
+        self._members[:groups] += np.bincount(codes, minlength=groups)
+        self._member_alerts[:groups] += np.bincount(codes[scores.alert], minlength=groups)
+
+        if self._aggregation == "worst_case":
+            statistic = scores.detection_statistic
+            # Stable sort by group, highest statistic first: each group's first row wins.
+            order = np.lexsort((-statistic, codes))
+            sorted_codes = codes[order]
+            first = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+            best = order[first]
+            best_codes = codes[best]
+            improved = statistic[best] > self._worst_statistic[best_codes]
+            self._worst_statistic[best_codes[improved]] = statistic[best[improved]]
+            self._vectors[best_codes[improved]] = matrix[best[improved]]
+            return
+
+        weight = np.ones(rows) if weight is None else weight
+        self._weight[:groups] += np.bincount(codes, weights=weight, minlength=groups)
+        for column in range(matrix.shape[1]):
+            self._vectors[:groups, column] += np.bincount(
+                codes, weights=matrix[:, column] * weight, minlength=groups
+            )
+
+    def aggregated_layer_values(self) -> np.ndarray:
+        """Return the (groups, layers) aggregated matrix in first-seen group order."""
+        groups = len(self._keys)
+        if self._aggregation == "worst_case":
+            return self._vectors[:groups].copy()
+        weight = self._weight[:groups]
+        empty = np.flatnonzero(weight <= 0.0)
+        if empty.size:
+            raise ValueError(f"group '{self._keys[int(empty[0])]}' has zero total weight")
+        return self._vectors[:groups] / weight[:, None]
+
+    def score(self) -> DetectionBatch:
+        """Score every group's aggregated vector in one vectorized pass."""
+        if not self._keys:
+            raise ValueError("no entities have been added")
+        return score_batch(
+            profile=self._params.profile,
+            layer_values=self.aggregated_layer_values(),
+            mode=self._params.mode,
+            **self._request,
+        )
+
+    def _group_block(self, code: int) -> dict[str, Any]:
+        return {
+            "key": self._keys[code],
+            "aggregation": self._aggregation,
+            "members": int(self._members[code]),
+            "member_alerts": int(self._member_alerts[code]),
+        }
+
+    def envelope(self, group_key: str) -> dict[str, Any]:
+        """Full single-call envelope for one group's aggregated vector, plus `group`."""
+        if group_key not in self._codes:
+            raise KeyError(f"Unknown group '{group_key}'")
+        code = self._codes[group_key]
+        batch = self.score()
+        return {**batch.materialize(code), "group": self._group_block(code)}
+
+    def to_payload(self) -> dict[str, Any]:
+        """Return the columnar group-level response payload (one entry per group)."""
+        batch = self.score()
+        groups = len(self._keys)
+        members = self._members[:groups]
+        member_alerts = self._member_alerts[:groups]
+        return {
+            "status": "ok",
+            "contract_version": "1.0.0",
+            "domain_profile": batch.params.profile.descriptor(),
+            "mode": batch.params.mode,
+            "aggregation": self._aggregation,
+            "entities": self._entities,
+            "groups": groups,
+            "threshold": batch.params.threshold,
+            "results": {
+                "group": list(self._keys),
+                "members": members.tolist(),
+                "member_alerts": member_alerts.tolist(),
+                "member_alert_rate": (member_alerts / members).tolist(),
+                "layer_values": batch.layer_values.tolist(),
+                **batch.to_columns(),
+            },
+            "audit": batch.audit.model_dump(),
+        }
+
+
+def rollup_groups(
+    registry: DomainProfileRegistry,
+    profile_name: str,
+    records: Iterable[tuple[str, Sequence[float]] | tuple[str, Sequence[float], float]],
+    mode: Literal["friction", "emergence"],
+    aggregation: Aggregation = "mean",
+    chunk_rows: int = 65_536,
+    f_time: float = 1.0,
+    threshold_override: dict[str, float] | None = None,
+    temporal_config: dict[str, Any] | None = None,
+    interaction_mode: Literal["dynamic", "base"] = "dynamic",
+    interaction_override: dict[str, float] | list[float] | None = None,
+    interaction_override_mode: Literal["scale", "replace"] = "scale",
+    profile_version: str | None = None,
+) -> dict[str, Any]:
+    """Roll up a stream of `(group_key, layer_values[, weight])` records in one pass.
+
+    Records are folded into a `GroupRollup` `chunk_rows` at a time, so resident
+    memory is bounded by the chunk plus the per-group accumulators.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be >= 1")
+    rollup = GroupRollup(
+        registry,
+        profile_name,
+        mode,
+        aggregation=aggregation,
+        f_time=f_time,
+        threshold_override=threshold_override,
+        temporal_config=temporal_config,
+        interaction_mode=interaction_mode,
+        interaction_override=interaction_override,
+        interaction_override_mode=interaction_override_mode,
+        profile_version=profile_version,
+    )
+    weighted = aggregation == "weighted"
+    keys: list[str] = []
+    rows: list[Sequence[float]] = []
+    weights: list[float] = []
+
+    def _flush() -> None:
+        rollup.add(keys, rows, weights if weighted else None)
+        keys.clear()
+        rows.clear()
+        weights.clear()
+
+    for record in records:
+        keys.append(record[0])
+        rows.append(record[1])
+        if weighted:
+            if len(record) < 3:
+                raise ValueError("weighted records must be (group_key, layer_values, weight)")
+            weights.append(record[2])
+        if len(keys) >= chunk_rows:
+            _flush()
+    if keys:
+        _flush()
+    return rollup.to_payload()
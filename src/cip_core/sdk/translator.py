@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping
-from typing import Any, Protocol
+from collections.abc import Mapping, Sequence
+from typing import Any, Protocol, runtime_checkable
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -23,3 +23,30 @@ class DomainTranslator(Protocol):
     def translate(self, raw_context: Mapping[str, Any]) -> TranslationResult:
         """Translate raw context into ordered layer values."""
         raise NotImplementedError
+
+
+@runtime_checkable
+class BatchDomainTranslator(Protocol):
+    """Optional protocol for translators that vectorize feature extraction over a chunk."""
+
+    def translate_many(
+        self, raw_contexts: Sequence[Mapping[str, Any]]
+    ) -> Sequence[TranslationResult]:
+        """Translate a chunk of raw contexts, returning results in input order."""
+        raise NotImplementedError
+
+
+def translate_chunk(
+    translator: DomainTranslator | BatchDomainTranslator,
+    raw_contexts: Sequence[Mapping[str, Any]],
+) -> list[TranslationResult]:
+    """Translate a chunk with `translate_many` when available, else one at a time."""
+    if isinstance(translator, BatchDomainTranslator):
+        results = list(translator.translate_many(raw_contexts))
+        if len(results) != len(raw_contexts):
+            raise ValueError(
+                f"translate_many returned {len(results)} results for "
+                f"{len(raw_contexts)} contexts"
+            )
+        return results
+    return [translator.translate(raw_context) for raw_context in raw_contexts]
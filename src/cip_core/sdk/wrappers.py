@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Iterable, Iterator, Mapping
+from itertools import islice
 from pathlib import Path
 from typing import Any, Literal
 
 from cip_core.domain_profiles.registry import DomainProfileRegistry
+from cip_core.mantic.batch import (
+    DetectionBatch,
+    EnvelopeView,
+    LayerMatrix,
+    decode_packed_layers,
+    score_batch,
+)
 from cip_core.mantic.runtime import run_detection
-from cip_core.sdk.translator import DomainTranslator
+from cip_core.observability.tracing import span
+from cip_core.sdk.translator import BatchDomainTranslator, DomainTranslator, translate_chunk
 
 
 def load_registry(profiles_dir: str | Path) -> DomainProfileRegistry:
@@ -28,21 +37,102 @@ def safe_detect(
     interaction_mode: Literal["dynamic", "base"] = "dynamic",
     interaction_override: dict[str, float] | list[float] | None = None,
     interaction_override_mode: Literal["scale", "replace"] = "scale",
+    profile_version: str | None = None,
 ) -> dict[str, Any]:
-    """Run detection against a registered domain profile."""
-    profile = registry.get(profile_name)
-    return run_detection(
-        profile=profile,
+    """Run detection against a registered domain profile.
+
+    Uses the profile's latest version unless `profile_version` (or a
+    `name@version` profile_name) pins one.
+    """
+    with span("sdk.safe_detect", profile=profile_name, version=profile_version, mode=mode):
+        profile = registry.get(profile_name, profile_version)
+        return run_detection(
+            profile=profile,
+            layer_values=layer_values,
+            mode=mode,
+            f_time=f_time,
+            threshold_override=threshold_override,
+            temporal_config=temporal_config,
+            interaction_mode=interaction_mode,
+            interaction_override=interaction_override,
+            interaction_override_mode=interaction_override_mode,
+        )
+
+
+
+def safe_score_batch(
+    registry: DomainProfileRegistry,
+    profile_name: str,
+    layer_values: LayerMatrix | bytes | bytearray | memoryview,
+    mode: Literal["friction", "emergence"],
+    rows: int | None = None,
+    dtype: Literal["float32", "float64"] = "float32",
+    f_time: float = 1.0,
+    threshold_override: dict[str, float] | None = None,
+    temporal_config: dict[str, Any] | None = None,
+    interaction_mode: Literal["dynamic", "base"] = "dynamic",
+    interaction_override: dict[str, float] | list[float] | None = None,
+    interaction_override_mode: Literal["scale", "replace"] = "scale",
+    profile_version: str | None = None,
+) -> DetectionBatch:
+    """Run vectorized batch detection and keep the results as a `DetectionBatch`.
+
+    `layer_values` is a nested sequence, a numpy matrix, or a packed little-endian
+    `dtype` buffer (bytes / memoryview) holding `rows` x profile-layer-count values.
+    Indexing the batch returns lazy envelope views; use `write_ndjson` to export.
+    """
+    with span("sdk.safe_score_batch", profile=profile_name, version=profile_version, mode=mode):
+        profile = registry.get(profile_name, profile_version)
+        if isinstance(layer_values, (bytes, bytearray, memoryview)):
+            if rows is None:
+                raise ValueError("rows is required for packed layer_values")
+            layer_values = decode_packed_layers(
+                layer_values, rows, len(profile.layer_names), dtype=dtype
+            )
+        return score_batch(
+            profile=profile,
+            layer_values=layer_values,
+            mode=mode,
+            f_time=f_time,
+            threshold_override=threshold_override,
+            temporal_config=temporal_config,
+            interaction_mode=interaction_mode,
+            interaction_override=interaction_override,
+            interaction_override_mode=interaction_override_mode,
+        )
+
+
+def safe_detect_batch(
+    registry: DomainProfileRegistry,
+    profile_name: str,
+    layer_values: LayerMatrix | bytes | bytearray | memoryview,
+    mode: Literal["friction", "emergence"],
+    rows: int | None = None,
+    dtype: Literal["float32", "float64"] = "float32",
+    f_time: float = 1.0,
+    threshold_override: dict[str, float] | None = None,
+    temporal_config: dict[str, Any] | None = None,
+    interaction_mode: Literal["dynamic", "base"] = "dynamic",
+    interaction_override: dict[str, float] | list[float] | None = None,
+    interaction_override_mode: Literal["scale", "replace"] = "scale",
+    profile_version: str | None = None,
+) -> dict[str, Any]:
+    """Run vectorized batch detection and return the columnar response payload."""
+    return safe_score_batch(
+        registry=registry,
+        profile_name=profile_name,
         layer_values=layer_values,
         mode=mode,
+        rows=rows,
+        dtype=dtype,
         f_time=f_time,
         threshold_override=threshold_override,
         temporal_config=temporal_config,
         interaction_mode=interaction_mode,
         interaction_override=interaction_override,
         interaction_override_mode=interaction_override_mode,
-    )
-
+        profile_version=profile_version,
+    ).to_payload()
 
 
 def detect_from_translator(
@@ -59,7 +149,8 @@ def detect_from_translator(
     interaction_override_mode: Literal["scale", "replace"] = "scale",
 ) -> dict[str, Any]:
     """Translate raw context through domain adapter then run safe detection."""
-    translation = translator.translate(raw_context)
+    with span("sdk.translate", profile=profile_name):
+        translation = translator.translate(raw_context)
     return safe_detect(
         registry=registry,
         profile_name=profile_name,
@@ -72,3 +163,48 @@ def detect_from_translator(
         interaction_override=interaction_override,
         interaction_override_mode=interaction_override_mode,
     )
+
+
+
+def detect_stream_from_translator(
+    registry: DomainProfileRegistry,
+    profile_name: str,
+    translator: DomainTranslator | BatchDomainTranslator,
+    raw_contexts: Iterable[Mapping[str, Any]],
+    mode: Literal["friction", "emergence"],
+    chunk_size: int = 256,
+    f_time: float = 1.0,
+    threshold_override: dict[str, float] | None = None,
+    temporal_config: dict[str, Any] | None = None,
+    interaction_mode: Literal["dynamic", "base"] = "dynamic",
+    interaction_override: dict[str, float] | list[float] | None = None,
+    interaction_override_mode: Literal["scale", "replace"] = "scale",
+    profile_version: str | None = None,
+) -> Iterator[EnvelopeView]:
+    """Lazily translate and detect an iterable of raw contexts in bounded chunks.
+
+    At most `chunk_size` contexts and their translations are buffered at a time.
+    Translators implementing `translate_many` receive each chunk in one call so they
+    can vectorize feature extraction, and each chunk is scored in one vectorized
+    `score_batch` pass. Results are yielded in input order as lazy `EnvelopeView`s:
+    `m_score`, `alert` and friends read straight from the batch columns, and the
+    full envelope is built only when a view is read as a mapping.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+
+    profile = registry.get(profile_name, profile_version)
+    contexts = iter(raw_contexts)
+    while chunk := list(islice(contexts, chunk_size)):
+        translations = translate_chunk(translator, chunk)
+        yield from score_batch(
+            profile=profile,
+            layer_values=[translation.layer_values for translation in translations],
+            mode=mode,
+            f_time=f_time,
+            threshold_override=threshold_override,
+            temporal_config=temporal_config,
+            interaction_mode=interaction_mode,
+            interaction_override=interaction_override,
+            interaction_override_mode=interaction_override_mode,
+        )
@@ -2,17 +2,40 @@
 
 from __future__ import annotations
 
+import atexit
+import copy
+import hashlib
+import hmac
 import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 from typing import Any
 
 from fastmcp import FastMCP
+from fastmcp.tools.tool import ToolResult
+from mcp.types import TextContent
 
 from cip_core import __version__
 from cip_core.config.settings import get_settings
-from cip_core.domain_profiles.registry import DomainProfileRegistry
+from cip_core.domain_profiles.registry import DomainProfileRegistry, split_profile_ref
 from cip_core.domain_profiles.validator import validate_profile_yaml
+from cip_core.mantic.batch import decode_packed_layers, run_batch_detection
+from cip_core.mantic.counterfactual import run_threshold_distance
 from cip_core.mantic.runtime import run_detection
+from cip_core.mantic.shadow import ShadowScorer, parse_shadow_candidates
+from cip_core.mantic.uncertainty import DEFAULT_SAMPLES, run_uncertainty
+from cip_core.models.encoding import get_json_encoder
+from cip_core.observability.profiling import RequestProfiler
+from cip_core.observability.tracing import Span, span, trace_context
+from cip_core.persistence.audit_sink import AuditSink, RotatingJsonlAuditSink, build_audit_record
+from cip_core.persistence.history import DetectionHistoryStore
+from cip_core.sdk.rollup import AGGREGATIONS, GroupRollup
+from cip_core.server.usage import RateLimits, UsageAccountant, UsageMiddleware
+from cip_core.server.warmup import warm_up
+from cip_core.server.workers import WorkerMetrics, WorkerMetricsMiddleware, worker_path
+from cip_core.utils.lru import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -29,27 +52,134 @@ def _error_response(message: str, *, code: str = "validation_error") -> dict[str
 
 
 
+def resolve_profiles_dir(raw: str | Path) -> Path:
+    """Return the profile directory, anchoring relative paths to the project root."""
+    raw_dir = Path(raw)
+    # Anchor relative paths to the project root (alongside pyproject.toml)
+    if not raw_dir.is_absolute():
+        project_root = Path(__file__).resolve().parent.parent.parent.parent
+        return project_root / raw_dir
+    return raw_dir
+
+
+
+@contextmanager
+def _tool_span(tool: str, trace_id: str | None, **attributes: Any) -> Iterator[Span]:
+    # A caller-supplied trace_id joins this request to the caller's own trace.
+    with (
+        trace_context(trace_id) if trace_id else nullcontext(),
+        span("mcp.tool", tool=tool, **attributes) as current,
+    ):
+        yield current
+
+
+
 def create_app(
     *,
     profile_registry_override: DomainProfileRegistry | None = None,
     profiles_dir_override: str | Path | None = None,
+    audit_sink_override: AuditSink | None = None,
+    shadow_scorer_override: ShadowScorer | None = None,
+    worker_metrics: WorkerMetrics | None = None,
+    worker_slot: int | None = None,
+    shutdown_hooks: list[Callable[[], None]] | None = None,
+    startup_report: dict[str, Any] | None = None,
 ) -> FastMCP:
-    """Create and configure the Mantic-first MCP server."""
+    """Create and configure the Mantic-first MCP server.
+
+    Background writers opened here are closed at interpreter exit, or appended to
+    `shutdown_hooks` for callers (pre-fork workers) that exit without running
+    atexit handlers. `worker_slot` gives each worker its own audit log file.
+    """
     settings = get_settings()
 
-    raw_dir = Path(profiles_dir_override or settings.cip_profiles_dir)
-    # Anchor relative paths to the project root (alongside pyproject.toml)
-    if not raw_dir.is_absolute():
-        project_root = Path(__file__).resolve().parent.parent.parent.parent
-        profile_dir = project_root / raw_dir
-    else:
-        profile_dir = raw_dir
+    def _on_shutdown(close: Callable[[], None]) -> None:
+        if shutdown_hooks is None:
+            atexit.register(close)
+        else:
+            shutdown_hooks.append(close)
+
+    started = time.perf_counter()
+    profile_dir = resolve_profiles_dir(profiles_dir_override or settings.cip_profiles_dir)
     if profile_registry_override is not None:
         registry = profile_registry_override
     else:
         registry = DomainProfileRegistry.from_directory(profile_dir)
 
     logger.info("Loaded %d domain profiles from %s", len(registry), profile_dir)
+    if startup_report is not None:
+        startup = dict(startup_report)
+    else:
+        startup = {"registry_load_ms": round((time.perf_counter() - started) * 1000.0, 3)}
+        # Warm before any tool is registered, so the server only reports ready once
+        # the kernel, scoring params and response models are primed.
+        startup.update(warm_up(registry) if settings.cip_warmup else {"warmed": False})
+
+    history: DetectionHistoryStore | None = None
+    if settings.cip_history_db_path:
+        # Workers share one database: SQLite serializes writers across processes,
+        # and every worker's reads must see detections served by the others.
+        history = DetectionHistoryStore(
+            settings.cip_history_db_path,
+            retention_days=settings.cip_history_retention_days,
+            batch_size=settings.cip_history_batch_size,
+            max_queue=settings.cip_history_queue_size,
+            compaction_rows=settings.cip_history_compaction_rows,
+        )
+        _on_shutdown(history.close)
+        logger.info("Detection history enabled at %s", settings.cip_history_db_path)
+
+    audit_sink: AuditSink | None = audit_sink_override
+    if audit_sink is None and settings.cip_audit_log_path:
+        # A rotating file has one owner; concurrent rotation by several workers races.
+        audit_path = settings.cip_audit_log_path
+        if worker_slot is not None:
+            audit_path = worker_path(audit_path, worker_slot)
+        audit_sink = RotatingJsonlAuditSink(
+            audit_path,
+            max_bytes=settings.cip_audit_max_bytes,
+            backup_count=settings.cip_audit_backup_count,
+            max_queue=settings.cip_audit_queue_size,
+        )
+        _on_shutdown(audit_sink.close)
+        logger.info("Audit sink enabled at %s", audit_path)
+
+    shadow: ShadowScorer | None = shadow_scorer_override
+    shadow_candidates = parse_shadow_candidates(settings.cip_shadow_candidates)
+    if shadow is None and shadow_candidates:
+        shadow = ShadowScorer(
+            registry,
+            shadow_candidates,
+            sample_rate=settings.cip_shadow_sample_rate,
+            max_queue=settings.cip_shadow_queue_size,
+            max_queued_rows=settings.cip_shadow_max_queued_rows,
+        )
+        _on_shutdown(shadow.close)
+        logger.info("Shadow scoring enabled for %s", settings.cip_shadow_candidates)
+
+    profiler = RequestProfiler()
+    validation_cache = LRUCache(max_entries=settings.cip_profile_validation_cache_size)
+    encode_json = get_json_encoder(settings.cip_json_encoder)
+
+    def _respond(payload: dict[str, Any]) -> Any:
+        """Return `payload`, pre-encoded when `CIP_JSON_ENCODER` selects an encoder.
+
+        The ToolResult carries the text content the framework would produce and the
+        payload itself as structured content, skipping `to_jsonable_python`.
+        """
+        if encode_json is None:
+            return payload
+        return ToolResult(
+            content=[TextContent(type="text", text=encode_json(payload))],
+            structured_content=payload,
+        )
+
+    def _emit_audit(envelope: dict[str, Any], *, tool: str, entity_id: str | None = None) -> None:
+        if audit_sink is None:
+            return
+        record = build_audit_record(envelope, tool=tool, entity_id=entity_id)
+        if record is not None:
+            audit_sink.emit(record)
 
     server = FastMCP(
         "CIP Mantic Core",
@@ -60,6 +190,19 @@ def create_app(
         ),
     )
 
+    usage = UsageAccountant(
+        RateLimits(
+            client_requests_per_second=settings.cip_rate_limit_client_rps,
+            client_rows_per_second=settings.cip_rate_limit_client_rows_per_second,
+            profile_requests_per_second=settings.cip_rate_limit_profile_rps,
+            profile_rows_per_second=settings.cip_rate_limit_profile_rows_per_second,
+            burst_seconds=settings.cip_rate_limit_burst_seconds,
+        )
+    )
+    server.add_middleware(UsageMiddleware(usage, settings.cip_client_id_header))
+    if worker_metrics is not None:
+        server.add_middleware(WorkerMetricsMiddleware(worker_metrics))
+
     def _run_mantic_detect(
         *,
         profile_name: str,
@@ -71,9 +214,49 @@ def create_app(
         interaction_mode: str = "dynamic",
         interaction_override: dict[str, float] | list[float] | None = None,
         interaction_override_mode: str = "scale",
+        entity_id: str | None = None,
+        trace_id: str | None = None,
+        profile_version: str | None = None,
+        tool: str = "mantic_detect",
+    ) -> dict[str, Any]:
+        with (
+            _tool_span(
+                tool, trace_id, profile=profile_name, version=profile_version, mode=mode
+            ) as current,
+            profiler.profile_request(),
+        ):
+            envelope = _detect_envelope(
+                profile_name=profile_name,
+                layer_values=layer_values,
+                mode=mode,
+                f_time=f_time,
+                threshold_override=threshold_override,
+                temporal_config=temporal_config,
+                interaction_mode=interaction_mode,
+                interaction_override=interaction_override,
+                interaction_override_mode=interaction_override_mode,
+                entity_id=entity_id,
+                profile_version=profile_version,
+            )
+            current.set_attribute("status", envelope["status"])
+            return _respond(envelope)
+
+    def _detect_envelope(
+        *,
+        profile_name: str,
+        layer_values: list[float],
+        mode: str,
+        f_time: float,
+        threshold_override: dict[str, float] | None,
+        temporal_config: dict[str, Any] | None,
+        interaction_mode: str,
+        interaction_override: dict[str, float] | list[float] | None,
+        interaction_override_mode: str,
+        entity_id: str | None,
+        profile_version: str | None,
     ) -> dict[str, Any]:
         try:
-            profile = registry.get(profile_name)
+            profile = registry.get(profile_name, profile_version)
             if mode not in {"friction", "emergence"}:
                 return _error_response("mode must be 'friction' or 'emergence'")
             if interaction_mode not in {"dynamic", "base"}:
@@ -96,6 +279,21 @@ def create_app(
                 interaction_override=interaction_override,
                 interaction_override_mode=interaction_override_mode,
             )
+            if history is not None:
+                history.record(envelope, entity_id=entity_id)
+            _emit_audit(envelope, tool="mantic_detect", entity_id=entity_id)
+            if shadow is not None:
+                shadow.submit(
+                    profile,
+                    layer_values,
+                    mode=mode,
+                    f_time=f_time,
+                    threshold_override=threshold_override,
+                    temporal_config=temporal_config,
+                    interaction_mode=interaction_mode,
+                    interaction_override=interaction_override,
+                    interaction_override_mode=interaction_override_mode,
+                )
             return envelope
         except KeyError as exc:
             return _error_response(str(exc), code="unknown_profile")
@@ -105,36 +303,85 @@ def create_app(
 
     @server.tool
     def health_check() -> dict[str, Any]:
-        """Check server readiness and profile load state."""
-        return {
+        """Check server readiness, profile load state and startup import/warmup timings."""
+        response: dict[str, Any] = {
             "status": "ok",
             "server": "CIP Mantic Core",
             "version": __version__,
             "profiles_loaded": len(registry),
+            "startup": startup,
         }
+        if audit_sink is not None:
+            response["audit_sink"] = audit_sink.stats()
+        if worker_metrics is not None:
+            response["workers"] = worker_metrics.snapshot()
+        response["profile_validation_cache"] = validation_cache.stats()
+        return response
 
     @server.tool
-    def list_domain_profiles() -> dict[str, Any]:
-        """List registered domain profiles available for detection."""
+    def list_domain_profiles(all_versions: bool = False) -> dict[str, Any]:
+        """List registered domain profiles available for detection.
+
+        Each entry is a domain's latest version with its `versions`; set
+        `all_versions` for one entry per registered version.
+        """
         return {
             "status": "ok",
             "count": len(registry),
-            "profiles": registry.list(),
+            "profiles": registry.list(all_versions=all_versions),
         }
 
+    def _validate_profile_document(profile_yaml: str) -> dict[str, Any]:
+        encoded = profile_yaml.encode("utf-8")
+        if len(encoded) > settings.cip_max_profile_yaml_bytes:
+            # Rejected before hashing or parsing, so oversized input costs one encode.
+            return _error_response(
+                f"profile_yaml is {len(encoded)} bytes; limit is "
+                f"{settings.cip_max_profile_yaml_bytes}",
+                code="payload_too_large",
+            )
+
+        def _validate() -> dict[str, Any]:
+            is_valid, errors, profile = validate_profile_yaml(profile_yaml)
+            response: dict[str, Any] = {
+                "status": "ok",
+                "valid": is_valid,
+                "errors": errors,
+            }
+            if profile is not None:
+                response["profile"] = profile.model_dump()
+                response["descriptor"] = profile.descriptor()
+            return response
+
+        # Every caller gets its own copy: responses carry nested errors/profile data
+        # that middleware or callers may mutate.
+        key = hashlib.sha256(encoded).hexdigest()
+        return copy.deepcopy(validation_cache.get_or_compute(key, _validate))
+
     @server.tool
     def validate_domain_profile(profile_yaml: str) -> dict[str, Any]:
         """Validate a domain profile YAML document against canonical schema."""
-        is_valid, errors, profile = validate_profile_yaml(profile_yaml)
-        response: dict[str, Any] = {
+        return _validate_profile_document(profile_yaml)
+
+    @server.tool
+    def validate_domain_profiles(profile_yamls: list[str]) -> dict[str, Any]:
+        """Validate many domain profile YAML documents in one call.
+
+        Results are in input order, each shaped like `validate_domain_profile`'s
+        response. Unchanged documents are answered from a content-hash cache.
+        """
+        if len(profile_yamls) > settings.cip_max_profile_batch_documents:
+            return _error_response(
+                f"profile_yamls must contain <= {settings.cip_max_profile_batch_documents} "
+                "documents"
+            )
+        results = [_validate_profile_document(document) for document in profile_yamls]
+        return {
             "status": "ok",
-            "valid": is_valid,
-            "errors": errors,
+            "count": len(results),
+            "valid_count": sum(result.get("valid") is True for result in results),
+            "results": results,
         }
-        if profile is not None:
-            response["profile"] = profile.model_dump()
-            response["descriptor"] = profile.descriptor()
-        return response
 
     @server.tool
     def mantic_detect(
@@ -147,8 +394,16 @@ def create_app(
         interaction_mode: str = "dynamic",
         interaction_override: dict[str, float] | list[float] | None = None,
         interaction_override_mode: str = "scale",
+        entity_id: str | None = None,
+        trace_id: str | None = None,
+        profile_version: str | None = None,
     ) -> dict[str, Any]:
-        """Run profile-based Mantic detection in friction or emergence mode."""
+        """Run profile-based Mantic detection in friction or emergence mode.
+
+        Pass `entity_id` to key the envelope in the detection history store when enabled,
+        `trace_id` to correlate this call with the caller's trace, and `profile_version`
+        (or `profile_name="name@version"`) to pin a profile version instead of the latest.
+        """
         return _run_mantic_detect(
             profile_name=profile_name,
             layer_values=layer_values,
@@ -159,6 +414,10 @@ def create_app(
             interaction_mode=interaction_mode,
             interaction_override=interaction_override,
             interaction_override_mode=interaction_override_mode,
+            entity_id=entity_id,
+            trace_id=trace_id,
+            profile_version=profile_version,
+            tool="mantic_detect",
         )
 
     @server.tool
@@ -171,6 +430,9 @@ def create_app(
         interaction_mode: str = "dynamic",
         interaction_override: dict[str, float] | list[float] | None = None,
         interaction_override_mode: str = "scale",
+        entity_id: str | None = None,
+        trace_id: str | None = None,
+        profile_version: str | None = None,
     ) -> dict[str, Any]:
         """Run profile-based Mantic friction detection."""
         return _run_mantic_detect(
@@ -183,6 +445,10 @@ def create_app(
             interaction_mode=interaction_mode,
             interaction_override=interaction_override,
             interaction_override_mode=interaction_override_mode,
+            entity_id=entity_id,
+            trace_id=trace_id,
+            profile_version=profile_version,
+            tool="mantic_detect_friction",
         )
 
     @server.tool
@@ -195,6 +461,9 @@ def create_app(
         interaction_mode: str = "dynamic",
         interaction_override: dict[str, float] | list[float] | None = None,
         interaction_override_mode: str = "scale",
+        entity_id: str | None = None,
+        trace_id: str | None = None,
+        profile_version: str | None = None,
     ) -> dict[str, Any]:
         """Run profile-based Mantic emergence detection."""
         return _run_mantic_detect(
@@ -207,8 +476,510 @@ def create_app(
             interaction_mode=interaction_mode,
             interaction_override=interaction_override,
             interaction_override_mode=interaction_override_mode,
+            entity_id=entity_id,
+            trace_id=trace_id,
+            profile_version=profile_version,
+            tool="mantic_detect_emergence",
         )
 
+    @server.tool
+    def mantic_detect_batch(
+        profile_name: str,
+        layer_values: list[list[float]] | None = None,
+        layer_values_b64: str | None = None,
+        rows: int | None = None,
+        dtype: str = "float32",
+        mode: str = "friction",
+        f_time: float = 1.0,
+        threshold_override: dict[str, float] | None = None,
+        temporal_config: dict[str, Any] | None = None,
+        interaction_mode: str = "dynamic",
+        interaction_override: dict[str, float] | list[float] | None = None,
+        interaction_override_mode: str = "scale",
+        trace_id: str | None = None,
+        profile_version: str | None = None,
+    ) -> dict[str, Any]:
+        """Score many layer vectors in one vectorized pass and return columnar results.
+
+        Pass either `layer_values` as a list of rows, or `layer_values_b64` as a base64
+        packed little-endian float32/float64 buffer with `rows` rows of profile layer count.
+        """
+        with (
+            _tool_span(
+                "mantic_detect_batch",
+                trace_id,
+                profile=profile_name,
+                version=profile_version,
+                mode=mode,
+                batch_size=rows if layer_values is None else len(layer_values),
+            ) as current,
+            profiler.profile_request(),
+        ):
+            payload = _detect_batch(
+                profile_name=profile_name,
+                layer_values=layer_values,
+                layer_values_b64=layer_values_b64,
+                rows=rows,
+                dtype=dtype,
+                mode=mode,
+                f_time=f_time,
+                threshold_override=threshold_override,
+                temporal_config=temporal_config,
+                interaction_mode=interaction_mode,
+                interaction_override=interaction_override,
+                interaction_override_mode=interaction_override_mode,
+                profile_version=profile_version,
+            )
+            current.set_attribute("status", payload["status"])
+            return _respond(payload)
+
+    def _detect_batch(
+        *,
+        profile_name: str,
+        layer_values: list[list[float]] | None,
+        layer_values_b64: str | None,
+        rows: int | None,
+        dtype: str,
+        mode: str,
+        f_time: float,
+        threshold_override: dict[str, float] | None,
+        temporal_config: dict[str, Any] | None,
+        interaction_mode: str,
+        interaction_override: dict[str, float] | list[float] | None,
+        interaction_override_mode: str,
+        profile_version: str | None,
+    ) -> dict[str, Any]:
+        try:
+            profile = registry.get(profile_name, profile_version)
+            if mode not in {"friction", "emergence"}:
+                return _error_response("mode must be 'friction' or 'emergence'")
+            if interaction_mode not in {"dynamic", "base"}:
+                return _error_response("interaction_mode must be 'dynamic' or 'base'")
+            if interaction_override_mode not in {"scale", "replace"}:
+                return _error_response("interaction_override_mode must be 'scale' or 'replace'")
+            if (layer_values is None) == (layer_values_b64 is None):
+                return _error_response("provide exactly one of layer_values or layer_values_b64")
+
+            if layer_values_b64 is not None:
+                if rows is None:
+                    return _error_response("rows is required with layer_values_b64")
+                row_count = rows
+            else:
+                row_count = len(layer_values)
+            if row_count > settings.cip_max_batch_rows:
+                return _error_response(f"batch rows must be <= {settings.cip_max_batch_rows}")
+
+            matrix = (
+                decode_packed_layers(
+                    layer_values_b64, rows, len(profile.layer_names), dtype=dtype
+                )
+                if layer_values_b64 is not None
+                else layer_values
+            )
+            payload = run_batch_detection(
+                profile=profile,
+                layer_values=matrix,
+                mode=mode,
+                f_time=f_time,
+                threshold_override=threshold_override,
+                temporal_config=temporal_config,
+                interaction_mode=interaction_mode,
+                interaction_override=interaction_override,
+                interaction_override_mode=interaction_override_mode,
+            )
+            _emit_audit(payload, tool="mantic_detect_batch")
+            if shadow is not None:
+                shadow.submit(
+                    profile,
+                    matrix,
+                    mode=mode,
+                    f_time=f_time,
+                    threshold_override=threshold_override,
+                    temporal_config=temporal_config,
+                    interaction_mode=interaction_mode,
+                    interaction_override=interaction_override,
+                    interaction_override_mode=interaction_override_mode,
+                )
+            return payload
+        except KeyError as exc:
+            return _error_response(str(exc), code="unknown_profile")
+        except Exception as exc:
+            logger.exception("mantic_detect_batch failed")
+            return _error_response(str(exc), code="runtime_error")
+
+    @server.tool
+    def mantic_detect_rollup(
+        profile_name: str,
+        group_keys: list[str],
+        layer_values: list[list[float]],
+        aggregation: str = "mean",
+        weights: list[float] | None = None,
+        mode: str = "friction",
+        f_time: float = 1.0,
+        threshold_override: dict[str, float] | None = None,
+        temporal_config: dict[str, Any] | None = None,
+        interaction_mode: str = "dynamic",
+        interaction_override: dict[str, float] | list[float] | None = None,
+        interaction_override_mode: str = "scale",
+        trace_id: str | None = None,
+        profile_version: str | None = None,
+    ) -> dict[str, Any]:
+        """Roll entity layer vectors up to their groups and score each group.
+
+        Row i of `layer_values` belongs to `group_keys[i]`. Groups are aggregated by
+        `mean`, `weighted` (per-row `weights`) or `worst_case` (the member with the
+        highest detection statistic), scored in one vectorized pass, and returned
+        as columnar results with member and member-alert counts per group.
+        """
+        with (
+            _tool_span(
+                "mantic_detect_rollup",
+                trace_id,
+                profile=profile_name,
+                version=profile_version,
+                mode=mode,
+                batch_size=len(layer_values),
+            ) as current,
+            profiler.profile_request(),
+        ):
+            payload = _detect_rollup(
+                profile_name=profile_name,
+                group_keys=group_keys,
+                layer_values=layer_values,
+                aggregation=aggregation,
+                weights=weights,
+                mode=mode,
+                f_time=f_time,
+                threshold_override=threshold_override,
+                temporal_config=temporal_config,
+                interaction_mode=interaction_mode,
+                interaction_override=interaction_override,
+                interaction_override_mode=interaction_override_mode,
+                profile_version=profile_version,
+            )
+            current.set_attribute("status", payload["status"])
+            return _respond(payload)
+
+    def _detect_rollup(
+        *,
+        profile_name: str,
+        group_keys: list[str],
+        layer_values: list[list[float]],
+        aggregation: str,
+        weights: list[float] | None,
+        mode: str,
+        f_time: float,
+        threshold_override: dict[str, float] | None,
+        temporal_config: dict[str, Any] | None,
+        interaction_mode: str,
+        interaction_override: dict[str, float] | list[float] | None,
+        interaction_override_mode: str,
+        profile_version: str | None,
+    ) -> dict[str, Any]:
+        if mode not in {"friction", "emergence"}:
+            return _error_response("mode must be 'friction' or 'emergence'")
+        if aggregation not in AGGREGATIONS:
+            return _error_response(f"aggregation must be one of {list(AGGREGATIONS)}")
+        if interaction_mode not in {"dynamic", "base"}:
+            return _error_response("interaction_mode must be 'dynamic' or 'base'")
+        if interaction_override_mode not in {"scale", "replace"}:
+            return _error_response("interaction_override_mode must be 'scale' or 'replace'")
+        if not layer_values:
+            return _error_response("layer_values must contain at least one row")
+        if len(layer_values) > settings.cip_max_batch_rows:
+            return _error_response(f"batch rows must be <= {settings.cip_max_batch_rows}")
+        try:
+            rollup = GroupRollup(
+                registry,
+                profile_name,
+                mode,
+                aggregation=aggregation,
+                f_time=f_time,
+                threshold_override=threshold_override,
+                temporal_config=temporal_config,
+                interaction_mode=interaction_mode,
+                interaction_override=interaction_override,
+                interaction_override_mode=interaction_override_mode,
+                profile_version=profile_version,
+            )
+            rollup.add(group_keys, layer_values, weights)
+            payload = rollup.to_payload()
+            _emit_audit(payload, tool="mantic_detect_rollup")
+            return payload
+        except KeyError as exc:
+            return _error_response(str(exc), code="unknown_profile")
+        except ValueError as exc:
+            return _error_response(str(exc))
+        except Exception as exc:
+            logger.exception("mantic_detect_rollup failed")
+            return _error_response(str(exc), code="runtime_error")
+
+    @server.tool
+    def mantic_threshold_distance(
+        profile_name: str,
+        layer_values: list[float] | list[list[float]],
+        mode: str = "friction",
+        f_time: float = 1.0,
+        threshold_override: dict[str, float] | None = None,
+        temporal_config: dict[str, Any] | None = None,
+        interaction_mode: str = "dynamic",
+        interaction_override: dict[str, float] | list[float] | None = None,
+        interaction_override_mode: str = "scale",
+        profile_version: str | None = None,
+    ) -> dict[str, Any]:
+        """Solve the minimal single-layer change that flips a row's alert state.
+
+        Distances are measured on the detection statistic that drives `alert` (layer
+        range in friction mode, layer floor in emergence mode). Accepts one layer
+        vector or a batch and reports, per layer, the delta onto the threshold,
+        whether it stays inside [0, 1], and the cheapest layer to move.
+        """
+        try:
+            profile = registry.get(profile_name, profile_version)
+            if mode not in {"friction", "emergence"}:
+                return _error_response("mode must be 'friction' or 'emergence'")
+            if interaction_mode not in {"dynamic", "base"}:
+                return _error_response("interaction_mode must be 'dynamic' or 'base'")
+            if interaction_override_mode not in {"scale", "replace"}:
+                return _error_response("interaction_override_mode must be 'scale' or 'replace'")
+
+            return run_threshold_distance(
+                profile=profile,
+                layer_values=layer_values,
+                mode=mode,
+                f_time=f_time,
+                threshold_override=threshold_override,
+                temporal_config=temporal_config,
+                interaction_mode=interaction_mode,
+                interaction_override=interaction_override,
+                interaction_override_mode=interaction_override_mode,
+            )
+        except KeyError as exc:
+            return _error_response(str(exc), code="unknown_profile")
+        except Exception as exc:
+            logger.exception("mantic_threshold_distance failed")
+            return _error_response(str(exc), code="runtime_error")
+
+    @server.tool
+    def mantic_detect_uncertainty(
+        profile_name: str,
+        layer_values: list[float],
+        mode: str = "friction",
+        layer_std: list[float] | None = None,
+        layer_intervals: list[list[float]] | None = None,
+        samples: int = DEFAULT_SAMPLES,
+        seed: int = 0,
+        deadline_ms: float | None = None,
+        f_time: float = 1.0,
+        threshold_override: dict[str, float] | None = None,
+        temporal_config: dict[str, Any] | None = None,
+        interaction_mode: str = "dynamic",
+        interaction_override: dict[str, float] | list[float] | None = None,
+        interaction_override_mode: str = "scale",
+        profile_version: str | None = None,
+    ) -> dict[str, Any]:
+        """Propagate per-layer uncertainty (std devs or intervals) into an M-score distribution.
+
+        Returns seeded, reproducible percentiles and the probability of alert.
+        """
+        try:
+            profile = registry.get(profile_name, profile_version)
+            if mode not in {"friction", "emergence"}:
+                return _error_response("mode must be 'friction' or 'emergence'")
+            if interaction_mode not in {"dynamic", "base"}:
+                return _error_response("interaction_mode must be 'dynamic' or 'base'")
+            if interaction_override_mode not in {"scale", "replace"}:
+                return _error_response("interaction_override_mode must be 'scale' or 'replace'")
+            if samples > settings.cip_max_uncertainty_samples:
+                return _error_response(
+                    f"samples must be <= {settings.cip_max_uncertainty_samples}"
+                )
+
+            return run_uncertainty(
+                profile=profile,
+                layer_values=layer_values,
+                mode=mode,
+                layer_std=layer_std,
+                layer_intervals=layer_intervals,
+                samples=samples,
+                seed=seed,
+                deadline_ms=deadline_ms,
+                f_time=f_time,
+                threshold_override=threshold_override,
+                temporal_config=temporal_config,
+                interaction_mode=interaction_mode,
+                interaction_override=interaction_override,
+                interaction_override_mode=interaction_override_mode,
+            )
+        except KeyError as exc:
+            return _error_response(str(exc), code="unknown_profile")
+        except ValueError as exc:
+            return _error_response(str(exc))
+        except Exception as exc:
+            logger.exception("mantic_detect_uncertainty failed")
+            return _error_response(str(exc), code="runtime_error")
+
+    @server.tool
+    def detection_history(
+        profile_name: str,
+        entity_id: str,
+        limit: int = 50,
+        cursor: str | None = None,
+        mode: str | None = None,
+        consistent: bool = False,
+        profile_version: str | None = None,
+    ) -> dict[str, Any]:
+        """Return an entity's stored detections for a profile, newest first.
+
+        `profile_version` (or `name@version`) restricts results to detections scored
+        by that version. Pass the returned `next_cursor` back as `cursor` to fetch the
+        next page. Reads see committed rows; `consistent=True` first waits for queued
+        detections to be written.
+        """
+        if history is None:
+            return _error_response(
+                "detection history is disabled; set CIP_HISTORY_DB_PATH",
+                code="history_disabled",
+            )
+        if not 1 <= limit <= 500:
+            return _error_response("limit must be between 1 and 500")
+        try:
+            name, version = split_profile_ref(profile_name, profile_version)
+            if consistent:
+                history.flush()
+            page = history.entity_history(
+                name, entity_id, limit=limit, cursor=cursor, mode=mode, version=version
+            )
+            return {
+                "status": "ok",
+                "profile_name": name,
+                "profile_version": version,
+                "entity_id": entity_id,
+                **page,
+            }
+        except KeyError as exc:
+            return _error_response(str(exc), code="unknown_profile")
+        except ValueError as exc:
+            return _error_response(str(exc))
+        except Exception as exc:
+            logger.exception("detection_history failed")
+            return _error_response(str(exc), code="runtime_error")
+
+    @server.tool
+    def recent_alerts(
+        profile_name: str,
+        limit: int = 50,
+        cursor: str | None = None,
+        since: float | None = None,
+        consistent: bool = False,
+        profile_version: str | None = None,
+    ) -> dict[str, Any]:
+        """Return a profile's stored alerting detections, newest first.
+
+        `since` is a Unix timestamp lower bound; `profile_version` (or `name@version`)
+        restricts results to one version. Pass `next_cursor` back as `cursor`
+        to fetch the next page. `consistent=True` first waits for queued detections
+        to be written.
+        """
+        if history is None:
+            return _error_response(
+                "detection history is disabled; set CIP_HISTORY_DB_PATH",
+                code="history_disabled",
+            )
+        if not 1 <= limit <= 500:
+            return _error_response("limit must be between 1 and 500")
+        try:
+            name, version = split_profile_ref(profile_name, profile_version)
+            if consistent:
+                history.flush()
+            page = history.recent_alerts(
+                name, limit=limit, cursor=cursor, since=since, version=version
+            )
+            return {"status": "ok", "profile_name": name, "profile_version": version, **page}
+        except KeyError as exc:
+            return _error_response(str(exc), code="unknown_profile")
+        except ValueError as exc:
+            return _error_response(str(exc))
+        except Exception as exc:
+            logger.exception("recent_alerts failed")
+            return _error_response(str(exc), code="runtime_error")
+
+    @server.tool
+    def shadow_metrics(reset: bool = False) -> dict[str, Any]:
+        """Return divergence between served and candidate profile versions on live traffic.
+
+        Per version pair: M-score delta distribution, alert flip counts and rate, and
+        `limiting_factor` changes. Samples still queued for scoring are reported under
+        `queued_rows`, not yet in the comparisons. `reset=true` clears the statistics
+        after reading. Enabled by CIP_SHADOW_CANDIDATES.
+        """
+        if shadow is None:
+            return _error_response(
+                "shadow scoring is disabled; set CIP_SHADOW_CANDIDATES",
+                code="shadow_disabled",
+            )
+        try:
+            # Report what has been scored so far; never wait on the scoring thread.
+            response = {"status": "ok", **shadow.stats()}
+            if reset:
+                shadow.reset()
+            return response
+        except Exception as exc:
+            logger.exception("shadow_metrics failed")
+            return _error_response(str(exc), code="runtime_error")
+
+    @server.tool
+    def usage_metrics(top_n: int = 20, reset: bool = False) -> dict[str, Any]:
+        """Return request, row, error, rate-limit and CPU usage per client and per profile.
+
+        Clients are identified by the CIP_CLIENT_ID_HEADER request header. Entries
+        are ordered by CPU time; `reset=true` clears the counters after reading.
+        """
+        if not 1 <= top_n <= 1000:
+            return _error_response("top_n must be between 1 and 1000")
+        response = {"status": "ok", **usage.snapshot(top_n=top_n)}
+        if reset:
+            usage.reset()
+        return response
+
+    @server.tool
+    def debug_profile(
+        admin_token: str,
+        action: str = "report",
+        requests: int | None = None,
+        seconds: float | None = None,
+        top_n: int = 20,
+    ) -> dict[str, Any]:
+        """Admin-only: profile the next `requests` detect calls or the next `seconds`.
+
+        `action="start"` arms a session, `"report"` returns the hottest `cip_core` /
+        `mantic_thinking` functions by cumulative time plus allocation counts per
+        source line, and `"stop"` disarms and returns the final report. Disabled
+        unless CIP_DEBUG_PROFILE_ENABLED and CIP_ADMIN_TOKEN are set.
+        """
+        if not settings.cip_debug_profile_enabled or not settings.cip_admin_token:
+            return _error_response(
+                "debug_profile is disabled; set CIP_DEBUG_PROFILE_ENABLED and CIP_ADMIN_TOKEN",
+                code="disabled",
+            )
+        if not hmac.compare_digest(admin_token.encode(), settings.cip_admin_token.encode()):
+            return _error_response("invalid admin token", code="forbidden")
+        if action not in {"start", "report", "stop"}:
+            return _error_response("action must be 'start', 'report' or 'stop'")
+        if not 1 <= top_n <= 200:
+            return _error_response("top_n must be between 1 and 200")
+        try:
+            if action == "start":
+                profiler.start(requests=requests, seconds=seconds)
+            elif action == "stop":
+                profiler.stop()
+            return {"status": "ok", "action": action, **profiler.report(top_n=top_n)}
+        except ValueError as exc:
+            return _error_response(str(exc))
+        except Exception as exc:
+            logger.exception("debug_profile failed")
+            return _error_response(str(exc), code="runtime_error")
+
     return server
 
 
@@ -0,0 +1,292 @@
+"""Load generator for the streamable-http server.
+
+Starts `cip_core.server.main` on a free loopback port (or targets `--url`), then
+drives a weighted mix of tools from N concurrent MCP client sessions and prints
+throughput, error rate and latency percentiles as JSON.
+
+    python -m cip_core.server.loadgen --clients 16 --duration 30 \\
+        --mix mantic_detect=8,list_domain_profiles=1,health_check=1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+DEFAULT_MIX = {"mantic_detect": 8, "list_domain_profiles": 1, "health_check": 1}
+_READY_TIMEOUT_SECONDS = 30.0
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """Parse `tool=weight,tool=weight` into a weight mapping."""
+    mix: dict[str, float] = {}
+    for part in filter(None, (item.strip() for item in spec.split(","))):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    if not mix or any(weight < 0 for weight in mix.values()) or sum(mix.values()) <= 0:
+        raise ValueError("mix must name at least one tool with a positive weight")
+    return mix
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_server(
+    env: Mapping[str, str] | None = None, port: int | None = None
+) -> Iterator[str]:
+    """Run `cip_core.server.main` on loopback in a subprocess; yield its MCP URL."""
+    port = port or _free_port()
+    child_env = {
+        **os.environ,
+        "CIP_HOST": "127.0.0.1",
+        "CIP_PORT": str(port),
+        "CIP_LOG_LEVEL": "warning",
+        **(env or {}),
+    }
+    # stderr goes to a file, not a pipe: nobody reads it while the server runs,
+    # and a full pipe buffer would block the server's logging.
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "cip_core.server.main"],
+            env=child_env,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr_file,
+        )
+        try:
+            deadline = time.monotonic() + _READY_TIMEOUT_SECONDS
+            while True:
+                if process.poll() is not None:
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read().decode(errors="replace")
+                    raise RuntimeError(f"server exited during startup:\n{stderr[-2000:]}")
+                try:
+                    with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                        break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError("server did not start listening in time") from None
+                    time.sleep(0.1)
+            yield f"http://127.0.0.1:{port}/mcp"
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+@dataclass
+class _Samples:
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def add(self, tool: str, seconds: float, ok: bool) -> None:
+        self.latencies.setdefault(tool, []).append(seconds)
+        if not ok:
+            self.errors[tool] = self.errors.get(tool, 0) + 1
+
+
+def _layer_count(listing: Mapping[str, Any], profile_name: str) -> int:
+    """Layer count of `profile_name` (`name` or `name@version`) from `list_domain_profiles`."""
+    name, _, version = profile_name.partition("@")
+    for profile in listing.get("profiles", []):
+        if profile["domain_name"] == name and (not version or profile["version"] == version):
+            return len(profile["layer_names"])
+    raise RuntimeError(f"profile '{profile_name}' is not registered on the target server")
+
+
+async def fetch_layer_count(client: Any, profile_name: str) -> int:
+    """Ask the server how many layers `profile_name` has, through an open MCP client."""
+    # Unversioned refs resolve to the latest version, which the default listing shows.
+    listing = await client.call_tool(
+        "list_domain_profiles", {"all_versions": "@" in profile_name}
+    )
+    return _layer_count(listing.structured_content or {}, profile_name)
+
+
+def tool_arguments(
+    tool: str, profile_name: str, layer_count: int, rng: random.Random
+) -> dict[str, Any]:
+    """Random arguments for one call of `tool`: a layer vector for detection tools."""
+    if tool.startswith("mantic_detect"):
+        return {
+            "profile_name": profile_name,
+            "layer_values": [round(rng.random(), 3) for _ in range(layer_count)],
+        }
+    return {}
+
+
+def latency_summary(latencies: list[float], errors: int, elapsed: float) -> dict[str, Any]:
+    """Request count, error rate, throughput and latency percentiles (ms) of one run."""
+    if not latencies:
+        return {"requests": 0, "errors": errors, "error_rate": 0.0, "throughput_rps": 0.0}
+    millis = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(millis, [50, 95, 99])
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "error_rate": errors / len(latencies),
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": float(millis.mean()),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "max": float(millis.max()),
+        },
+    }
+
+
+async def run_load(
+    url: str,
+    *,
+    clients: int = 8,
+    duration: float | None = 10.0,
+    requests: int | None = None,
+    mix: Mapping[str, float] | None = None,
+    profile_name: str = "signal_core",
+    warmup_requests: int = 5,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Drive `url` from `clients` concurrent sessions until `duration` or `requests`."""
+    from fastmcp import Client
+
+    if clients < 1:
+        raise ValueError("clients must be >= 1")
+    if duration is None and requests is None:
+        raise ValueError("provide duration and/or requests")
+    mix = dict(mix or DEFAULT_MIX)
+    tools, weights = list(mix), list(mix.values())
+    samples = _Samples()
+    budget = [requests]
+
+    def _take() -> bool:
+        if budget[0] is None:
+            return True
+        if budget[0] <= 0:
+            return False
+        budget[0] -= 1
+        return True
+
+    connected = 0
+    all_connected = asyncio.Event()
+    ready = asyncio.Event()
+    window: dict[str, float | None] = {"deadline": None}
+
+    async def _worker(index: int) -> None:
+        nonlocal connected
+        rng = random.Random(seed + index)
+        async with Client(url) as client:
+            layer_count = await fetch_layer_count(client, profile_name)
+            for _ in range(warmup_requests):
+                await client.call_tool("health_check", {}, raise_on_error=False)
+            connected += 1
+            if connected == clients:
+                all_connected.set()
+            await ready.wait()
+            deadline = window["deadline"]
+            while (deadline is None or time.perf_counter() < deadline) and _take():
+                tool = rng.choices(tools, weights)[0]
+                arguments = tool_arguments(tool, profile_name, layer_count, rng)
+                started = time.perf_counter()
+                try:
+                    result = await client.call_tool(tool, arguments, raise_on_error=False)
+                    payload = result.structured_content or {}
+                    ok = not result.is_error and payload.get("status") != "error"
+                except Exception:
+                    ok = False
+                samples.add(tool, time.perf_counter() - started, ok)
+
+    # Sessions connect and warm up before the measured window opens.
+    workers = [asyncio.create_task(_worker(index)) for index in range(clients)]
+    waiter = asyncio.create_task(all_connected.wait())
+    await asyncio.wait([waiter, *workers], return_when=asyncio.FIRST_COMPLETED)
+    if not all_connected.is_set():
+        waiter.cancel()
+        ready.set()
+        await asyncio.gather(*workers)
+        raise RuntimeError("a client session ended before the load window opened")
+
+    start = time.perf_counter()
+    window["deadline"] = start + duration if duration is not None else None
+    ready.set()
+    await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [value for values in samples.latencies.values() for value in values]
+    return {
+        "url": url,
+        "clients": clients,
+        "duration_s": elapsed,
+        "mix": mix,
+        "total": latency_summary(all_latencies, sum(samples.errors.values()), elapsed),
+        "tools": {
+            tool: latency_summary(
+                samples.latencies.get(tool, []), samples.errors.get(tool, 0), elapsed
+            )
+            for tool in tools
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test the CIP Mantic Core MCP server.")
+    parser.add_argument("--url", help="target an already running server instead of starting one")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent MCP sessions")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--requests", type=int, help="stop after this many calls in total")
+    parser.add_argument(
+        "--mix",
+        default=",".join(f"{tool}={weight}" for tool, weight in DEFAULT_MIX.items()),
+        help="weighted tool mix, e.g. mantic_detect=8,health_check=1",
+    )
+    parser.add_argument("--profile", default="signal_core")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured calls per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report to this path")
+    args = parser.parse_args()
+
+    options = {
+        "clients": args.clients,
+        "duration": args.duration if args.requests is None else None,
+        "requests": args.requests,
+        "mix": parse_mix(args.mix),
+        "profile_name": args.profile,
+        "warmup_requests": args.warmup,
+        "seed": args.seed,
+    }
+    if args.url:
+        report = asyncio.run(run_load(args.url, **options))
+    else:
+        with local_server() as url:
+            report = asyncio.run(run_load(url, **options))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            fp.write(text + "\n")
+    return 0 if report["total"]["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,10 +3,15 @@
 from __future__ import annotations
 
 import logging
+import time
 from ipaddress import ip_address
+from typing import Any
 
 from cip_core.config.settings import get_settings
-from cip_core.server.app import create_app
+from cip_core.domain_profiles.registry import DomainProfileRegistry
+from cip_core.server.app import create_app, resolve_profiles_dir
+from cip_core.server.warmup import warm_up
+from cip_core.server.workers import serve_prefork
 
 
 def _is_loopback_host(host: str) -> bool:
@@ -30,11 +35,29 @@ def run() -> None:
             "Set CIP_ALLOW_INSECURE_BIND=true to override (unsafe)."
         )
 
+    if settings.cip_workers < 1:
+        raise RuntimeError("CIP_WORKERS must be >= 1")
+    if settings.cip_workers > 1:
+        # Load, validate and warm profiles once; forked workers share the snapshot
+        # and inherit the imported kernel and primed caches.
+        started = time.perf_counter()
+        registry = DomainProfileRegistry.from_directory(
+            resolve_profiles_dir(settings.cip_profiles_dir)
+        )
+        startup: dict[str, Any] = {
+            "registry_load_ms": round((time.perf_counter() - started) * 1000.0, 3)
+        }
+        startup.update(warm_up(registry) if settings.cip_warmup else {"warmed": False})
+        serve_prefork(settings, registry, startup)
+        return
+
     server = create_app()
     server.run(
         transport="streamable-http",
         host=settings.cip_host,
         port=settings.cip_port,
+        stateless_http=settings.cip_stateless_http,
+        json_response=settings.cip_json_response,
     )
 
 
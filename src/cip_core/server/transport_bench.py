@@ -0,0 +1,184 @@
+"""Per-call overhead of the default streamable-http mode vs stateless plain JSON.
+
+Request/response clients (batch pipelines) open a session for each call against
+the default server: initialize, initialized notification, the call itself over an
+event stream, then session teardown. With `CIP_STATELESS_HTTP=true` and
+`CIP_JSON_RESPONSE=true` the same call is one JSON POST. This benchmark measures
+both, plus a long-lived session as the reference floor:
+
+    python -m cip_core.server.transport_bench --requests 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any
+
+from cip_core.server.loadgen import (
+    fetch_layer_count,
+    latency_summary,
+    local_server,
+    tool_arguments,
+)
+
+STATELESS_JSON_ENV = {"CIP_STATELESS_HTTP": "true", "CIP_JSON_RESPONSE": "true"}
+_JSON_HEADERS = {"Accept": "application/json, text/event-stream"}
+
+
+async def call_tool_json(
+    http: Any, url: str, tool: str, arguments: dict[str, Any], request_id: int = 1
+) -> dict[str, Any]:
+    """Call `tool` with one JSON-RPC POST against a stateless JSON-response server."""
+    response = await http.post(
+        url,
+        json={
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/call",
+            "params": {"name": tool, "arguments": arguments},
+        },
+        headers=_JSON_HEADERS,
+    )
+    response.raise_for_status()
+    message = response.json()
+    if "error" in message:
+        raise RuntimeError(message["error"].get("message", "JSON-RPC error"))
+    return message["result"]
+
+
+async def _measure(call, requests: int, warmup: int) -> dict[str, Any]:
+    for _ in range(warmup):
+        await call()
+    latencies: list[float] = []
+    errors = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        started = time.perf_counter()
+        try:
+            ok = await call()
+        except Exception:
+            ok = False
+        latencies.append(time.perf_counter() - started)
+        errors += not ok
+    return latency_summary(latencies, errors, time.perf_counter() - start)
+
+
+def _ok(payload: dict[str, Any] | None) -> bool:
+    return (payload or {}).get("status") != "error"
+
+
+async def _session_per_call(url: str, tool: str, arguments, requests: int, warmup: int):
+    from fastmcp import Client
+
+    async def _call() -> bool:
+        async with Client(url) as client:
+            result = await client.call_tool(tool, arguments(), raise_on_error=False)
+        return not result.is_error and _ok(result.structured_content)
+
+    return await _measure(_call, requests, warmup)
+
+
+async def _reused_session(url: str, tool: str, arguments, requests: int, warmup: int):
+    from fastmcp import Client
+
+    async with Client(url) as client:
+
+        async def _call() -> bool:
+            result = await client.call_tool(tool, arguments(), raise_on_error=False)
+            return not result.is_error and _ok(result.structured_content)
+
+        return await _measure(_call, requests, warmup)
+
+
+async def _stateless_json(url: str, tool: str, arguments, requests: int, warmup: int):
+    import httpx
+
+    async with httpx.AsyncClient(timeout=30.0) as http:
+
+        async def _call() -> bool:
+            result = await call_tool_json(http, url, tool, arguments())
+            return not result.get("isError") and _ok(result.get("structuredContent"))
+
+        return await _measure(_call, requests, warmup)
+
+
+def run_transport_benchmark(
+    *,
+    requests: int = 200,
+    warmup: int = 10,
+    tool: str = "mantic_detect",
+    profile_name: str = "signal_core",
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Start each server mode on loopback and time `requests` sequential calls."""
+    if requests < 1:
+        raise ValueError("requests must be >= 1")
+    rng = random.Random(seed)
+    layer_count = 0
+
+    def arguments() -> dict[str, Any]:
+        return tool_arguments(tool, profile_name, layer_count, rng)
+
+    async def _layers(url: str) -> int:
+        from fastmcp import Client
+
+        async with Client(url) as client:
+            return await fetch_layer_count(client, profile_name)
+
+    modes: dict[str, Any] = {}
+    with local_server() as url:
+        layer_count = asyncio.run(_layers(url))
+        modes["session_per_call"] = asyncio.run(
+            _session_per_call(url, tool, arguments, requests, warmup)
+        )
+        modes["reused_session"] = asyncio.run(
+            _reused_session(url, tool, arguments, requests, warmup)
+        )
+    with local_server(env=STATELESS_JSON_ENV) as url:
+        modes["stateless_json"] = asyncio.run(
+            _stateless_json(url, tool, arguments, requests, warmup)
+        )
+
+    report: dict[str, Any] = {"tool": tool, "requests": requests, "modes": modes}
+    baseline = modes["session_per_call"].get("latency_ms", {}).get("mean")
+    stateless = modes["stateless_json"].get("latency_ms", {}).get("mean")
+    if baseline and stateless:
+        report["per_call_overhead_saved_ms"] = baseline - stateless
+        report["speedup"] = baseline / stateless
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare per-call overhead of the server's HTTP transport modes."
+    )
+    parser.add_argument("--requests", type=int, default=200, help="measured calls per mode")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured calls per mode")
+    parser.add_argument("--tool", default="mantic_detect")
+    parser.add_argument("--profile", default="signal_core")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report to this path")
+    args = parser.parse_args()
+
+    report = run_transport_benchmark(
+        requests=args.requests,
+        warmup=args.warmup,
+        tool=args.tool,
+        profile_name=args.profile,
+        seed=args.seed,
+    )
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            fp.write(text + "\n")
+    errors = sum(mode["errors"] for mode in report["modes"].values())
+    return 0 if errors == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
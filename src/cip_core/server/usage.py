@@ -0,0 +1,370 @@
+"""Per-client and per-profile usage accounting with token-bucket rate limits."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+from mcp.types import TextContent
+
+from cip_core.domain_profiles.registry import split_profile_ref
+from cip_core.mantic.uncertainty import DEFAULT_SAMPLES
+from cip_core.models.encoding import encode_pydantic
+
+ANONYMOUS_CLIENT = "anonymous"
+# New identities share this entry only while every tracked identity is active.
+OVERFLOW_KEY = "_overflow"
+# Never throttled, so operators can always see what is being limited.
+UNLIMITED_TOOLS = frozenset({"health_check", "usage_metrics"})
+# Monte Carlo tools score one row per draw: charged `samples` rows (or the default).
+SAMPLED_TOOLS = {"mantic_detect_uncertainty": DEFAULT_SAMPLES}
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    """Sustained rates per second (0 disables a limit) and the burst they allow."""
+
+    client_requests_per_second: float = 0.0
+    client_rows_per_second: float = 0.0
+    profile_requests_per_second: float = 0.0
+    profile_rows_per_second: float = 0.0
+    burst_seconds: float = 1.0
+
+    def __post_init__(self) -> None:
+        rates = (
+            self.client_requests_per_second,
+            self.client_rows_per_second,
+            self.profile_requests_per_second,
+            self.profile_rows_per_second,
+        )
+        if any(rate < 0 for rate in rates):
+            raise ValueError("rate limits must be >= 0")
+        if self.burst_seconds <= 0:
+            raise ValueError("burst_seconds must be > 0")
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` per second up to `rate * burst_seconds`.
+
+    A cost larger than the whole bucket is admitted once the bucket is full and
+    leaves it in debt, so one oversized batch is throttled afterwards instead of
+    being rejected forever.
+    """
+
+    def __init__(self, rate: float, burst_seconds: float, now: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, rate * burst_seconds)
+        self.tokens = self.capacity
+        self._updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_seconds(self, cost: float, now: float) -> float:
+        """Seconds until `cost` would be admitted (0.0 if it is admitted now)."""
+        self._refill(now)
+        needed = min(cost, self.capacity)
+        return 0.0 if self.tokens >= needed else (needed - self.tokens) / self.rate
+
+    def take(self, cost: float) -> None:
+        self.tokens -= cost
+
+    def is_full(self, now: float) -> bool:
+        """True once the bucket has refilled, i.e. it behaves like a fresh bucket."""
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+@dataclass
+class _Usage:
+    requests: int = 0
+    rows: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    cpu_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    last_seen: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "rows": self.rows,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "cpu_ms": round(self.cpu_seconds * 1000.0, 3),
+            "wall_ms": round(self.wall_seconds * 1000.0, 3),
+        }
+
+
+class UsageAccountant:
+    """Request, row and CPU accounting keyed by client identity and by profile.
+
+    `admit` checks every applicable bucket before any is charged, so a request
+    rejected by its profile's limit does not also spend its client's tokens.
+
+    At most `max_tracked` identities per scope are kept, in least-recently-seen
+    order. A new identity evicts the least recently seen one (its usage and
+    buckets) once that has been idle for `idle_seconds`; only while every
+    tracked identity is active do new ones share the `_overflow` entry, so
+    spoofed IDs cannot grow memory and churn does not end in permanent overflow.
+    """
+
+    def __init__(
+        self,
+        limits: RateLimits | None = None,
+        *,
+        max_tracked: int = 10_000,
+        idle_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_tracked < 1:
+            raise ValueError("max_tracked must be >= 1")
+        if idle_seconds <= 0:
+            raise ValueError("idle_seconds must be > 0")
+        self._limits = limits or RateLimits()
+        self._max_tracked = max_tracked
+        # An identity idle for a full burst window has a refilled bucket, so
+        # evicting it loses no rate-limit state.
+        self._idle_seconds = max(idle_seconds, self._limits.burst_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._started = clock()
+        self._clients: OrderedDict[str, _Usage] = OrderedDict()
+        self._profiles: OrderedDict[str, _Usage] = OrderedDict()
+        self._buckets: dict[tuple[str, str, str], TokenBucket] = {}
+        self._evicted: Counter[str] = Counter()
+
+    @property
+    def limits(self) -> RateLimits:
+        return self._limits
+
+    def _table(self, scope: str) -> OrderedDict[str, _Usage]:
+        return self._clients if scope == "client" else self._profiles
+
+    def _evict_oldest(self, scope: str, now: float) -> bool:
+        table = self._table(scope)
+        key, usage = next(iter(table.items()))
+        if now - usage.last_seen < self._idle_seconds:
+            return False
+        del table[key]
+        for unit in ("requests", "rows"):
+            self._buckets.pop((scope, key, unit), None)
+        self._evicted[scope] += 1
+        return True
+
+    def _track(self, scope: str, key: str, now: float) -> tuple[str, _Usage]:
+        """Return the (possibly overflow) key `key` is accounted under, and its usage."""
+        table = self._table(scope)
+        full = key not in table and len(table) >= self._max_tracked
+        if full and not self._evict_oldest(scope, now):
+            key = OVERFLOW_KEY
+        usage = table.get(key)
+        if usage is None:
+            usage = table[key] = _Usage()
+        table.move_to_end(key)
+        usage.last_seen = now
+        return key, usage
+
+    def _bucket(self, scope: str, key: str, unit: str, rate: float, now: float) -> TokenBucket:
+        bucket = self._buckets.get((scope, key, unit))
+        if bucket is None:
+            bucket = TokenBucket(rate, self._limits.burst_seconds, now)
+            self._buckets[(scope, key, unit)] = bucket
+        return bucket
+
+    def admit(self, client: str, profile: str | None, rows: int) -> dict[str, Any] | None:
+        """Charge one request and `rows` rows, or return why the call is rate limited."""
+        limits = self._limits
+        checks = [
+            ("client", client, "requests", limits.client_requests_per_second, 1),
+            ("client", client, "rows", limits.client_rows_per_second, rows),
+        ]
+        if profile is not None:
+            checks += [
+                ("profile", profile, "requests", limits.profile_requests_per_second, 1),
+                ("profile", profile, "rows", limits.profile_rows_per_second, rows),
+            ]
+        with self._lock:
+            now = self._clock()
+            tracked = {"client": self._track("client", client, now)}
+            if profile is not None:
+                tracked["profile"] = self._track("profile", profile, now)
+            charged: list[tuple[TokenBucket, int]] = []
+            for scope, key, unit, rate, cost in checks:
+                if rate <= 0 or cost <= 0:
+                    continue
+                bucket = self._bucket(scope, tracked[scope][0], unit, rate, now)
+                wait = bucket.wait_seconds(cost, now)
+                if wait > 0:
+                    for _, usage in tracked.values():
+                        usage.rate_limited += 1
+                    return {
+                        "scope": scope,
+                        "key": key,
+                        "unit": unit,
+                        "limit_per_second": rate,
+                        "retry_after_seconds": round(wait, 3),
+                    }
+                charged.append((bucket, cost))
+            for bucket, cost in charged:
+                bucket.take(cost)
+        return None
+
+    def record(
+        self,
+        client: str,
+        profile: str | None,
+        rows: int,
+        *,
+        cpu_seconds: float,
+        wall_seconds: float,
+        ok: bool,
+    ) -> None:
+        """Account one completed call to its client and (if any) its profile."""
+        with self._lock:
+            now = self._clock()
+            scopes = [("client", client)]
+            if profile is not None:
+                scopes.append(("profile", profile))
+            for scope, key in scopes:
+                _, usage = self._track(scope, key, now)
+                usage.requests += 1
+                usage.rows += rows
+                usage.errors += not ok
+                usage.cpu_seconds += cpu_seconds
+                usage.wall_seconds += wall_seconds
+
+    def reset(self) -> None:
+        """Clear usage counters and drop refilled (stale) rate-limit buckets.
+
+        Buckets still draining or in debt are kept, so a reset never hands a
+        throttled caller a fresh burst.
+        """
+        with self._lock:
+            now = self._clock()
+            self._clients.clear()
+            self._profiles.clear()
+            self._evicted.clear()
+            self._buckets = {
+                key: bucket for key, bucket in self._buckets.items() if not bucket.is_full(now)
+            }
+            self._started = now
+
+    def snapshot(self, top_n: int = 20) -> dict[str, Any]:
+        """Usage per client and per profile, heaviest CPU consumers first."""
+
+        def _top(table: dict[str, _Usage]) -> dict[str, dict[str, Any]]:
+            ranked = sorted(table.items(), key=lambda item: item[1].cpu_seconds, reverse=True)
+            return {key: usage.as_dict() for key, usage in ranked[:top_n]}
+
+        with self._lock:
+            return {
+                "window_seconds": round(self._clock() - self._started, 3),
+                "limits": {
+                    name: getattr(self._limits, name)
+                    for name in RateLimits.__dataclass_fields__
+                },
+                "tracked_clients": len(self._clients),
+                "tracked_profiles": len(self._profiles),
+                "tracked_buckets": len(self._buckets),
+                "evicted_clients": self._evicted["client"],
+                "evicted_profiles": self._evicted["profile"],
+                "clients": _top(self._clients),
+                "profiles": _top(self._profiles),
+            }
+
+
+def _request_rows(tool: str, arguments: Mapping[str, Any]) -> int:
+    """Layer vectors a call scores: rows of a matrix, 1 for a single vector, else 0.
+
+    Sampling tools are charged their requested draws, so they cannot be used to
+    score more rows than the row limit allows.
+    """
+    if tool in SAMPLED_TOOLS:
+        samples = arguments.get("samples", SAMPLED_TOOLS[tool])
+        return samples if isinstance(samples, int) and samples > 0 else 0
+    if arguments.get("layer_values_b64") is not None:
+        return int(arguments.get("rows") or 0)
+    values = arguments.get("layer_values")
+    if not isinstance(values, list) or not values:
+        return 0
+    return len(values) if isinstance(values[0], list) else 1
+
+
+def _profile_name(arguments: Mapping[str, Any]) -> str | None:
+    ref = arguments.get("profile_name")
+    if not isinstance(ref, str):
+        return None
+    return split_profile_ref(ref)[0]
+
+
+class UsageMiddleware(Middleware):
+    """Enforce rate limits before a tool runs and account its rows and CPU time.
+
+    Clients identify themselves with `client_header` (or the MCP request's
+    `client_id`); unidentified callers share the `anonymous` identity. CPU time is
+    the thread CPU spent inside the call, which covers scoring since tools run
+    synchronously on the request's thread.
+    """
+
+    def __init__(self, accountant: UsageAccountant, client_header: str) -> None:
+        self._accountant = accountant
+        self._client_header = client_header.lower()
+
+    def _client_id(self, context: MiddlewareContext) -> str:
+        client = get_http_headers().get(self._client_header)
+        if not client and context.fastmcp_context is not None:
+            client = context.fastmcp_context.client_id
+        return client or ANONYMOUS_CLIENT
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        tool = context.message.name
+        arguments = context.message.arguments or {}
+        client = self._client_id(context)
+        profile = _profile_name(arguments)
+        rows = _request_rows(tool, arguments)
+
+        if tool not in UNLIMITED_TOOLS:
+            limited = self._accountant.admit(client, profile, rows)
+            if limited is not None:
+                payload = {
+                    "status": "error",
+                    "error": {
+                        "code": "rate_limited",
+                        "message": (
+                            f"{limited['scope']} '{limited['key']}' exceeded "
+                            f"{limited['limit_per_second']:g} {limited['unit']}/s; retry in "
+                            f"{limited['retry_after_seconds']:g}s"
+                        ),
+                        **limited,
+                    },
+                }
+                return ToolResult(
+                    content=[TextContent(type="text", text=encode_pydantic(payload))],
+                    structured_content=payload,
+                )
+
+        cpu_started = time.thread_time()
+        wall_started = time.perf_counter()
+        ok = False
+        try:
+            result = await call_next(context)
+            ok = (result.structured_content or {}).get("status") != "error"
+            return result
+        finally:
+            self._accountant.record(
+                client,
+                profile,
+                rows,
+                cpu_seconds=time.thread_time() - cpu_started,
+                wall_seconds=time.perf_counter() - wall_started,
+                ok=ok,
+            )
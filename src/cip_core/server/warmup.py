@@ -0,0 +1,122 @@
+"""Startup warmup so the first request is served at steady-state latency.
+
+`run_detection` imports the mantic-thinking kernel lazily, and scoring params,
+temporal kernels and response models are built on first use. `warm_up` pays
+those costs before the server reports ready: it imports the lazily loaded
+modules (timing each) and scores one neutral row per registered profile version
+and mode through both the single and batch paths.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import subprocess
+import sys
+import time
+from typing import Any
+
+from cip_core.domain_profiles.registry import DomainProfileRegistry
+from cip_core.mantic.batch import run_batch_detection
+from cip_core.mantic.runtime import run_detection
+from cip_core.models.encoding import encode_pydantic
+
+logger = logging.getLogger(__name__)
+
+# Imported on first use by the runtime; absent from the server's import graph.
+LAZY_MODULES = (
+    "mantic_thinking.tools.generic_detect",
+    "mantic_thinking.core.validators",
+    "mantic_thinking.core.mantic_kernel",
+)
+# Loaded only on demand; the scoring path must not import them (see `import_timings`).
+# Listed dependencies first, since timing a module also loads what it imports.
+DEFERRED_MODULES = ("cProfile", "tracemalloc", "cip_core.observability.profiling")
+_MODES = ("friction", "emergence")
+
+# Runs in a fresh interpreter, so it must not import cip_core itself.
+_FRESH_PROBE = """
+import importlib, json, sys, time
+importlib.import_module(sys.argv[1])
+timings = {}
+for module in sys.argv[2:]:
+    if module in sys.modules:
+        timings[module] = 0.0
+        continue
+    started = time.perf_counter()
+    importlib.import_module(module)
+    timings[module] = round((time.perf_counter() - started) * 1000.0, 3)
+print(json.dumps(timings))
+"""
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 3)
+
+
+def import_timings(
+    modules: tuple[str, ...] = LAZY_MODULES, *, after: str | None = None
+) -> dict[str, float]:
+    """Import `modules`, returning milliseconds spent on each (0.0 if already loaded).
+
+    With `after`, the timings are taken in a fresh interpreter that has imported
+    only `after`; a 0.0 then means `after` already pulls that module in, which is
+    how a lazily imported module regressing into an eager import shows up.
+    """
+    if after is not None:
+        probe = subprocess.run(
+            [sys.executable, "-c", _FRESH_PROBE, after, *modules],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        return json.loads(probe.stdout)
+    timings: dict[str, float] = {}
+    for module in modules:
+        if module in sys.modules:
+            timings[module] = 0.0
+            continue
+        started = time.perf_counter()
+        importlib.import_module(module)
+        timings[module] = _elapsed_ms(started)
+    return timings
+
+
+def warm_up(registry: DomainProfileRegistry) -> dict[str, Any]:
+    """Prime imports, descriptors and caches for every registered profile version.
+
+    Returns the timing report surfaced by `health_check` under `startup`.
+    Failures are logged and reported rather than raised: a profile that cannot
+    be warmed will still fail (or succeed) on its first real request.
+    """
+    started = time.perf_counter()
+    imports = import_timings()
+
+    scored = 0
+    failures: dict[str, str] = {}
+    descriptors = registry.list(all_versions=True)
+    for descriptor in descriptors:
+        ref = f"{descriptor['domain_name']}@{descriptor['version']}"
+        try:
+            profile = registry.get(ref)
+            row = [0.5] * len(profile.layer_names)
+            for mode in _MODES:
+                encode_pydantic(run_detection(profile=profile, layer_values=row, mode=mode))
+                encode_pydantic(run_batch_detection(profile=profile, layer_values=[row], mode=mode))
+                scored += 2
+        except Exception as exc:
+            logger.warning("Warmup of profile %s failed: %s", ref, exc)
+            failures[ref] = str(exc)
+
+    report: dict[str, Any] = {
+        "warmed": True,
+        "imports_ms": imports,
+        "profiles_warmed": len(descriptors) - len(failures),
+        "detections": scored,
+        "warmup_ms": _elapsed_ms(started),
+    }
+    if failures:
+        report["failures"] = failures
+    logger.info("Warmup finished in %.1f ms", report["warmup_ms"])
+    return report
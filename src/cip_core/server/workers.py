@@ -0,0 +1,259 @@
+"""Pre-fork multi-worker serving from one validated profile snapshot."""
+
+from __future__ import annotations
+
+import contextlib
+import gc
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+from cip_core.config.settings import Settings
+from cip_core.domain_profiles.registry import DomainProfileRegistry
+
+logger = logging.getLogger(__name__)
+
+_FIELDS = ("pid", "requests", "errors", "restarts", "started_at")
+_PID, _REQUESTS, _ERRORS, _RESTARTS, _STARTED_AT = range(len(_FIELDS))
+# A worker that dies sooner than this after starting is restarted with a delay.
+_MIN_UPTIME_SECONDS = 1.0
+_RESTART_BACKOFF_SECONDS = 1.0
+
+
+class WorkerMetrics:
+    """Per-worker counters in shared memory, readable from every worker.
+
+    Each worker only writes its own slot, so `health_check` in any worker can
+    aggregate the whole pool without cross-process locking.
+    """
+
+    def __init__(self, workers: int) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self._workers = workers
+        self._values = multiprocessing.RawArray("d", workers * len(_FIELDS))
+        self._slot: int | None = None
+        self._lock = threading.Lock()
+
+    def _index(self, slot: int, column: int) -> int:
+        return slot * len(_FIELDS) + column
+
+    def bind(self, slot: int) -> None:
+        """Attach this process to `slot` for subsequent `record` calls."""
+        self._slot = slot
+
+    def mark_started(self, slot: int, pid: int) -> None:
+        self._values[self._index(slot, _PID)] = pid
+        self._values[self._index(slot, _STARTED_AT)] = time.time()
+
+    def mark_exited(self, slot: int, *, restarting: bool) -> None:
+        self._values[self._index(slot, _PID)] = 0
+        if restarting:
+            self._values[self._index(slot, _RESTARTS)] += 1
+
+    def record(self, ok: bool) -> None:
+        """Count one tool call for this worker's slot."""
+        if self._slot is None:
+            return
+        with self._lock:
+            self._values[self._index(self._slot, _REQUESTS)] += 1
+            if not ok:
+                self._values[self._index(self._slot, _ERRORS)] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return per-worker and pool-wide counters."""
+        per_worker = []
+        for slot in range(self._workers):
+            row = {
+                name: self._values[self._index(slot, column)]
+                for column, name in enumerate(_FIELDS)
+            }
+            per_worker.append(
+                {
+                    "slot": slot,
+                    "pid": int(row["pid"]),
+                    "alive": row["pid"] > 0,
+                    "requests": int(row["requests"]),
+                    "errors": int(row["errors"]),
+                    "restarts": int(row["restarts"]),
+                    "started_at": row["started_at"],
+                }
+            )
+        return {
+            "workers": self._workers,
+            "alive": sum(worker["alive"] for worker in per_worker),
+            "current_slot": self._slot,
+            "requests": sum(worker["requests"] for worker in per_worker),
+            "errors": sum(worker["errors"] for worker in per_worker),
+            "restarts": sum(worker["restarts"] for worker in per_worker),
+            "per_worker": per_worker,
+        }
+
+
+class WorkerMetricsMiddleware(Middleware):
+    """Count every tool call, and calls that errored, into `WorkerMetrics`."""
+
+    def __init__(self, metrics: WorkerMetrics) -> None:
+        self._metrics = metrics
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        try:
+            result = await call_next(context)
+        except Exception:
+            self._metrics.record(ok=False)
+            raise
+        payload = result.structured_content or {}
+        self._metrics.record(ok=payload.get("status") != "error")
+        return result
+
+
+def worker_path(path: str | Path, slot: int) -> str:
+    """Return `path` with a per-worker suffix, e.g. `audit.jsonl` -> `audit.worker1.jsonl`."""
+    path = Path(path)
+    return str(path.with_name(f"{path.stem}.worker{slot}{path.suffix}"))
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.create_server((host, port), backlog=2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _exit_on_signal(signum: int, frame: Any) -> None:
+    raise SystemExit(0)
+
+
+def _worker_main(
+    slot: int,
+    registry: DomainProfileRegistry,
+    sock: socket.socket,
+    metrics: WorkerMetrics,
+    settings: Settings,
+    startup: dict[str, Any],
+) -> None:
+    import uvicorn
+
+    from cip_core.server.app import create_app
+
+    code = 0
+    shutdown_hooks: list[Callable[[], None]] = []
+    try:
+        # uvicorn re-raises the signal that stopped it once it has shut down; exit
+        # through SystemExit rather than SIG_DFL so the writers below get closed.
+        signal.signal(signal.SIGTERM, _exit_on_signal)
+        signal.signal(signal.SIGINT, _exit_on_signal)
+        metrics.bind(slot)
+        app = create_app(
+            profile_registry_override=registry,
+            worker_metrics=metrics,
+            worker_slot=slot,
+            shutdown_hooks=shutdown_hooks,
+            startup_report=startup,
+        )
+        # MCP sessions live in one process and the kernel spreads requests across
+        # workers, so each request must stand alone.
+        config = uvicorn.Config(
+            app.http_app(
+                transport="streamable-http",
+                stateless_http=True,
+                json_response=settings.cip_json_response,
+            ),
+            log_level=settings.cip_log_level.lower(),
+            lifespan="on",
+        )
+        uvicorn.Server(config).run(sockets=[sock])
+    except SystemExit:
+        pass
+    except BaseException:
+        logger.exception("worker %d crashed", slot)
+        code = 1
+    finally:
+        # os._exit skips interpreter shutdown (and the parent's inherited atexit
+        # handlers), so close only the writers this worker opened.
+        for close in reversed(shutdown_hooks):
+            try:
+                close()
+            except Exception:
+                logger.exception("worker %d failed to close a writer", slot)
+        os._exit(code)
+
+
+def serve_prefork(
+    settings: Settings,
+    registry: DomainProfileRegistry,
+    startup: dict[str, Any] | None = None,
+) -> None:
+    """Bind once, fork `settings.cip_workers` workers and restart any that exit.
+
+    The registry is loaded, validated and warmed by the caller before forking,
+    and the parent's heap is frozen so workers share it copy-on-write. Workers
+    report the caller's `startup` timings instead of warming up again. Every worker
+    accepts on the same listening socket and serves stateless streamable HTTP.
+    SIGTERM/SIGINT stop the pool.
+    """
+    workers = settings.cip_workers
+    metrics = WorkerMetrics(workers)
+    startup_report = {"warmed": False} if startup is None else startup
+    sock = _bind_socket(settings.cip_host, settings.cip_port)
+    gc.collect()
+    gc.freeze()
+
+    children: dict[int, int] = {}
+    stopping = False
+
+    def _spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            _worker_main(slot, registry, sock, metrics, settings, startup_report)
+        children[pid] = slot
+        metrics.mark_started(slot, pid)
+
+    def _stop(signum: int, frame: Any) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    logger.info(
+        "Serving %d workers on %s:%d (pid %d)",
+        workers,
+        settings.cip_host,
+        settings.cip_port,
+        os.getpid(),
+    )
+    for slot in range(workers):
+        _spawn(slot)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        slot = children.pop(pid, None)
+        if slot is None:
+            continue
+        metrics.mark_exited(slot, restarting=not stopping)
+        if stopping:
+            continue
+        logger.warning(
+            "worker %d (pid %d) exited with status %d; restarting", slot, pid, status
+        )
+        started_at = metrics.snapshot()["per_worker"][slot]["started_at"]
+        if time.time() - started_at < _MIN_UPTIME_SECONDS:
+            time.sleep(_RESTART_BACKOFF_SECONDS)
+        if not stopping:
+            _spawn(slot)
+
+    sock.close()
@@ -0,0 +1,5 @@
+"""Dependency-free helpers shared across cip_core subpackages."""
+
+from cip_core.utils.lru import LRUCache
+
+__all__ = ["LRUCache"]
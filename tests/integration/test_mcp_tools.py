@@ -1,6 +1,17 @@
 from __future__ import annotations
 
+import base64
+
+import numpy as np
 import pytest
+from fastmcp import Client
+
+from cip_core.domain_profiles.loader import load_profile_file
+from cip_core.domain_profiles.registry import DomainProfileRegistry
+from cip_core.mantic.shadow import ShadowScorer
+from cip_core.observability.tracing import InMemorySpanExporter, set_span_exporter
+from cip_core.persistence.audit_sink import RotatingJsonlAuditSink
+from cip_core.server.app import create_app
 
 
 @pytest.mark.asyncio
@@ -8,15 +19,39 @@ async def test_core_tool_surface_registered(app) -> None:
     tools = await app.get_tools()
     names = sorted(tools.keys())
     assert names == [
+        "debug_profile",
+        "detection_history",
         "health_check",
         "list_domain_profiles",
         "mantic_detect",
+        "mantic_detect_batch",
         "mantic_detect_emergence",
         "mantic_detect_friction",
+        "mantic_detect_rollup",
+        "mantic_detect_uncertainty",
+        "mantic_threshold_distance",
+        "recent_alerts",
+        "shadow_metrics",
+        "usage_metrics",
         "validate_domain_profile",
+        "validate_domain_profiles",
     ]
 
 
+@pytest.mark.asyncio
+async def test_health_check_reports_startup_warmup(app, profiles_dir, monkeypatch) -> None:
+    health = await app._tool_manager.call_tool("health_check", {})
+    startup = health.structured_content["startup"]
+    assert startup["warmed"] is True
+    assert startup["profiles_warmed"] >= 1
+    assert startup["registry_load_ms"] >= 0
+
+    monkeypatch.setenv("CIP_WARMUP", "false")
+    cold_app = create_app(profiles_dir_override=profiles_dir)
+    cold = await cold_app._tool_manager.call_tool("health_check", {})
+    assert cold.structured_content["startup"]["warmed"] is False
+
+
 @pytest.mark.asyncio
 async def test_list_domain_profiles_tool(app) -> None:
     result = await app._tool_manager.call_tool("list_domain_profiles", {})
@@ -27,6 +62,132 @@ async def test_list_domain_profiles_tool(app) -> None:
     assert payload["profiles"][0]["domain_name"] == "signal_core"
 
 
+@pytest.mark.asyncio
+async def test_mantic_detect_rollup_tool(app) -> None:
+    result = await app._tool_manager.call_tool(
+        "mantic_detect_rollup",
+        {
+            "profile_name": "signal_core",
+            "group_keys": ["emea", "emea", "apac"],
+            "layer_values": [[0.9, 0.1, 0.9, 0.1], [0.5] * 4, [0.2] * 4],
+            "aggregation": "worst_case",
+        },
+    )
+    payload = result.structured_content
+    assert payload["status"] == "ok"
+    assert payload["results"]["group"] == ["emea", "apac"]
+    assert payload["results"]["members"] == [2, 1]
+    assert payload["results"]["member_alerts"] == [1, 0]
+    assert payload["results"]["layer_values"][0] == [0.9, 0.1, 0.9, 0.1]
+
+    missing_weights = await app._tool_manager.call_tool(
+        "mantic_detect_rollup",
+        {
+            "profile_name": "signal_core",
+            "group_keys": ["a"],
+            "layer_values": [[0.5] * 4],
+            "aggregation": "weighted",
+        },
+    )
+    assert missing_weights.structured_content["error"]["code"] == "validation_error"
+
+
+@pytest.mark.asyncio
+async def test_detect_tools_pin_profile_versions(profiles_dir) -> None:
+    profile = load_profile_file(profiles_dir / "signal_core.v2.yaml")
+    registry = DomainProfileRegistry([profile, profile.model_copy(update={"version": "2.1.0"})])
+    versioned_app = create_app(profile_registry_override=registry)
+    args = {"profile_name": "signal_core", "layer_values": [0.62, 0.71, 0.45, 0.58]}
+
+    latest = await versioned_app._tool_manager.call_tool("mantic_detect", args)
+    pinned = await versioned_app._tool_manager.call_tool(
+        "mantic_detect", {**args, "profile_version": "2.0.0"}
+    )
+    batch = await versioned_app._tool_manager.call_tool(
+        "mantic_detect_batch",
+        {"profile_name": "signal_core@2.0.0", "layer_values": [args["layer_values"]]},
+    )
+    missing = await versioned_app._tool_manager.call_tool(
+        "mantic_detect_friction", {**args, "profile_version": "9.0.0"}
+    )
+    listing = await versioned_app._tool_manager.call_tool("list_domain_profiles", {})
+
+    assert latest.structured_content["domain_profile"]["version"] == "2.1.0"
+    assert pinned.structured_content["domain_profile"]["version"] == "2.0.0"
+    assert batch.structured_content["status"] == "ok"
+    assert missing.structured_content["error"]["code"] == "unknown_profile"
+    assert listing.structured_content["profiles"][0]["versions"] == ["2.0.0", "2.1.0"]
+
+
+@pytest.mark.asyncio
+async def test_shadow_metrics_compare_candidate_version(profiles_dir) -> None:
+    profile = load_profile_file(profiles_dir / "signal_core.v2.yaml")
+    candidate = profile.model_copy(
+        update={"version": "2.1.0", "thresholds": {**profile.thresholds, "detection": 0.99}}
+    )
+    disabled = await create_app(profiles_dir_override=profiles_dir)._tool_manager.call_tool(
+        "shadow_metrics", {}
+    )
+    assert disabled.structured_content["error"]["code"] == "shadow_disabled"
+
+    registry = DomainProfileRegistry([profile, candidate])
+    scorer = ShadowScorer(registry, {"signal_core": "2.1.0"})
+    shadow_app = create_app(profile_registry_override=registry, shadow_scorer_override=scorer)
+
+    rows = [[0.62, 0.71, 0.45, 0.58], [0.9, 0.9, 0.9, 0.9]]
+    detect = await shadow_app._tool_manager.call_tool(
+        "mantic_detect",
+        {"profile_name": "signal_core", "profile_version": "2.0.0", "layer_values": rows[0]},
+    )
+    assert detect.structured_content["domain_profile"]["version"] == "2.0.0"
+    await shadow_app._tool_manager.call_tool(
+        "mantic_detect_batch",
+        {"profile_name": "signal_core@2.0.0", "layer_values": rows},
+    )
+    await shadow_app._tool_manager.call_tool(
+        "mantic_detect", {"profile_name": "signal_core", "layer_values": rows[0]}
+    )
+
+    # shadow_metrics reports without waiting on the scoring thread.
+    assert scorer.flush(timeout=5.0)
+    metrics = await shadow_app._tool_manager.call_tool("shadow_metrics", {"reset": True})
+    payload = metrics.structured_content
+    assert payload["status"] == "ok"
+    assert payload["sampled_rows"] == 3
+    assert payload["skipped_rows"] == {"same_version": 1}
+    [comparison] = payload["comparisons"]
+    assert (comparison["primary_version"], comparison["candidate_version"]) == ("2.0.0", "2.1.0")
+    assert comparison["rows"] == 3
+    assert comparison["alerts"]["gained"] + comparison["alerts"]["lost"] == round(
+        comparison["alerts"]["flip_rate"] * 3
+    )
+
+    cleared = await shadow_app._tool_manager.call_tool("shadow_metrics", {})
+    assert cleared.structured_content["comparisons"] == []
+    scorer.close()
+
+
+@pytest.mark.asyncio
+async def test_pre_encoded_json_returns_identical_tool_results(
+    app, profiles_dir, monkeypatch
+) -> None:
+    monkeypatch.setenv("CIP_JSON_ENCODER", "pydantic")
+    fast_app = create_app(profiles_dir_override=profiles_dir)
+    calls = [
+        ("mantic_detect", {"profile_name": "signal_core", "layer_values": [0.6, 0.2, 0.9, 0.4]}),
+        (
+            "mantic_detect_batch",
+            {"profile_name": "signal_core", "layer_values": [[0.1, 0.2, 0.3, 0.4]] * 3},
+        ),
+        ("mantic_detect", {"profile_name": "missing", "layer_values": [0.5] * 4}),
+    ]
+    for name, args in calls:
+        default = await app._tool_manager.call_tool(name, args)
+        fast = await fast_app._tool_manager.call_tool(name, args)
+        assert fast.content[0].text == default.content[0].text
+        assert fast.structured_content == default.structured_content
+
+
 @pytest.mark.asyncio
 async def test_validate_domain_profile_tool(app, profiles_dir) -> None:
     valid_yaml = (profiles_dir / "signal_core.v2.yaml").read_text(encoding="utf-8")
@@ -45,6 +206,36 @@ async def test_validate_domain_profile_tool(app, profiles_dir) -> None:
     assert invalid.structured_content["errors"]
 
 
+@pytest.mark.asyncio
+async def test_validate_domain_profiles_batch_caches_and_limits(profiles_dir, monkeypatch) -> None:
+    monkeypatch.setenv("CIP_MAX_PROFILE_YAML_BYTES", "4096")
+    limited_app = create_app(profiles_dir_override=profiles_dir)
+    valid_yaml = (profiles_dir / "signal_core.v2.yaml").read_text(encoding="utf-8")
+    documents = [valid_yaml, "domain_name: finance\nversion: bad", valid_yaml, "#" * 5000]
+
+    result = await limited_app._tool_manager.call_tool(
+        "validate_domain_profiles", {"profile_yamls": documents}
+    )
+    payload = result.structured_content
+    assert payload["count"] == 4
+    assert payload["valid_count"] == 2
+    assert [item.get("valid") for item in payload["results"][:3]] == [True, False, True]
+    assert payload["results"][0] == payload["results"][2]
+    assert payload["results"][3]["error"]["code"] == "payload_too_large"
+
+    # Mutating one response's nested data must not leak into later cache hits.
+    payload["results"][0]["profile"]["layer_names"].append("tampered")
+    payload["results"][0]["descriptor"].clear()
+    single = await limited_app._tool_manager.call_tool(
+        "validate_domain_profile", {"profile_yaml": valid_yaml}
+    )
+    assert single.structured_content == payload["results"][2]
+    health = await limited_app._tool_manager.call_tool("health_check", {})
+    cache = health.structured_content["profile_validation_cache"]
+    assert cache["misses"] == 2
+    assert cache["hits"] == 2
+
+
 @pytest.mark.asyncio
 async def test_end_to_end_mantic_detection_tools(app) -> None:
     args = {
@@ -79,3 +270,256 @@ async def test_invalid_interaction_modes_return_validation_error(app) -> None:
     payload = result.structured_content
     assert payload["status"] == "error"
     assert payload["error"]["code"] == "validation_error"
+
+
+@pytest.mark.asyncio
+async def test_threshold_distance_tool_handles_batches(app) -> None:
+    result = await app._tool_manager.call_tool(
+        "mantic_threshold_distance",
+        {
+            "profile_name": "signal_core",
+            "layer_values": [[0.3, 0.3, 0.3, 0.3], [0.9, 0.1, 0.5, 0.5]],
+            "mode": "friction",
+        },
+    )
+    payload = result.structured_content
+
+    assert payload["status"] == "ok"
+    assert payload["count"] == 2
+    assert [row["alert"] for row in payload["rows"]] == [False, True]
+    assert payload["rows"][0]["cheapest_delta"] == pytest.approx(payload["threshold"])
+    assert set(payload["rows"][1]["layers"]) == {"micro", "meso", "macro", "meta"}
+
+    pinned = await app._tool_manager.call_tool(
+        "mantic_threshold_distance",
+        {"profile_name": "signal_core", "layer_values": [0.3] * 4, "profile_version": "2.0.0"},
+    )
+    assert pinned.structured_content["domain_profile"]["version"] == "2.0.0"
+    missing = await app._tool_manager.call_tool(
+        "mantic_threshold_distance",
+        {"profile_name": "signal_core", "layer_values": [0.3] * 4, "profile_version": "9.9.9"},
+    )
+    assert missing.structured_content["error"]["code"] == "unknown_profile"
+
+
+@pytest.mark.asyncio
+async def test_uncertainty_tool_enforces_sample_cap(app) -> None:
+    result = await app._tool_manager.call_tool(
+        "mantic_detect_uncertainty",
+        {
+            "profile_name": "signal_core",
+            "layer_values": [0.5, 0.5, 0.5, 0.5],
+            "layer_std": [0.1, 0.1, 0.1, 0.1],
+            "samples": 10_000_000,
+        },
+    )
+    payload = result.structured_content
+    assert payload["status"] == "error"
+    assert payload["error"]["code"] == "validation_error"
+
+
+@pytest.mark.asyncio
+async def test_batch_tool_accepts_packed_base64_layers(app) -> None:
+    rows = [[0.62, 0.71, 0.45, 0.58], [0.9, 0.1, 0.5, 0.8]]
+    packed = base64.b64encode(np.asarray(rows, dtype="<f4").tobytes()).decode()
+
+    from_list = await app._tool_manager.call_tool(
+        "mantic_detect_batch",
+        {"profile_name": "signal_core", "layer_values": rows},
+    )
+    from_packed = await app._tool_manager.call_tool(
+        "mantic_detect_batch",
+        {"profile_name": "signal_core", "layer_values_b64": packed, "rows": 2},
+    )
+
+    list_payload = from_list.structured_content
+    packed_payload = from_packed.structured_content
+    assert packed_payload["status"] == "ok"
+    assert packed_payload["rows"] == 2
+    assert packed_payload["results"]["alert"] == list_payload["results"]["alert"]
+    assert packed_payload["results"]["m_score"] == pytest.approx(
+        list_payload["results"]["m_score"], abs=1e-6
+    )
+
+    truncated = await app._tool_manager.call_tool(
+        "mantic_detect_batch",
+        {"profile_name": "signal_core", "layer_values_b64": packed, "rows": 3},
+    )
+    assert truncated.structured_content["status"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_history_tools_disabled_by_default(app) -> None:
+    result = await app._tool_manager.call_tool(
+        "recent_alerts", {"profile_name": "signal_core"}
+    )
+    assert result.structured_content["error"]["code"] == "history_disabled"
+
+
+@pytest.mark.asyncio
+async def test_history_tools_page_entity_detections(
+    profiles_dir, tmp_path, monkeypatch
+) -> None:
+    monkeypatch.setenv("CIP_HISTORY_DB_PATH", str(tmp_path / "history.db"))
+    history_app = create_app(profiles_dir_override=profiles_dir)
+    for layer_values in ([0.9, 0.1, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5], [0.95, 0.05, 0.5, 0.5]):
+        await history_app._tool_manager.call_tool(
+            "mantic_detect_friction",
+            {"profile_name": "signal_core", "layer_values": layer_values, "entity_id": "acct-1"},
+        )
+
+    first = await history_app._tool_manager.call_tool(
+        "detection_history",
+        {"profile_name": "signal_core", "entity_id": "acct-1", "limit": 2, "consistent": True},
+    )
+    page = first.structured_content
+    assert page["count"] == 2
+    assert page["items"][0]["envelope"]["layer_values"] == [0.95, 0.05, 0.5, 0.5]
+    second = await history_app._tool_manager.call_tool(
+        "detection_history",
+        {"profile_name": "signal_core", "entity_id": "acct-1", "cursor": page["next_cursor"]},
+    )
+    assert second.structured_content["count"] == 1
+    assert second.structured_content["next_cursor"] is None
+
+    alerts = await history_app._tool_manager.call_tool(
+        "recent_alerts", {"profile_name": "signal_core", "consistent": True}
+    )
+    assert alerts.structured_content["count"] == 2
+    assert all(item["alert"] for item in alerts.structured_content["items"])
+
+    pinned = await history_app._tool_manager.call_tool(
+        "recent_alerts", {"profile_name": "signal_core@2.0.0"}
+    )
+    assert pinned.structured_content["profile_name"] == "signal_core"
+    assert pinned.structured_content["count"] == 2
+    other = await history_app._tool_manager.call_tool(
+        "detection_history",
+        {"profile_name": "signal_core", "entity_id": "acct-1", "profile_version": "1.0.0"},
+    )
+    assert other.structured_content["count"] == 0
+    conflict = await history_app._tool_manager.call_tool(
+        "recent_alerts", {"profile_name": "signal_core@2.0.0", "profile_version": "1.0.0"}
+    )
+    assert conflict.structured_content["error"]["code"] == "unknown_profile"
+
+
+@pytest.mark.asyncio
+async def test_clamped_overrides_reach_audit_sink(profiles_dir, tmp_path) -> None:
+    sink = RotatingJsonlAuditSink(tmp_path / "audit.jsonl")
+    audited_app = create_app(profiles_dir_override=profiles_dir, audit_sink_override=sink)
+    await audited_app._tool_manager.call_tool(
+        "mantic_detect",
+        {"profile_name": "signal_core", "layer_values": [0.5, 0.5, 0.5, 0.5], "f_time": 9.0},
+    )
+    await audited_app._tool_manager.call_tool(
+        "mantic_detect",
+        {"profile_name": "signal_core", "layer_values": [0.5, 0.5, 0.5, 0.5]},
+    )
+    health = await audited_app._tool_manager.call_tool("health_check", {})
+    assert health.structured_content["audit_sink"]["accepted"] == 1
+    sink.close()
+
+    lines = (tmp_path / "audit.jsonl").read_text().splitlines()
+    assert len(lines) == 1
+    assert "f_time" in lines[0]
+
+
+@pytest.mark.asyncio
+async def test_tool_spans_carry_caller_trace_id(app) -> None:
+    exporter = InMemorySpanExporter()
+    previous = set_span_exporter(exporter)
+    try:
+        await app._tool_manager.call_tool(
+            "mantic_detect_emergence",
+            {
+                "profile_name": "signal_core",
+                "layer_values": [0.6, 0.6, 0.6, 0.6],
+                "trace_id": "domain-mcp-trace",
+            },
+        )
+    finally:
+        set_span_exporter(previous)
+
+    tool_span = exporter.find("mcp.tool")[0]
+    assert tool_span.attributes["tool"] == "mantic_detect_emergence"
+    assert tool_span.attributes["status"] == "ok"
+    assert {item.trace_id for item in exporter.spans} == {"domain-mcp-trace"}
+    assert exporter.find("mantic.run_detection")[0].parent_id is not None
+
+
+@pytest.mark.asyncio
+async def test_debug_profile_disabled_by_default(app) -> None:
+    result = await app._tool_manager.call_tool("debug_profile", {"admin_token": "x"})
+    assert result.structured_content["error"]["code"] == "disabled"
+
+
+@pytest.mark.asyncio
+async def test_debug_profile_ranks_hot_functions(profiles_dir, monkeypatch) -> None:
+    monkeypatch.setenv("CIP_DEBUG_PROFILE_ENABLED", "true")
+    monkeypatch.setenv("CIP_ADMIN_TOKEN", "s3cret")
+    profiled_app = create_app(profiles_dir_override=profiles_dir)
+    call = profiled_app._tool_manager.call_tool
+
+    denied = await call("debug_profile", {"admin_token": "wrong", "action": "start"})
+    assert denied.structured_content["error"]["code"] == "forbidden"
+
+    started = await call(
+        "debug_profile", {"admin_token": "s3cret", "action": "start", "requests": 2}
+    )
+    assert started.structured_content["active"] is True
+    for _ in range(3):
+        await call(
+            "mantic_detect",
+            {"profile_name": "signal_core", "layer_values": [0.6, 0.5, 0.4, 0.7]},
+        )
+
+    report = (await call("debug_profile", {"admin_token": "s3cret"})).structured_content
+    assert report["active"] is False
+    assert report["profiled_requests"] == 2
+    names = [row["function"] for row in report["functions"]]
+    assert any("run_detection" in name for name in names)
+    assert all(name.startswith(("cip_core/", "mantic_thinking/")) for name in names)
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_and_usage_metrics(profiles_dir, monkeypatch) -> None:
+    monkeypatch.setenv("CIP_RATE_LIMIT_CLIENT_ROWS_PER_SECOND", "5")
+    monkeypatch.setenv("CIP_RATE_LIMIT_BURST_SECONDS", "1")
+    limited_app = create_app(profiles_dir_override=profiles_dir)
+    batch = {"profile_name": "signal_core", "layer_values": [[0.5] * 4] * 5}
+
+    async with Client(limited_app) as client:
+        first = await client.call_tool("mantic_detect_batch", batch)
+        assert first.structured_content["status"] == "ok"
+        second = await client.call_tool("mantic_detect_batch", batch)
+        error = second.structured_content["error"]
+        assert error["code"] == "rate_limited"
+        assert error["scope"] == "client"
+        assert error["retry_after_seconds"] > 0
+
+        usage = (await client.call_tool("usage_metrics", {"reset": True})).structured_content
+        assert usage["clients"]["anonymous"]["requests"] == 1
+        assert usage["clients"]["anonymous"]["rows"] == 5
+        assert usage["clients"]["anonymous"]["rate_limited"] == 1
+        assert usage["profiles"]["signal_core"]["cpu_ms"] > 0
+
+        # Only the resetting usage_metrics call itself was accounted since.
+        cleared = (await client.call_tool("usage_metrics", {})).structured_content
+        assert cleared["clients"]["anonymous"]["requests"] == 1
+        assert cleared["profiles"] == {}
+
+
+@pytest.mark.asyncio
+async def test_uncertainty_tool_reports_invalid_inputs_as_validation_errors(app) -> None:
+    result = await app._tool_manager.call_tool(
+        "mantic_detect_uncertainty",
+        {
+            "profile_name": "signal_core",
+            "layer_values": [0.5, 0.5, 0.5, 0.5],
+            "layer_intervals": [[0.6, 0.4]] * 4,
+        },
+    )
+    payload = result.structured_content
+    assert payload["status"] == "error"
+    assert payload["error"]["code"] == "validation_error"
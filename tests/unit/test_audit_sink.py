@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import threading
+
+from cip_core.persistence.audit_sink import (
+    AuditSink,
+    RotatingJsonlAuditSink,
+    build_audit_record,
+)
+from cip_core.persistence.writer import BatchWriter
+from cip_core.sdk.wrappers import load_registry, safe_detect
+
+
+def test_build_audit_record_only_for_clamped_or_rejected(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    clean = safe_detect(registry, "signal_core", [0.5, 0.5, 0.5, 0.5], "friction")
+    assert build_audit_record(clean, tool="mantic_detect") is None
+
+    clamped = safe_detect(registry, "signal_core", [0.5, 0.5, 0.5, 0.5], "friction", f_time=9.0)
+    record = build_audit_record(clamped, tool="mantic_detect", entity_id="e1", clock=lambda: 1.0)
+    assert record["clamped_fields"] == clamped["audit"]["clamped_fields"]
+    assert record["profile"] == "signal_core"
+    assert record["entity_id"] == "e1"
+    assert record["timestamp"] == 1.0
+
+
+def test_rotating_sink_rotates_and_flushes_on_close(tmp_path) -> None:
+    path = tmp_path / "audit" / "audit.jsonl"
+    sink = RotatingJsonlAuditSink(path, max_bytes=200, backup_count=2, batch_size=4)
+    assert isinstance(sink, AuditSink)
+    for idx in range(20):
+        assert sink.emit({"seq": idx, "clamped_fields": ["f_time"], "pad": "x" * 40})
+    sink.close()
+
+    stats = sink.stats()
+    assert stats["written"] == 20
+    assert stats["dropped"] == 0
+    assert stats["rotations"] >= 2
+    files = sorted(path.parent.iterdir())
+    assert [file.name for file in files] == ["audit.jsonl", "audit.jsonl.1", "audit.jsonl.2"]
+    for file in files:
+        for line in file.read_text().splitlines():
+            assert json.loads(line)["clamped_fields"] == ["f_time"]
+    assert all(file.stat().st_size <= 200 for file in files)
+    assert sink.emit({"seq": 99}) is False
+
+
+def test_writer_releases_resources_only_after_its_last_batch() -> None:
+    release = threading.Event()
+    events: list[str] = []
+
+    def handler(batch: list[int]) -> None:
+        release.wait(5.0)
+        events.append(f"write {len(batch)}")
+
+    writer = BatchWriter(
+        handler, name="test-writer", batch_size=2, on_stop=lambda: events.append("stop")
+    )
+    assert writer.submit(1) and writer.submit(2)
+    writer.close(timeout=0.05)
+
+    # close timed out with the batch still in flight: nothing is released yet,
+    # later submits are refused and flush does not wait on a closed writer.
+    assert events == []
+    assert writer.submit(3) is False
+    assert writer.flush() is False
+    release.set()
+    writer._thread.join(5.0)
+    assert events == ["write 2", "stop"]
+    assert writer.flush() is True
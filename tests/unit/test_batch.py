@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import io
+import json
+
+import numpy as np
+import pytest
+
+from cip_core.domain_profiles.loader import load_profile_file
+from cip_core.mantic.batch import decode_packed_layers, run_batch_detection, score_batch
+from cip_core.mantic.runtime import run_detection
+from cip_core.sdk.wrappers import load_registry, safe_detect_batch
+
+_ROWS = [[0.62, 0.71, 0.45, 0.58], [1.2, -0.1, 0.5, 0.8], [0.5, 0.5, 0.5, 0.5]]
+
+
+def test_batch_results_match_single_detection(profiles_dir) -> None:
+    profile = load_profile_file(profiles_dir / "signal_core.v2.yaml")
+    payload = run_batch_detection(
+        profile=profile,
+        layer_values=_ROWS,
+        mode="emergence",
+        threshold_override={"detection": 0.45, "alignment": 0.5},
+    )
+
+    assert payload["rows"] == 3
+    assert payload["audit"]["rejected_fields"] == ["threshold_override.alignment"]
+    for idx, row in enumerate(_ROWS):
+        single = run_detection(
+            profile=profile,
+            layer_values=row,
+            mode="emergence",
+            threshold_override={"detection": 0.45, "alignment": 0.5},
+        )
+        assert payload["results"]["m_score"][idx] == pytest.approx(single["result"]["m_score"])
+        assert payload["results"]["alert"][idx] is single["result"]["window_detected"]
+
+
+def test_decode_packed_layers_is_zero_copy_view() -> None:
+    source = np.asarray(_ROWS, dtype="<f8")
+    buffer = memoryview(source.tobytes())
+
+    matrix = decode_packed_layers(buffer, rows=3, layer_count=4, dtype="float64")
+
+    assert matrix.shape == (3, 4)
+    assert np.shares_memory(matrix, np.frombuffer(buffer, dtype="<f8"))
+    assert matrix.tolist() == source.tolist()
+
+
+def test_decode_packed_layers_rejects_size_mismatch_and_bad_dtype() -> None:
+    packed = np.zeros((2, 4), dtype="<f4").tobytes()
+    with pytest.raises(ValueError, match="expected 48"):
+        decode_packed_layers(packed, rows=3, layer_count=4)
+    with pytest.raises(ValueError, match="dtype"):
+        decode_packed_layers(packed, rows=2, layer_count=4, dtype="int8")
+    with pytest.raises(ValueError, match="base64"):
+        decode_packed_layers("not base64!", rows=2, layer_count=4)
+
+
+def test_safe_detect_batch_accepts_raw_buffers(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    packed = np.asarray(_ROWS, dtype="<f4").tobytes()
+
+    payload = safe_detect_batch(
+        registry=registry,
+        profile_name="signal_core",
+        layer_values=packed,
+        rows=3,
+        mode="friction",
+    )
+
+    assert payload["rows"] == 3
+    assert payload["results"]["limiting_factor"][1] == "meso"
+
+    bad = np.asarray([[0.5, np.nan, 0.5, 0.5]], dtype="<f4").tobytes()
+    with pytest.raises(ValueError, match="finite"):
+        safe_detect_batch(
+            registry=registry,
+            profile_name="signal_core",
+            layer_values=bad,
+            rows=1,
+            mode="friction",
+        )
+
+
+def test_detection_batch_views_materialize_lazily(profiles_dir) -> None:
+    profile = load_profile_file(profiles_dir / "signal_core.v2.yaml")
+    batch = score_batch(profile=profile, layer_values=_ROWS, mode="friction", f_time=1.4)
+
+    assert len(batch) == 3
+    assert batch.limiting_codes.dtype == np.int8
+    view = batch[-1]
+    assert view.limiting_factor in profile.layer_names
+    assert not view.is_materialized
+    expected = run_detection(profile=profile, layer_values=_ROWS[2], mode="friction", f_time=1.4)
+    assert dict(view) == expected
+    assert view.is_materialized
+    assert view.m_score == pytest.approx(expected["result"]["m_score"])
+    with pytest.raises(IndexError):
+        batch[3]
+
+
+def test_detection_batch_writes_ndjson(profiles_dir) -> None:
+    profile = load_profile_file(profiles_dir / "signal_core.v2.yaml")
+    batch = score_batch(profile=profile, layer_values=_ROWS, mode="emergence")
+    stream = io.StringIO()
+
+    assert batch.write_ndjson(stream) == 3
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [record["row"] for record in records] == [0, 1, 2]
+    assert records[0]["alert"] is batch[0].alert
+    assert set(records[0]["layer_attribution"]) == set(profile.layer_names)
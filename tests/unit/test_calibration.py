@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from cip_core.mantic.vectorized import resolve_scoring_params, score_matrix
+from cip_core.sdk.calibration import _EXACT_BYTES_PER_ROW, calibrate_threshold
+from cip_core.sdk.wrappers import load_registry
+
+
+def _labelled_rows(seed: int = 3, rows: int = 4_000) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.3, 0.6, size=(rows, 1))
+    spread = rng.uniform(0.0, 0.6, size=(rows, 1))
+    matrix = np.hstack([base, base + spread, base, base - spread / 2])
+    labels = spread[:, 0] > 0.35
+    return np.clip(matrix, 0.0, 1.0), labels
+
+
+def _batches(matrix: np.ndarray, labels: np.ndarray, size: int):
+    for start in range(0, len(labels), size):
+        yield matrix[start : start + size], labels[start : start + size]
+
+
+def test_recommended_threshold_separates_labels(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    matrix, labels = _labelled_rows()
+
+    report = calibrate_threshold(
+        registry=registry,
+        profile_name="signal_core",
+        batches=_batches(matrix, labels, 500),
+        mode="friction",
+    )
+
+    assert report["method"] == "exact"
+    assert report["rows"] == 4_000
+    assert 0 < report["recommended_threshold"] < 1
+    assert report["recommended"]["f_beta"] == pytest.approx(1.0)
+    assert report["recommended"]["f_beta"] >= report["current"]["f_beta"]
+    recalls = [point["recall"] for point in report["curve"]]
+    assert recalls == sorted(recalls, reverse=True)
+
+
+def test_histogram_mode_bounds_memory_and_agrees(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    matrix, labels = _labelled_rows()
+
+    exact = calibrate_threshold(
+        registry=registry,
+        profile_name="signal_core",
+        batches=_batches(matrix, labels, 500),
+        mode="friction",
+    )
+    bounded = calibrate_threshold(
+        registry=registry,
+        profile_name="signal_core",
+        batches=_batches(matrix, labels, 500),
+        mode="friction",
+        memory_budget_bytes=1_000,
+    )
+
+    assert bounded["method"] == "histogram"
+    assert bounded["recommended_threshold"] == pytest.approx(
+        exact["recommended_threshold"], abs=1e-3
+    )
+
+
+def test_max_alert_rate_constrains_recommendation(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    matrix, labels = _labelled_rows()
+
+    report = calibrate_threshold(
+        registry=registry,
+        profile_name="signal_core",
+        batches=[(matrix, labels)],
+        mode="friction",
+        max_alert_rate=0.05,
+    )
+
+    assert report["recommended"]["alert_rate"] <= 0.05
+
+
+def test_calibration_requires_both_classes(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    matrix, labels = _labelled_rows()
+
+    with pytest.raises(ValueError, match="both positive and negative"):
+        calibrate_threshold(
+            registry=registry,
+            profile_name="signal_core",
+            batches=[(matrix, np.zeros_like(labels))],
+            mode="friction",
+        )
+
+
+def test_exact_path_peak_memory_fits_budget(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    matrix, labels = _labelled_rows(rows=100_000)
+    budget = 100_000 * _EXACT_BYTES_PER_ROW
+
+    tracemalloc.start()
+    try:
+        report = calibrate_threshold(
+            registry=registry,
+            profile_name="signal_core",
+            batches=_batches(matrix, labels, 5_000),
+            mode="friction",
+            memory_budget_bytes=budget,
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert report["method"] == "exact"
+    assert peak <= budget
+
+
+def _metrics_at(statistic: np.ndarray, labels: np.ndarray, threshold: float) -> dict[str, float]:
+    alerts = statistic > threshold
+    true_pos = int((alerts & labels).sum())
+    return {
+        "precision": true_pos / int(alerts.sum()) if alerts.any() else 1.0,
+        "recall": true_pos / int(labels.sum()),
+        "alert_rate": float(alerts.mean()),
+    }
+
+
+@pytest.mark.parametrize("memory_budget_bytes", [256 * 1024 * 1024, 1_000])
+def test_reported_metrics_match_rescoring_at_the_recommended_threshold(
+    profiles_dir, memory_budget_bytes
+) -> None:
+    registry = load_registry(profiles_dir)
+    matrix, labels = _labelled_rows()
+    profile = registry.get("signal_core")
+    statistic = score_matrix(resolve_scoring_params(profile, "friction"), matrix)
+    statistic = statistic.detection_statistic
+
+    report = calibrate_threshold(
+        registry=registry,
+        profile_name="signal_core",
+        batches=_batches(matrix, labels, 500),
+        mode="friction",
+        memory_budget_bytes=memory_budget_bytes,
+        histogram_resolution=50,
+    )
+
+    expected = _metrics_at(statistic, labels, report["recommended_threshold"])
+    for key, value in expected.items():
+        assert report["recommended"][key] == pytest.approx(value)
+    for point in report["curve"]:
+        rescored = _metrics_at(statistic, labels, point["threshold"])
+        assert point["recall"] == pytest.approx(rescored["recall"])
+        assert point["alert_rate"] == pytest.approx(rescored["alert_rate"])
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import pytest
+
+from cip_core.domain_profiles.loader import load_profile_file
+from cip_core.mantic.counterfactual import run_threshold_distance
+
+
+def _profile(profiles_dir):
+    return load_profile_file(profiles_dir / "signal_core.v2.yaml")
+
+
+def _rescore(profile, values, mode):
+    return run_threshold_distance(profile=profile, layer_values=values, mode=mode)["rows"][0]
+
+
+@pytest.mark.parametrize(
+    ("mode", "values"),
+    [
+        ("emergence", [0.9, 0.8, 0.3, 0.9]),
+        ("friction", [0.3, 0.3, 0.3, 0.3]),
+        ("friction", [0.9, 0.1, 0.5, 0.5]),
+    ],
+)
+def test_target_lands_statistic_on_threshold_and_flips_alert(profiles_dir, mode, values) -> None:
+    profile = _profile(profiles_dir)
+    payload = run_threshold_distance(profile=profile, layer_values=values, mode=mode)
+
+    row = payload["rows"][0]
+    assert payload["count"] == 1
+    assert row["gap"] == pytest.approx(payload["threshold"] - row["detection_statistic"])
+    checked = 0
+    for idx, name in enumerate(profile.layer_names):
+        layer = row["layers"][name]
+        if not layer["feasible"]:
+            continue
+        moved = list(values)
+        moved[idx] = layer["target_value"]
+        on_boundary = _rescore(profile, moved, mode)
+        assert on_boundary["detection_statistic"] == pytest.approx(payload["threshold"])
+        assert on_boundary["alert"] is False
+
+        if not row["alert"]:
+            # One step further in the same direction crosses the threshold.
+            moved[idx] += 1e-6 if layer["required_delta"] >= 0 else -1e-6
+            assert _rescore(profile, moved, mode)["alert"] is True
+        checked += 1
+    assert checked > 0
+
+
+def test_quiet_row_cheapest_move_raises_alert(profiles_dir) -> None:
+    profile = _profile(profiles_dir)
+    values = [0.3, 0.3, 0.3, 0.3]
+    row = _rescore(profile, values, "friction")
+
+    assert row["alert"] is False
+    name = row["cheapest_layer"]
+    moved = list(values)
+    moved[profile.layer_names.index(name)] += row["cheapest_delta"] * 1.01
+    assert _rescore(profile, moved, "friction")["alert"] is True
+
+
+def test_alerting_row_cheapest_move_clears_alert(profiles_dir) -> None:
+    profile = _profile(profiles_dir)
+    values = [0.9, 0.1, 0.5, 0.5]
+    row = _rescore(profile, values, "friction")
+
+    assert row["alert"] is True
+    name = row["cheapest_layer"]
+    moved = list(values)
+    moved[profile.layer_names.index(name)] = row["layers"][name]["target_value"]
+    assert _rescore(profile, moved, "friction")["alert"] is False
+
+
+def test_unreachable_rows_report_no_cheapest_layer(profiles_dir) -> None:
+    profile = _profile(profiles_dir)
+    payload = run_threshold_distance(
+        profile=profile,
+        # Friction: two far-apart layers keep the range above T whatever one layer does.
+        # Emergence: the floor sits below T in two layers, so no single move alerts.
+        layer_values=[[0.95, 0.0, 0.5, 1.0], [0.1, 0.2, 0.9, 0.9]],
+        mode="friction",
+    )
+    stuck = payload["rows"][0]
+    assert stuck["alert"] is True
+    assert stuck["cheapest_layer"] is None
+    assert stuck["cheapest_delta"] is None
+    assert all(layer["required_delta"] is None for layer in stuck["layers"].values())
+
+    floor = run_threshold_distance(
+        profile=profile, layer_values=[0.1, 0.2, 0.9, 0.9], mode="emergence"
+    )["rows"][0]
+    assert floor["alert"] is False
+    assert floor["cheapest_layer"] is None
+
+
+def test_threshold_override_is_applied_to_target(profiles_dir) -> None:
+    profile = _profile(profiles_dir)
+    payload = run_threshold_distance(
+        profile=profile,
+        layer_values=[0.3, 0.3, 0.3, 0.3],
+        mode="friction",
+        threshold_override={"detection": 0.46},
+    )
+
+    row = payload["rows"][0]
+    assert payload["threshold"] == pytest.approx(0.46)
+    assert row["detection_statistic"] == pytest.approx(0.0)
+    assert row["gap"] == pytest.approx(0.46)
+    assert abs(row["cheapest_delta"]) == pytest.approx(0.46)
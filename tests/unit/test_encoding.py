@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+import pytest
+from fastmcp.tools.tool import FunctionTool
+
+from cip_core.domain_profiles.loader import load_profile_file
+from cip_core.mantic.batch import run_batch_detection
+from cip_core.mantic.runtime import run_detection
+from cip_core.models.encoding import encode_pydantic, get_json_encoder
+
+
+def _corpus(profile) -> list[dict]:
+    kernel = profile.temporal_allowlist[0]
+    temporal_configs = [
+        None,
+        {"kernel_type": kernel, "t": 3, "alpha": 0.5},
+        {"t": 2.0, "kernel_type": kernel, "alpha": 99},
+        {"kernel_type": kernel, "t": float("nan"), "n": 50},
+        {"alpha": "x", "t": "later"},
+    ]
+    envelopes: list[dict] = []
+    rng = np.random.default_rng(11)
+    for temporal, mode, threshold, f_time, interaction in itertools.product(
+        temporal_configs,
+        ["friction", "emergence"],
+        [None, {"detection": 0.9, "unknown": 1}],
+        [1.0, 7.5],
+        [None, [1.3, 1.0, 0.2, 1.0]],
+    ):
+        request = {
+            "mode": mode,
+            "f_time": f_time,
+            "threshold_override": threshold,
+            "temporal_config": temporal,
+            "interaction_override": interaction,
+        }
+        envelopes.append(
+            run_detection(profile=profile, layer_values=rng.random(4).tolist(), **request)
+        )
+        envelopes.append(
+            run_batch_detection(profile=profile, layer_values=rng.random((25, 4)), **request)
+        )
+    envelopes += [
+        {"status": "error", "error": {"code": "unknown_profile", "message": "Unknown 'ü'"}},
+        {"values": [1e16, -2.5e300, 1e-7, 5e-324, -0.0, float("inf")], "big": 2**70},
+        {"text": "1e5 \u2028 \x00", "nested": [[0.1, None], [1, 2]]},
+    ]
+    return envelopes
+
+
+@pytest.mark.asyncio
+async def test_pre_encoded_responses_match_framework_output(profiles_dir) -> None:
+    encode = get_json_encoder("pydantic")
+    profile = load_profile_file(profiles_dir / "signal_core.v2.yaml")
+    for payload in _corpus(profile):
+        framework = await FunctionTool.from_function(lambda p=payload: p, name="echo").run({})
+        text = encode(payload)
+        assert text == framework.content[0].text
+        # The payload is passed through as structured content unchanged.
+        assert encode_pydantic(framework.structured_content) == text
+
+
+def test_unknown_encoder_is_rejected() -> None:
+    assert get_json_encoder("framework") is None
+    assert get_json_encoder("pydantic") is encode_pydantic
+    with pytest.raises(ValueError, match="unknown JSON encoder"):
+        get_json_encoder("orjson")
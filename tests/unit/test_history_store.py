@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from cip_core.persistence.history import DetectionHistoryStore
+from cip_core.persistence.writer import BatchWriter
+from cip_core.sdk.wrappers import load_registry, safe_detect
+
+
+def _envelope(registry, layer_values, mode="friction"):
+    return safe_detect(registry, "signal_core", layer_values, mode)
+
+
+def test_store_pages_entity_history_and_alerts(profiles_dir, tmp_path) -> None:
+    registry = load_registry(profiles_dir)
+    clock = iter(float(t) for t in range(100, 200))
+    store = DetectionHistoryStore(tmp_path / "h.db", clock=lambda: next(clock), batch_size=2)
+    try:
+        for idx in range(5):
+            values = [0.9, 0.1, 0.5, 0.5] if idx % 2 == 0 else [0.5, 0.5, 0.5, 0.5]
+            assert store.record(_envelope(registry, values), entity_id="e1")
+        store.record(_envelope(registry, [0.9, 0.1, 0.5, 0.5]), entity_id="e2")
+        assert store.flush()
+
+        page = store.entity_history("signal_core", "e1", limit=3)
+        assert page["count"] == 3
+        assert [item["created_at"] for item in page["items"]] == sorted(
+            (item["created_at"] for item in page["items"]), reverse=True
+        )
+        rest = store.entity_history("signal_core", "e1", limit=3, cursor=page["next_cursor"])
+        assert rest["count"] == 2
+        assert rest["next_cursor"] is None
+
+        alerts = store.recent_alerts("signal_core")
+        assert alerts["count"] == 4
+        assert {item["entity_id"] for item in alerts["items"]} == {"e1", "e2"}
+        with pytest.raises(ValueError, match="invalid cursor"):
+            store.recent_alerts("signal_core", cursor="!!")
+    finally:
+        store.close()
+
+
+def test_store_compacts_rows_past_retention(profiles_dir, tmp_path) -> None:
+    registry = load_registry(profiles_dir)
+    now = [0.0]
+    store = DetectionHistoryStore(
+        tmp_path / "h.db",
+        retention_days=1,
+        compaction_interval=1e9,
+        compaction_rows=None,
+        clock=lambda: now[0],
+    )
+    try:
+        store.record(_envelope(registry, [0.5, 0.5, 0.5, 0.5]), entity_id="old")
+        now[0] = 2 * 86_400.0
+        store.record(_envelope(registry, [0.5, 0.5, 0.5, 0.5]), entity_id="new")
+        store.flush()
+        assert store.compact() == 1
+        assert store.stats()["rows"] == 1
+    finally:
+        store.close()
+
+
+def test_store_compacts_on_row_budget_without_going_idle(profiles_dir, tmp_path) -> None:
+    registry = load_registry(profiles_dir)
+    now = [0.0]
+    store = DetectionHistoryStore(
+        tmp_path / "h.db",
+        retention_days=1,
+        compaction_interval=1e9,
+        compaction_rows=2,
+        clock=lambda: now[0],
+    )
+    try:
+        store.record(_envelope(registry, [0.5, 0.5, 0.5, 0.5]), entity_id="old")
+        now[0] = 2 * 86_400.0
+        for _ in range(2):
+            store.record(_envelope(registry, [0.5, 0.5, 0.5, 0.5]), entity_id="new")
+        assert store.flush()
+        stats = store.stats()
+        assert stats["compacted"] == 1
+        assert stats["rows"] == 2
+    finally:
+        store.close()
+
+
+def test_batch_writer_flush_times_out_while_a_batch_is_blocked() -> None:
+    release = threading.Event()
+    writer = BatchWriter(lambda batch: release.wait(), name="test-writer", flush_interval=0.01)
+    try:
+        writer.submit("record")
+        assert writer.flush(timeout=0.05) is False
+        release.set()
+        assert writer.flush(timeout=5.0) is True
+    finally:
+        release.set()
+        writer.close()
+
+
+def test_batch_writer_counts_drops_and_drains_on_close() -> None:
+    release = threading.Event()
+    written: list[int] = []
+
+    def handler(batch: list[int]) -> None:
+        release.wait(5)
+        written.extend(batch)
+
+    writer = BatchWriter(handler, name="test-writer", batch_size=10, max_queue=2)
+    accepted = [writer.submit(idx) for idx in range(6)]
+    assert accepted.count(False) >= 1
+    release.set()
+    writer.close()
+
+    stats = writer.stats()
+    assert stats["dropped"] == accepted.count(False)
+    assert sorted(written) == [idx for idx, ok in enumerate(accepted) if ok]
+    assert writer.submit(99) is False
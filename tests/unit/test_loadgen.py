@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from cip_core.server.loadgen import _layer_count, latency_summary, parse_mix, tool_arguments
+
+
+def test_parse_mix_weights_and_defaults() -> None:
+    assert parse_mix("mantic_detect=8, health_check") == {"mantic_detect": 8.0, "health_check": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("health_check=0")
+
+
+def test_summary_reports_percentiles_and_error_rate() -> None:
+    summary = latency_summary([0.001 * step for step in range(1, 101)], errors=5, elapsed=2.0)
+    assert summary["requests"] == 100
+    assert summary["error_rate"] == pytest.approx(0.05)
+    assert summary["throughput_rps"] == pytest.approx(50.0)
+    assert summary["latency_ms"]["p50"] == pytest.approx(50.5)
+    assert summary["latency_ms"]["p99"] == pytest.approx(99.01)
+
+
+def test_detection_rows_are_sized_from_the_profile_listing() -> None:
+    listing = {
+        "profiles": [
+            {"domain_name": "signal_core", "version": "1.0.0", "layer_names": ["a", "b", "c"]},
+            {"domain_name": "signal_core", "version": "2.0.0", "layer_names": ["a"] * 6},
+        ]
+    }
+    assert _layer_count(listing, "signal_core@2.0.0") == 6
+    assert _layer_count(listing, "signal_core") == 3
+    with pytest.raises(RuntimeError, match="not registered"):
+        _layer_count(listing, "missing")
+
+    arguments = tool_arguments("mantic_detect", "signal_core", 6, random.Random(0))
+    assert len(arguments["layer_values"]) == 6
+    assert tool_arguments("health_check", "signal_core", 6, random.Random(0)) == {}
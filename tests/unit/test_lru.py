@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import pytest
+
+from cip_core.utils import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used_and_counts() -> None:
+    cache = LRUCache(max_entries=2)
+    calls: list[str] = []
+
+    def _compute(key: str):
+        return lambda: calls.append(key) or key.upper()
+
+    assert cache.get_or_compute("a", _compute("a")) == "A"
+    cache.get_or_compute("b", _compute("b"))
+    cache.get_or_compute("a", _compute("a"))
+    cache.get_or_compute("c", _compute("c"))
+    cache.get_or_compute("b", _compute("b"))
+
+    assert calls == ["a", "b", "c", "b"]
+    assert cache.stats() == {"size": 2, "max_entries": 2, "hits": 1, "misses": 4, "evictions": 2}
+    cache.clear()
+    assert cache.stats()["size"] == 0
+    with pytest.raises(ValueError):
+        LRUCache(max_entries=0)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+
+from cip_core.domain_profiles.loader import load_profile_file
+from cip_core.mantic.batch import score_batch
+from cip_core.mantic.overrides import (
+    canonical_key,
+    clear_temporal_cache,
+    temporal_cache_stats,
+)
+from cip_core.mantic.runtime import run_detection
+
+
+def test_canonical_key_ignores_insertion_order_but_not_types() -> None:
+    assert canonical_key({"t": 1.0, "kernel_type": "s_curve"}) == canonical_key(
+        {"kernel_type": "s_curve", "t": 1.0}
+    )
+    assert canonical_key({"t": 1}) != canonical_key({"t": 1.0})
+    assert canonical_key({"t": object()}) is None
+
+
+def test_cached_temporal_config_keeps_envelope_byte_identical(profiles_dir) -> None:
+    profile = load_profile_file(profiles_dir / "signal_core.v2.yaml")
+    kernel = profile.temporal_allowlist[0]
+    configs = [
+        {"kernel_type": kernel, "t": 3, "alpha": 99.0},
+        {"alpha": 99.0, "t": 3, "kernel_type": kernel},
+        {"t": "soon"},
+    ]
+    clear_temporal_cache()
+
+    def _envelopes() -> list[str]:
+        return [
+            json.dumps(
+                run_detection(
+                    profile=profile,
+                    layer_values=[0.3, 0.6, 0.9, 0.4],
+                    mode="friction",
+                    threshold_override={"detection": 0.5},
+                    temporal_config=config,
+                ),
+                default=str,
+            )
+            for config in configs
+        ]
+
+    cold = _envelopes()
+    warm = _envelopes()
+    assert warm == cold
+    assert "temporal_config.alpha" in json.loads(cold[0])["audit"]["clamped_fields"]
+    assert json.loads(cold[2])["audit"]["rejected_fields"] == [
+        "temporal_config.kernel_type",
+        "temporal_config.t",
+    ]
+    assert list(json.loads(cold[0])["audit"]["overrides_applied"]) == [
+        "threshold_overrides",
+        "temporal_config",
+        "f_time",
+    ]
+    stats = temporal_cache_stats()
+    assert stats["misses"] == 2
+    assert stats["hits"] == 4
+
+
+def test_cached_audit_is_not_shared_between_responses(profiles_dir) -> None:
+    profile = load_profile_file(profiles_dir / "signal_core.v2.yaml")
+    config = {"kernel_type": profile.temporal_allowlist[0], "t": 2, "alpha": 99.0}
+    first = run_detection(
+        profile=profile, layer_values=[0.5] * 4, mode="friction", temporal_config=config
+    )
+    first["audit"]["overrides_applied"]["temporal_config"]["clamped"].clear()
+    second = run_detection(
+        profile=profile, layer_values=[0.5] * 4, mode="friction", temporal_config=config
+    )
+    assert second["audit"]["overrides_applied"]["temporal_config"]["clamped"]
+
+    batch = score_batch(profile, [[0.5] * 4], "friction", temporal_config=config)
+    batch.params.overrides_applied["temporal_config"]["clamped"].clear()
+    again = score_batch(profile, [[0.5] * 4], "friction", temporal_config=config)
+    assert again.params.overrides_applied["temporal_config"]["clamped"]
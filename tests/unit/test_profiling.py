@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+
+from cip_core.observability.profiling import RequestProfiler
+from cip_core.sdk.wrappers import load_registry, safe_detect
+
+
+def test_profiler_window_expires_after_seconds(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    now = [0.0]
+    profiler = RequestProfiler(clock=lambda: now[0])
+    profiler.start(seconds=5)
+
+    with profiler.profile_request():
+        safe_detect(registry, "signal_core", [0.6, 0.5, 0.4, 0.7], "emergence")
+    now[0] = 6.0
+    with profiler.profile_request():
+        safe_detect(registry, "signal_core", [0.6, 0.5, 0.4, 0.7], "emergence")
+
+    report = profiler.report(top_n=5)
+    assert report["active"] is False
+    assert report["profiled_requests"] == 1
+    assert len(report["functions"]) <= 5
+    assert report["functions"][0]["cumulative_ms"] >= report["functions"][-1]["cumulative_ms"]
+    assert all(row["count"] > 0 for row in report["allocations"])
+
+
+def test_profiler_requires_a_budget() -> None:
+    with pytest.raises(ValueError, match="requests and/or seconds"):
+        RequestProfiler().start()
@@ -26,3 +26,34 @@ def test_registry_get_unknown_profile_raises(profiles_dir) -> None:
     registry = DomainProfileRegistry.from_directory(profiles_dir)
     with pytest.raises(KeyError):
         registry.get("does_not_exist")
+
+
+def test_registry_serves_versions_side_by_side(profiles_dir) -> None:
+    profile = load_profile_file(profiles_dir / "signal_core.v2.yaml")
+    newer = profile.model_copy(update={"version": "10.0.0"})
+    older = profile.model_copy(update={"version": "1.9.0"})
+    registry = DomainProfileRegistry([profile, newer, older])
+
+    assert len(registry) == 1
+    assert registry.get("signal_core") is newer
+    assert registry.get("signal_core", "1.9.0") is older
+    assert registry.get(f"signal_core@{profile.version}") is profile
+    assert registry.versions("signal_core") == ["1.9.0", profile.version, "10.0.0"]
+
+    listing = registry.list()
+    assert [entry["version"] for entry in listing] == ["10.0.0"]
+    assert listing[0]["versions"] == ["1.9.0", profile.version, "10.0.0"]
+    listing[0]["versions"].clear()
+    listing[0]["layer_names"].append("tampered")
+    assert registry.list()[0]["versions"] == ["1.9.0", profile.version, "10.0.0"]
+    assert "tampered" not in newer.layer_names
+    assert [entry["latest"] for entry in registry.list(all_versions=True)] == [
+        False,
+        False,
+        True,
+    ]
+
+    with pytest.raises(KeyError, match="Unknown version"):
+        registry.get("signal_core", "3.0.0")
+    with pytest.raises(KeyError, match="Conflicting versions"):
+        registry.get("signal_core@1.9.0", "10.0.0")
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from cip_core.sdk.async_wrappers import adetect_from_translator, adetect_many
+from cip_core.sdk.translator import TranslationResult
+from cip_core.sdk.wrappers import load_registry
+
+
+class _ConnectorTranslator:
+    def __init__(self, delay: float = 0.05) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+
+    async def translate(self, raw_context: Mapping[str, Any]) -> TranslationResult:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(raw_context.get("delay", self.delay))
+            if raw_context.get("fail"):
+                raise ConnectionError("connector unavailable")
+            return TranslationResult(layer_values=list(raw_context["layer_values"]))
+        finally:
+            self.in_flight -= 1
+
+
+class _BlockingTranslator:
+    def translate(self, raw_context: Mapping[str, Any]) -> TranslationResult:
+        time.sleep(0.05)
+        return TranslationResult(layer_values=list(raw_context["layer_values"]))
+
+
+@pytest.mark.asyncio
+async def test_adetect_from_translator_runs_detection(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+
+    result = await adetect_from_translator(
+        registry=registry,
+        profile_name="signal_core",
+        translator=_ConnectorTranslator(delay=0),
+        raw_context={"layer_values": [0.62, 0.71, 0.45, 0.58]},
+        mode="friction",
+    )
+
+    assert result["status"] == "ok"
+    assert "m_score" in result["result"]
+
+
+@pytest.mark.asyncio
+async def test_adetect_many_overlaps_latency_under_concurrency_limit(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    translator = _ConnectorTranslator()
+    contexts = [{"layer_values": [0.1 * idx, 0.5, 0.5, 0.5]} for idx in range(8)]
+
+    started = time.perf_counter()
+    results = await adetect_many(
+        registry=registry,
+        profile_name="signal_core",
+        translator=translator,
+        raw_contexts=contexts,
+        mode="friction",
+        concurrency=4,
+    )
+    elapsed = time.perf_counter() - started
+
+    assert translator.peak == 4
+    assert elapsed < 8 * translator.delay
+    assert [result["layer_values"][0] for result in results] == pytest.approx(
+        [0.1 * idx for idx in range(8)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_adetect_many_captures_timeouts_and_errors(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    contexts = [
+        {"layer_values": [0.5, 0.5, 0.5, 0.5], "delay": 0},
+        {"layer_values": [0.5, 0.5, 0.5, 0.5], "delay": 1.0},
+        {"layer_values": [0.5, 0.5, 0.5, 0.5], "delay": 0, "fail": True},
+        {"layer_values": [0.5, 0.5], "delay": 0},
+    ]
+
+    results = await adetect_many(
+        registry=registry,
+        profile_name="signal_core",
+        translator=_ConnectorTranslator(),
+        raw_contexts=contexts,
+        mode="emergence",
+        timeout=0.1,
+    )
+
+    assert results[0]["status"] == "ok"
+    assert [result.get("error", {}).get("code") for result in results[1:]] == [
+        "timeout",
+        "translation_error",
+        "runtime_error",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_adetect_many_offloads_blocking_translators(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+
+    started = time.perf_counter()
+    results = await adetect_many(
+        registry=registry,
+        profile_name="signal_core",
+        translator=_BlockingTranslator(),
+        raw_contexts=[{"layer_values": [0.5, 0.5, 0.5, 0.5]}] * 4,
+        mode="friction",
+        concurrency=4,
+    )
+
+    assert all(result["status"] == "ok" for result in results)
+    assert time.perf_counter() - started < 0.2
+
+
+@pytest.mark.asyncio
+async def test_adetect_many_pulls_contexts_lazily(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    translator = _ConnectorTranslator(delay=0.01)
+    finished: list[int] = []
+    ahead: list[int] = []
+
+    class _Counting(_ConnectorTranslator):
+        async def translate(self, raw_context: Mapping[str, Any]) -> TranslationResult:
+            try:
+                return await translator.translate(raw_context)
+            finally:
+                finished.append(1)
+
+    def _contexts():
+        for idx in range(10):
+            ahead.append(idx - len(finished))
+            yield {"layer_values": [0.05 * idx, 0.5, 0.5, 0.5]}
+
+    results = await adetect_many(
+        registry=registry,
+        profile_name="signal_core",
+        translator=_Counting(),
+        raw_contexts=_contexts(),
+        mode="friction",
+        concurrency=2,
+    )
+
+    # Contexts are pulled only as workers free up, never all up front.
+    assert max(ahead) <= 2
+    assert [result["layer_values"][0] for result in results] == pytest.approx(
+        [0.05 * idx for idx in range(10)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_adetect_many_keeps_input_order_when_later_contexts_finish_first(
+    profiles_dir,
+) -> None:
+    contexts = [
+        {"layer_values": [0.1 * idx, 0.5, 0.5, 0.5], "delay": 0.01 * (5 - idx)}
+        for idx in range(6)
+    ]
+
+    results = await adetect_many(
+        registry=load_registry(profiles_dir),
+        profile_name="signal_core",
+        translator=_ConnectorTranslator(),
+        raw_contexts=iter(contexts),
+        mode="friction",
+        concurrency=3,
+    )
+
+    assert [result["layer_values"][0] for result in results] == pytest.approx(
+        [0.1 * idx for idx in range(6)]
+    )
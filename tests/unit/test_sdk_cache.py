@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import pytest
+
+from cip_core.sdk.cache import CachingTranslator, context_fingerprint
+from cip_core.sdk.translator import TranslationResult
+from cip_core.sdk.wrappers import detect_from_translator, load_registry
+
+
+class _CountingTranslator:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.batches: list[int] = []
+
+    def translate(self, raw_context: Mapping[str, Any]) -> TranslationResult:
+        self.calls += 1
+        return TranslationResult(layer_values=list(raw_context["layer_values"]))
+
+    def translate_many(self, raw_contexts: Sequence[Mapping[str, Any]]) -> list[TranslationResult]:
+        self.batches.append(len(raw_contexts))
+        return [self.translate(raw_context) for raw_context in raw_contexts]
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_fingerprint_is_order_independent_and_versioned() -> None:
+    first = context_fingerprint({"a": 1, "b": [1, 2]}, "v1")
+    assert first == context_fingerprint({"b": [1, 2], "a": 1}, "v1")
+    assert first != context_fingerprint({"a": 1, "b": [1, 2]}, "v2")
+    assert first != context_fingerprint({"a": 1, "b": [2, 1]}, "v1")
+
+
+def test_fingerprint_rejects_values_without_a_stable_form() -> None:
+    assert context_fingerprint({"tags": {"b", "a"}}, "v1") == context_fingerprint(
+        {"tags": {"a", "b"}}, "v1"
+    )
+    with pytest.raises(TypeError, match="object"):
+        context_fingerprint({"handle": object()}, "v1")
+
+
+def test_cache_hits_return_independent_copies(profiles_dir) -> None:
+    inner = _CountingTranslator()
+    cache = CachingTranslator(inner, version="v1")
+    context = {"layer_values": [0.62, 0.71, 0.45, 0.58]}
+
+    first = cache.translate(context)
+    first.layer_values[0] = 0.0
+    second = cache.translate(dict(context))
+    second.layer_values.append(1.0)
+    third = cache.translate(context)
+
+    assert inner.calls == 1
+    assert second is not third
+    assert third.layer_values == [0.62, 0.71, 0.45, 0.58]
+
+    result = detect_from_translator(
+        registry=load_registry(profiles_dir),
+        profile_name="signal_core",
+        translator=cache,
+        raw_context=context,
+        mode="friction",
+    )
+    assert result["status"] == "ok"
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used_and_expires() -> None:
+    clock = _FakeClock()
+    inner = _CountingTranslator()
+    cache = CachingTranslator(inner, version="v1", max_entries=2, ttl_seconds=10, clock=clock)
+    a, b, c = ({"layer_values": [value] * 4} for value in (0.1, 0.2, 0.3))
+
+    cache.translate(a)
+    cache.translate(b)
+    cache.translate(a)
+    cache.translate(c)
+    assert cache.stats()["evictions"] == 1
+
+    cache.translate(a)
+    assert inner.calls == 3
+    cache.translate(b)
+    assert inner.calls == 4
+
+    clock.now = 11
+    cache.translate(b)
+    stats = cache.stats()
+    assert inner.calls == 5
+    assert stats["expirations"] == 1
+    assert stats["size"] == 2
+
+
+def test_translate_many_forwards_only_misses() -> None:
+    inner = _CountingTranslator()
+    cache = CachingTranslator(inner, version="v1")
+    contexts = [{"layer_values": [value] * 4} for value in (0.1, 0.2, 0.3)]
+
+    cache.translate(contexts[1])
+    results = cache.translate_many(contexts)
+
+    assert inner.batches == [2]
+    assert [result.layer_values[0] for result in results] == [0.1, 0.2, 0.3]
+
+
+class _DetailedTranslator(_CountingTranslator):
+    def translate(self, raw_context: Mapping[str, Any]) -> TranslationResult:
+        self.calls += 1
+        return TranslationResult(
+            layer_values=list(raw_context["layer_values"]),
+            details={"sources": ["feed"], "meta": {"stale": False}},
+        )
+
+
+def test_mutating_a_hit_does_not_change_later_hits() -> None:
+    inner = _DetailedTranslator()
+    cache = CachingTranslator(inner, version="v1")
+    context = {"layer_values": [0.62, 0.71, 0.45, 0.58]}
+
+    first = cache.translate(context)
+    first.details["sources"].append("tampered")
+    first.details["meta"]["stale"] = True
+    second = cache.translate(context)
+    second.details.clear()
+    third = cache.translate_many([context])[0]
+
+    assert inner.calls == 1
+    assert third.details == {"sources": ["feed"], "meta": {"stale": False}}
+    assert third.layer_values == [0.62, 0.71, 0.45, 0.58]
+
+
+def test_unfingerprintable_contexts_bypass_the_cache() -> None:
+    inner = _CountingTranslator()
+    cache = CachingTranslator(inner, version="v1")
+    context = {"layer_values": [0.5] * 4, "connection": object()}
+
+    cache.translate(context)
+    cache.translate(context)
+    cache.translate_many([context, {"layer_values": [0.5] * 4}])
+
+    stats = cache.stats()
+    assert inner.calls == 4
+    assert stats["uncacheable"] == 3
+    assert stats["size"] == 1
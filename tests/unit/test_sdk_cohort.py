@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from cip_core.domain_profiles.loader import load_profile_file
+from cip_core.domain_profiles.registry import DomainProfileRegistry
+from cip_core.mantic.runtime import run_detection
+from cip_core.sdk.cohort import ScoredCohort
+from cip_core.sdk.wrappers import load_registry
+
+
+def _random_rows(seed: int, count: int) -> dict[str, list[float]]:
+    rng = np.random.default_rng(seed)
+    return {f"e{idx}": rng.random(4).tolist() for idx in range(count)}
+
+
+def test_apply_delta_rescores_only_changed_rows(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    cohort = ScoredCohort(registry, "signal_core", "friction", top_k=5)
+    rows = _random_rows(0, 50)
+    first = cohort.apply_delta(upserts=rows)
+    assert first["added"] == 50
+
+    changed = {"e1": [0.9, 0.1, 0.9, 0.1], "e2": rows["e2"], "new": [0.2, 0.8, 0.2, 0.8]}
+    summary = cohort.apply_delta(upserts=changed, removals=["e3", "e4", "missing"])
+    assert summary["updated"] == 1
+    assert summary["unchanged"] == 1
+    assert summary["added"] == 1
+    assert summary["removed"] == 2
+    assert summary["unknown_removals"] == 1
+    assert summary["rescored"] == 2
+    assert len(cohort) == 49
+
+    rows.update(changed)
+    del rows["e3"], rows["e4"]
+    fresh = ScoredCohort(registry, "signal_core", "friction", top_k=5)
+    fresh.apply_delta(upserts=rows)
+    aggregates, expected = cohort.aggregates(), fresh.aggregates()
+    assert aggregates["alerts"] == expected["alerts"]
+    assert aggregates["limiting_factor_counts"] == expected["limiting_factor_counts"]
+    assert aggregates["m_score_mean"] == pytest.approx(expected["m_score_mean"])
+    assert aggregates["m_score_std"] == pytest.approx(expected["m_score_std"])
+    assert cohort.top_alerts() == fresh.top_alerts()
+
+    record = cohort.get("e1")
+    envelope = run_detection(
+        profile=registry.get("signal_core"), layer_values=changed["e1"], mode="friction"
+    )
+    assert record["m_score"] == pytest.approx(envelope["result"]["m_score"])
+    assert record["alert"] is (envelope["result"]["alert"] is not None)
+
+
+def test_profile_version_change_invalidates_rows(profiles_dir) -> None:
+    profile = load_profile_file(profiles_dir / "signal_core.v2.yaml")
+    registry = DomainProfileRegistry([profile])
+    cohort = ScoredCohort(registry, "signal_core", "emergence")
+    cohort.apply_delta(upserts={"a": [0.6, 0.6, 0.6, 0.6], "b": [0.1, 0.2, 0.3, 0.4]})
+    assert cohort.aggregates()["alerts"] == 1
+
+    stricter = profile.model_copy(
+        update={"version": "9.9.9", "thresholds": {**profile.thresholds, "detection": 0.7}}
+    )
+    registry.register(stricter)
+    assert cohort.refresh() is True
+    assert cohort.profile_version == "9.9.9"
+    assert cohort.aggregates()["alerts"] == 0
+    assert cohort.top_alerts() == []
+
+
+def test_save_and_load_round_trip(profiles_dir, tmp_path) -> None:
+    registry = load_registry(profiles_dir)
+    cohort = ScoredCohort(registry, "signal_core", "friction", top_k=3, f_time=1.5)
+    cohort.apply_delta(upserts=_random_rows(1, 20))
+    cohort.save(tmp_path / "cohort.npz")
+
+    restored = ScoredCohort.load(registry, tmp_path / "cohort.npz")
+    assert len(restored) == 20
+    restored_aggregates, aggregates = restored.aggregates(), cohort.aggregates()
+    assert restored_aggregates["alerts"] == aggregates["alerts"]
+    assert restored_aggregates["m_score_mean"] == pytest.approx(aggregates["m_score_mean"])
+    assert restored.top_alerts() == cohort.top_alerts()
+    assert restored.get("e7") == cohort.get("e7")
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from cip_core.sdk import offline
+from cip_core.sdk.offline import score_npy_dataset
+from cip_core.sdk.wrappers import load_registry, safe_detect_batch
+
+
+def _write_input(tmp_path, rows: int = 1_000):
+    matrix = np.random.default_rng(5).uniform(0, 1, size=(rows, 4))
+    path = tmp_path / "layers.npy"
+    np.save(path, matrix)
+    return path, matrix
+
+
+def test_score_npy_dataset_writes_columnar_outputs(profiles_dir, tmp_path) -> None:
+    registry = load_registry(profiles_dir)
+    input_path, matrix = _write_input(tmp_path)
+
+    summary = score_npy_dataset(
+        registry=registry,
+        profile_name="signal_core",
+        input_path=input_path,
+        output_dir=tmp_path / "out",
+        mode="friction",
+        chunk_rows=128,
+    )
+
+    expected = safe_detect_batch(
+        registry=registry, profile_name="signal_core", layer_values=matrix, mode="friction"
+    )["results"]
+    m_score = np.load(tmp_path / "out" / "m_score.npy")
+    alert = np.load(tmp_path / "out" / "alert.npy")
+    limiting = np.load(tmp_path / "out" / "limiting_factor.npy")
+    attribution = np.load(tmp_path / "out" / "attribution.npy")
+
+    assert summary["chunks_processed"] == 8
+    assert summary["alerts"] == sum(expected["alert"])
+    assert m_score.tolist() == pytest.approx(expected["m_score"])
+    assert alert.tolist() == expected["alert"]
+    assert [summary["layer_names"][idx] for idx in limiting] == expected["limiting_factor"]
+    assert attribution.shape == (1_000, 4)
+    assert json.loads((tmp_path / "out" / "checkpoint.json").read_text())["complete"] is True
+
+
+def test_killed_job_resumes_from_checkpoint(profiles_dir, tmp_path, monkeypatch) -> None:
+    registry = load_registry(profiles_dir)
+    input_path, _ = _write_input(tmp_path)
+    kwargs = {
+        "registry": registry,
+        "profile_name": "signal_core",
+        "input_path": input_path,
+        "output_dir": tmp_path / "out",
+        "mode": "emergence",
+        "chunk_rows": 300,
+    }
+    reference = score_npy_dataset(**{**kwargs, "output_dir": tmp_path / "reference"})
+
+    real_score = offline.score_matrix
+    calls = {"count": 0}
+
+    def _dies_on_third_chunk(params, matrix):
+        calls["count"] += 1
+        if calls["count"] == 3:
+            raise KeyboardInterrupt
+        return real_score(params, matrix)
+
+    monkeypatch.setattr(offline, "score_matrix", _dies_on_third_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        score_npy_dataset(**kwargs)
+    checkpoint = json.loads((tmp_path / "out" / "checkpoint.json").read_text())
+    assert checkpoint["next_row"] == 600
+    assert checkpoint["complete"] is False
+
+    monkeypatch.setattr(offline, "score_matrix", real_score)
+    resumed = score_npy_dataset(**kwargs)
+
+    assert resumed["resumed_from_row"] == 600
+    assert resumed["chunks_processed"] == 2
+    assert resumed["alerts"] == reference["alerts"]
+    assert np.array_equal(
+        np.load(tmp_path / "out" / "m_score.npy"),
+        np.load(tmp_path / "reference" / "m_score.npy"),
+    )
+
+
+def test_resume_rejects_checkpoint_from_different_job(profiles_dir, tmp_path) -> None:
+    registry = load_registry(profiles_dir)
+    input_path, _ = _write_input(tmp_path, rows=10)
+    kwargs = {
+        "registry": registry,
+        "profile_name": "signal_core",
+        "input_path": input_path,
+        "output_dir": tmp_path / "out",
+    }
+    score_npy_dataset(mode="friction", **kwargs)
+
+    with pytest.raises(ValueError, match="different job"):
+        score_npy_dataset(mode="emergence", **kwargs)
+    restarted = score_npy_dataset(mode="emergence", resume=False, **kwargs)
+    assert restarted["resumed_from_row"] == 0
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from cip_core.mantic.batch import score_batch
+from cip_core.sdk.rollup import GroupRollup, rollup_groups
+from cip_core.sdk.wrappers import load_registry
+
+
+def _entities(seed: int, count: int, groups: int):
+    rng = np.random.default_rng(seed)
+    keys = [f"acct-{code}" for code in rng.integers(0, groups, count)]
+    return keys, rng.random((count, 4)), rng.random(count) + 0.1
+
+
+@pytest.mark.parametrize("aggregation", ["mean", "weighted", "worst_case"])
+def test_streamed_rollup_matches_direct_group_by(profiles_dir, aggregation) -> None:
+    registry = load_registry(profiles_dir)
+    keys, matrix, weights = _entities(3, 1000, 37)
+    records = (
+        (key, row, weight) for key, row, weight in zip(keys, matrix.tolist(), weights, strict=True)
+    )
+    payload = rollup_groups(
+        registry, "signal_core", records, "friction", aggregation=aggregation, chunk_rows=97
+    )
+
+    profile = registry.get("signal_core")
+    members = score_batch(profile, matrix, "friction")
+    expected_rows = []
+    for key in payload["results"]["group"]:
+        rows = np.array([index for index, item in enumerate(keys) if item == key])
+        if aggregation == "mean":
+            expected_rows.append(matrix[rows].mean(axis=0))
+        elif aggregation == "weighted":
+            expected_rows.append(np.average(matrix[rows], axis=0, weights=weights[rows]))
+        else:
+            statistic = members.detection_statistic[rows]
+            expected_rows.append(matrix[rows[int(np.argmax(statistic))]])
+    expected = score_batch(profile, np.array(expected_rows), "friction")
+
+    results = payload["results"]
+    assert payload["entities"] == 1000
+    assert payload["groups"] == len(set(keys)) == len(results["group"])
+    assert sum(results["members"]) == 1000
+    assert sum(results["member_alerts"]) == int(members.alert.sum())
+    np.testing.assert_allclose(results["layer_values"], expected_rows, rtol=1e-5)
+    np.testing.assert_allclose(results["m_score"], expected.m_score, rtol=1e-5)
+    assert results["alert"] == expected.alert.tolist()
+
+
+def test_group_envelope_and_validation(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    rollup = GroupRollup(registry, "signal_core", "friction", aggregation="worst_case")
+    rollup.add(["a", "a", "b"], [[0.5] * 4, [0.9, 0.1, 0.9, 0.1], [0.2] * 4])
+    envelope = rollup.envelope("a")
+    assert envelope["layer_values"] == [0.9, 0.1, 0.9, 0.1]
+    assert envelope["group"]["members"] == 2
+    assert envelope["group"]["member_alerts"] == 1
+    assert envelope["result"]["alert"]
+
+    with pytest.raises(ValueError, match="only used"):
+        rollup.add(["a"], [[0.5] * 4], weights=[1.0])
+    with pytest.raises(ValueError, match="entries for"):
+        rollup.add(["a", "b"], [[0.5] * 4])
+    with pytest.raises(KeyError):
+        rollup.envelope("missing")
+
+    weighted = GroupRollup(registry, "signal_core", "friction", aggregation="weighted")
+    weighted.add(["z"], [[0.5] * 4], weights=[0.0])
+    with pytest.raises(ValueError, match="zero total weight"):
+        weighted.score()
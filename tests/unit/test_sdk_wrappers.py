@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping, Sequence
 from typing import Any
 
+import pytest
+
 from cip_core.sdk.translator import TranslationResult
-from cip_core.sdk.wrappers import detect_from_translator, load_registry
+from cip_core.sdk.wrappers import (
+    detect_from_translator,
+    detect_stream_from_translator,
+    load_registry,
+    safe_detect,
+)
 
 
 class _EchoTranslator:
@@ -13,6 +20,18 @@ class _EchoTranslator:
         return TranslationResult(layer_values=list(values), details={"source": "test"})
 
 
+class _ChunkTranslator:
+    def __init__(self) -> None:
+        self.chunk_sizes: list[int] = []
+
+    def translate(self, raw_context: Mapping[str, Any]) -> TranslationResult:
+        raise AssertionError("translate_many should be preferred")
+
+    def translate_many(self, raw_contexts: Sequence[Mapping[str, Any]]) -> list[TranslationResult]:
+        self.chunk_sizes.append(len(raw_contexts))
+        return [TranslationResult(layer_values=list(ctx["layer_values"])) for ctx in raw_contexts]
+
+
 def test_detect_from_translator_runs_detection(profiles_dir) -> None:
     registry = load_registry(profiles_dir)
     translator = _EchoTranslator()
@@ -44,3 +63,53 @@ def test_detect_from_translator_passes_f_time(profiles_dir) -> None:
     )
 
     assert result["result"]["overrides_applied"]["f_time"]["requested"] == 1.9
+
+
+def test_detect_stream_uses_translate_many_in_bounded_chunks(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+    translator = _ChunkTranslator()
+    pulled: list[int] = []
+
+    def _contexts() -> Iterator[dict[str, Any]]:
+        for idx in range(7):
+            pulled.append(idx)
+            yield {"layer_values": [0.1 * idx, 0.5, 0.5, 0.5]}
+
+    stream = detect_stream_from_translator(
+        registry=registry,
+        profile_name="signal_core",
+        translator=translator,
+        raw_contexts=_contexts(),
+        mode="friction",
+        chunk_size=3,
+    )
+
+    first = next(stream)
+    single = safe_detect(registry, "signal_core", [0.0, 0.5, 0.5, 0.5], mode="friction")
+    assert not first.is_materialized
+    assert first.m_score == pytest.approx(single["result"]["m_score"])
+    assert first["layer_values"] == [0.0, 0.5, 0.5, 0.5]
+    assert len(pulled) == 3
+
+    rest = list(stream)
+    assert len(rest) == 6
+    assert translator.chunk_sizes == [3, 3, 1]
+    assert rest[-1]["layer_values"][0] == pytest.approx(0.6)
+
+
+def test_detect_stream_falls_back_to_single_translate(profiles_dir) -> None:
+    registry = load_registry(profiles_dir)
+
+    results = list(
+        detect_stream_from_translator(
+            registry=registry,
+            profile_name="signal_core",
+            translator=_EchoTranslator(),
+            raw_contexts=[{"layer_values": [0.62, 0.71, 0.45, 0.58]}] * 2,
+            mode="emergence",
+            profile_version="2.0.0",
+        )
+    )
+
+    assert [result["mode"] for result in results] == ["emergence", "emergence"]
+    assert results[0]["domain_profile"]["version"] == "2.0.0"
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from cip_core.domain_profiles.loader import load_profile_file
+from cip_core.domain_profiles.registry import DomainProfileRegistry
+from cip_core.mantic.shadow import ShadowScorer, parse_shadow_candidates
+
+
+@pytest.fixture
+def versions(profiles_dir):
+    profile = load_profile_file(profiles_dir / "signal_core.v2.yaml")
+    return profile, profile.model_copy(update={"version": "2.1.0"})
+
+
+def test_parse_shadow_candidates_requires_versions() -> None:
+    assert parse_shadow_candidates("signal_core@2.1.0, other@1.0.0") == {
+        "signal_core": "2.1.0",
+        "other": "1.0.0",
+    }
+    assert parse_shadow_candidates(None) == {}
+    with pytest.raises(ValueError, match="name@version"):
+        parse_shadow_candidates("signal_core")
+
+
+def test_identical_candidate_shows_no_divergence(versions) -> None:
+    primary, candidate = versions
+    scorer = ShadowScorer(DomainProfileRegistry([primary, candidate]), {"signal_core": "2.1.0"})
+    rows = np.random.default_rng(3).random((50, 4))
+    assert scorer.submit(primary, rows, mode="friction") == 50
+    assert scorer.submit(primary, rows[0], mode="friction", f_time=1.2) == 1
+    assert scorer.submit(candidate, rows, mode="friction") == 0
+    scorer.flush()
+
+    stats = scorer.stats()
+    scorer.close()
+    [comparison] = stats["comparisons"]
+    assert comparison["rows"] == 51
+    assert comparison["m_score_delta"]["max"] == pytest.approx(0.0)
+    assert comparison["m_score_delta"]["abs_p99"] <= 0.001
+    assert comparison["alerts"]["flip_rate"] == 0.0
+    assert comparison["limiting_factor"]["changed"] == 0
+    assert stats["skipped_rows"] == {"same_version": 50}
+
+
+def test_sampling_and_layer_mismatch_are_counted(versions) -> None:
+    primary, candidate = versions
+    scorer = ShadowScorer(
+        DomainProfileRegistry([primary, candidate]),
+        {"signal_core": "2.1.0"},
+        sample_rate=0.25,
+        seed=7,
+    )
+    queued = scorer.submit(primary, np.full((400, 4), 0.5), mode="emergence")
+    assert 60 < queued < 140
+    assert scorer.submit(primary, [0.5, 0.5, 0.5], mode="friction") == 0
+    scorer.flush()
+
+    stats = scorer.stats()
+    scorer.close()
+    assert stats["seen_rows"] == 401
+    assert stats["sampled_rows"] == queued
+    assert stats["skipped_rows"] == {"layer_mismatch": 1}
+    with pytest.raises(ValueError):
+        scorer.set_sample_rate(1.5)
+
+
+def test_queued_rows_are_bounded(versions) -> None:
+    primary, candidate = versions
+    scorer = ShadowScorer(
+        DomainProfileRegistry([primary, candidate]),
+        {"signal_core": "2.1.0"},
+        max_queued_rows=100,
+    )
+    assert scorer.submit(primary, np.full((60, 4), 0.5), mode="friction") == 60
+    assert scorer.submit(primary, np.full((150, 4), 0.5), mode="friction") == 0
+    scorer.flush()
+
+    stats = scorer.stats()
+    scorer.close()
+    assert stats["skipped_rows"] == {"queue_full": 150}
+    assert stats["queued_rows"] == 0
+    [comparison] = stats["comparisons"]
+    assert comparison["rows"] == 60
+    assert comparison["m_score_delta"]["max"] == pytest.approx(0.0)
+
+
+def test_a_failing_group_does_not_drop_the_rest_of_the_batch(versions) -> None:
+    primary, candidate = versions
+    candidate = candidate.model_copy(update={"temporal_allowlist": ["linear"]})
+    scorer = ShadowScorer(
+        DomainProfileRegistry([primary, candidate]),
+        {"signal_core": "2.1.0"},
+        batch_size=2,
+        flush_interval=5.0,
+    )
+    memory = {"kernel_type": "memory", "t": 1.0}
+    assert scorer.submit(primary, np.full((3, 4), 0.5), mode="friction", temporal_config=memory)
+    assert scorer.submit(primary, np.full((5, 4), 0.5), mode="friction") == 5
+    scorer.flush()
+
+    stats = scorer.stats()
+    scorer.close()
+    assert stats["skipped_rows"] == {"candidate_error": 3}
+    assert stats["queued_rows"] == 0
+    [comparison] = stats["comparisons"]
+    assert comparison["rows"] == 5
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+
+from cip_core.observability.tracing import (
+    InMemorySpanExporter,
+    current_trace_id,
+    set_span_exporter,
+    span,
+    trace_context,
+)
+from cip_core.sdk.wrappers import load_registry, safe_detect, safe_score_batch
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    previous = set_span_exporter(exporter)
+    yield exporter
+    set_span_exporter(previous)
+
+
+def test_spans_are_noop_without_exporter() -> None:
+    with span("anything", profile="x") as current:
+        current.set_attribute("ignored", 1)
+        assert current.trace_id is None
+
+
+def test_safe_detect_spans_nest_under_caller_trace(profiles_dir, exporter) -> None:
+    registry = load_registry(profiles_dir)
+    with trace_context("caller-trace") as trace_id:
+        assert current_trace_id() == trace_id
+        safe_detect(registry, "signal_core", [0.5, 0.6, 0.4, 0.5], "friction")
+
+    spans = {item.name: item for item in exporter.spans}
+    assert set(spans) >= {
+        "sdk.safe_detect",
+        "registry.get",
+        "mantic.run_detection",
+        "mantic.detect",
+        "mantic.envelope",
+    }
+    assert {item.trace_id for item in exporter.spans} == {"caller-trace"}
+    root = spans["sdk.safe_detect"]
+    assert root.parent_id is None
+    assert spans["registry.get"].parent_id == root.span_id
+    assert spans["mantic.detect"].parent_id == spans["mantic.run_detection"].span_id
+    assert spans["mantic.run_detection"].attributes["profile"] == "signal_core"
+    assert "m_score" in spans["mantic.run_detection"].attributes
+    assert all(item.duration_ms >= 0 for item in exporter.spans)
+
+
+def test_batch_span_records_size_and_errors(profiles_dir, exporter) -> None:
+    registry = load_registry(profiles_dir)
+    safe_score_batch(registry, "signal_core", [[0.5] * 4] * 3, "emergence")
+    assert exporter.find("mantic.score_batch")[0].attributes["batch_size"] == 3
+
+    with pytest.raises(KeyError):
+        safe_detect(registry, "missing", [0.5] * 4, "friction")
+    failed = exporter.find("registry.get")[-1]
+    assert failed.status == "error"
+    assert failed.error.startswith("KeyError")
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from cip_core.server.loadgen import local_server
+from cip_core.server.transport_bench import (
+    STATELESS_JSON_ENV,
+    call_tool_json,
+    run_transport_benchmark,
+)
+
+
+def test_stateless_json_mode_answers_single_post_without_session() -> None:
+    async def _call(url: str) -> dict:
+        async with httpx.AsyncClient(timeout=30.0) as http:
+            return await call_tool_json(
+                http,
+                url,
+                "mantic_detect",
+                {"profile_name": "signal_core", "layer_values": [0.5, 0.5, 0.5, 0.5]},
+            )
+
+    with local_server(env=STATELESS_JSON_ENV) as url:
+        result = asyncio.run(_call(url))
+
+    assert result["isError"] is False
+    assert result["structuredContent"]["status"] == "ok"
+
+
+def test_transport_benchmark_reports_every_mode() -> None:
+    report = run_transport_benchmark(requests=3, warmup=0, tool="health_check")
+    assert set(report["modes"]) == {"session_per_call", "reused_session", "stateless_json"}
+    assert all(mode["requests"] == 3 and mode["errors"] == 0 for mode in report["modes"].values())
+    assert report["speedup"] > 0
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import pytest
+
+from cip_core.domain_profiles.loader import load_profile_file
+from cip_core.mantic.uncertainty import run_uncertainty
+
+
+def _profile(profiles_dir):
+    return load_profile_file(profiles_dir / "signal_core.v2.yaml")
+
+
+def test_uncertainty_is_reproducible_for_a_seed(profiles_dir) -> None:
+    profile = _profile(profiles_dir)
+    kwargs = {
+        "profile": profile,
+        "layer_values": [0.6, 0.7, 0.5, 0.4],
+        "mode": "friction",
+        "layer_std": [0.05, 0.1, 0.05, 0.2],
+        "samples": 2_000,
+        "tolerance": 0.0,
+    }
+
+    first = run_uncertainty(seed=7, **kwargs)
+    second = run_uncertainty(seed=7, **kwargs)
+    other = run_uncertainty(seed=8, **kwargs)
+
+    assert first["distribution"] == second["distribution"]
+    assert first["alert_probability"] == second["alert_probability"]
+    assert first["distribution"] != other["distribution"]
+    assert first["sampling"]["samples_used"] == 2_000
+    assert first["sampling"]["stop_reason"] == "max_samples"
+
+
+def test_zero_width_uncertainty_collapses_to_point_estimate(profiles_dir) -> None:
+    profile = _profile(profiles_dir)
+    payload = run_uncertainty(
+        profile=profile,
+        layer_values=[0.6, 0.7, 0.5, 0.4],
+        mode="emergence",
+        layer_intervals=[[0.6, 0.6], [0.7, 0.7], [0.5, 0.5], [0.4, 0.4]],
+        samples=5_000,
+        chunk_size=100,
+    )
+
+    point = payload["point_estimate"]["m_score"]
+    assert payload["distribution"]["percentiles"]["p50"] == pytest.approx(point)
+    assert payload["distribution"]["std"] == pytest.approx(0.0)
+    assert payload["alert_probability"] in {0.0, 1.0}
+    assert payload["sampling"]["stop_reason"] == "converged"
+    # Agreeing draws give a zero SE at once, but convergence waits for the minimum.
+    assert payload["sampling"]["samples_used"] == 1_000
+
+
+def test_rare_alerts_do_not_converge_after_two_chunks(profiles_dir) -> None:
+    profile = _profile(profiles_dir)
+    payload = run_uncertainty(
+        profile=profile,
+        layer_values=[0.5, 0.5, 0.5, 0.5],
+        mode="friction",
+        layer_std=[0.02, 0.02, 0.02, 0.02],
+        samples=20_000,
+        chunk_size=10,
+        tolerance=0.001,
+    )
+
+    assert payload["alert_probability"] == 0.0
+    assert payload["sampling"]["stop_reason"] == "converged"
+    assert payload["sampling"]["samples_used"] == 3_000
+
+
+def test_rejects_multi_row_layer_values(profiles_dir) -> None:
+    profile = _profile(profiles_dir)
+    with pytest.raises(ValueError, match="1-D"):
+        run_uncertainty(
+            profile=profile,
+            layer_values=[[0.5] * 4, [0.6] * 4],
+            mode="friction",
+            layer_std=[0.1] * 4,
+        )
+
+
+def test_deadline_stops_sampling_early(profiles_dir) -> None:
+    profile = _profile(profiles_dir)
+    payload = run_uncertainty(
+        profile=profile,
+        layer_values=[0.6, 0.7, 0.5, 0.4],
+        mode="friction",
+        layer_std=[0.2, 0.2, 0.2, 0.2],
+        samples=50_000,
+        chunk_size=10,
+        tolerance=0.0,
+        deadline_ms=0.0,
+    )
+
+    assert payload["sampling"]["stop_reason"] == "deadline"
+    assert payload["sampling"]["samples_used"] == 10
+
+
+def test_requires_exactly_one_uncertainty_source(profiles_dir) -> None:
+    profile = _profile(profiles_dir)
+    with pytest.raises(ValueError, match="exactly one"):
+        run_uncertainty(profile=profile, layer_values=[0.5] * 4, mode="friction")
+    with pytest.raises(ValueError, match="layer_intervals"):
+        run_uncertainty(
+            profile=profile,
+            layer_values=[0.5] * 4,
+            mode="friction",
+            layer_intervals=[[0.6, 0.4]] * 4,
+        )
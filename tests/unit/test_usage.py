@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import pytest
+
+from cip_core.server.usage import (
+    OVERFLOW_KEY,
+    RateLimits,
+    TokenBucket,
+    UsageAccountant,
+    _request_rows,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_and_allows_oversized_cost_into_debt() -> None:
+    bucket = TokenBucket(rate=10.0, burst_seconds=1.0, now=0.0)
+    assert bucket.wait_seconds(25, now=0.0) == 0.0
+    bucket.take(25)
+    assert bucket.wait_seconds(1, now=0.0) == pytest.approx(1.6)
+    assert bucket.wait_seconds(1, now=1.6) == 0.0
+
+
+def test_accountant_limits_clients_and_profiles_independently() -> None:
+    clock = _Clock()
+    accountant = UsageAccountant(
+        RateLimits(client_requests_per_second=2, profile_rows_per_second=100), clock=clock
+    )
+    assert accountant.admit("a", "signal_core", 60) is None
+    assert accountant.admit("a", "signal_core", 1) is None
+    limited = accountant.admit("a", "signal_core", 1)
+    assert limited["scope"] == "client"
+    assert limited["retry_after_seconds"] == pytest.approx(0.5)
+
+    # Client "b" has its own request bucket but shares the profile's row bucket,
+    # and a rejected call charges neither.
+    limited = accountant.admit("b", "signal_core", 50)
+    assert (limited["scope"], limited["unit"]) == ("profile", "rows")
+    assert accountant.admit("b", "signal_core", 39) is None
+
+    clock.now = 1.0
+    assert accountant.admit("a", "other", 1) is None
+
+    accountant.record("a", "signal_core", 60, cpu_seconds=0.002, wall_seconds=0.003, ok=True)
+    accountant.record("b", None, 0, cpu_seconds=0.001, wall_seconds=0.001, ok=False)
+    snapshot = accountant.snapshot()
+    assert snapshot["clients"]["a"] == {
+        "requests": 1,
+        "rows": 60,
+        "errors": 0,
+        "rate_limited": 1,
+        "cpu_ms": 2.0,
+        "wall_ms": 3.0,
+    }
+    assert snapshot["clients"]["b"]["errors"] == 1
+    assert snapshot["profiles"]["signal_core"]["rate_limited"] == 2
+    assert list(snapshot["clients"]) == ["a", "b"]
+
+
+def test_untracked_identities_share_an_overflow_entry() -> None:
+    accountant = UsageAccountant(max_tracked=2)
+    for client in ("a", "b", "c", "d"):
+        accountant.record(client, None, 1, cpu_seconds=0.0, wall_seconds=0.0, ok=True)
+    clients = accountant.snapshot()["clients"]
+    assert set(clients) == {"a", "b", OVERFLOW_KEY}
+    assert clients[OVERFLOW_KEY]["requests"] == 2
+
+
+def test_idle_identities_are_evicted_instead_of_overflowing() -> None:
+    clock = _Clock()
+    accountant = UsageAccountant(
+        RateLimits(client_requests_per_second=1.0), max_tracked=2, idle_seconds=10.0, clock=clock
+    )
+    for client in ("a", "b"):
+        assert accountant.admit(client, None, 1) is None
+    clock.now += 5.0
+    assert accountant.admit("a", None, 1) is None
+    clock.now += 6.0
+    # "b" has been idle for 11s and is evicted with its bucket; "a" is still active.
+    assert accountant.admit("c", None, 1) is None
+    snapshot = accountant.snapshot()
+    assert set(snapshot["clients"]) == {"a", "c"}
+    assert snapshot["evicted_clients"] == 1
+    assert snapshot["tracked_buckets"] == 2
+    # Both tracked identities are active, so a burst of new ones overflows.
+    assert accountant.admit("d", None, 1) is None
+    assert accountant.admit("e", None, 1) is not None
+    assert OVERFLOW_KEY in accountant.snapshot()["clients"]
+
+
+def test_reset_drops_refilled_buckets_but_keeps_draining_ones() -> None:
+    clock = _Clock()
+    accountant = UsageAccountant(RateLimits(client_requests_per_second=1.0), clock=clock)
+    assert accountant.admit("idle", None, 1) is None
+    clock.now += 5.0
+    assert accountant.admit("busy", None, 1) is None
+    accountant.reset()
+    snapshot = accountant.snapshot()
+    assert snapshot["clients"] == {}
+    assert snapshot["tracked_buckets"] == 1
+    assert accountant.admit("busy", None, 1) is not None
+
+
+def test_request_rows_charges_scored_vectors_and_uncertainty_samples() -> None:
+    assert _request_rows("mantic_detect", {"layer_values": [0.5] * 4}) == 1
+    assert _request_rows("mantic_detect_batch", {"layer_values": [[0.5] * 4] * 3}) == 3
+    assert _request_rows("mantic_detect_batch", {"layer_values_b64": "AA==", "rows": 7}) == 7
+    assert _request_rows("list_domain_profiles", {}) == 0
+    uncertainty = {"layer_values": [0.5] * 4, "samples": 2_500}
+    assert _request_rows("mantic_detect_uncertainty", uncertainty) == 2_500
+    assert _request_rows("mantic_detect_uncertainty", {"layer_values": [0.5] * 4}) == 10_000
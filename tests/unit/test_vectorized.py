@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from cip_core.domain_profiles.loader import load_profile_file
+from cip_core.mantic.runtime import run_detection
+from cip_core.mantic.vectorized import (
+    HIERARCHY_LEVELS,
+    coerce_layer_matrix,
+    resolve_scoring_params,
+    score_matrix,
+)
+
+_ROWS = [
+    [0.6, 0.7, 0.5, 0.4],
+    [0.9, 0.1, 0.5, 0.8],
+    [0.45, 0.5, 0.48, 0.52],
+    [0.0, 0.0, 0.0, 0.0],
+]
+
+
+def _profile(profiles_dir):
+    return load_profile_file(profiles_dir / "signal_core.v2.yaml")
+
+
+@pytest.mark.parametrize("mode", ["friction", "emergence"])
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        {"f_time": 2.2, "threshold_override": {"detection": 0.3}},
+        {"temporal_config": {"kernel_type": "s_curve", "t": 2.0, "alpha": 0.3}},
+        {"interaction_override": [1.5, 0.5, 1.0, 3.0], "interaction_override_mode": "replace"},
+    ],
+)
+def test_score_matrix_matches_run_detection(profiles_dir, mode, overrides) -> None:
+    profile = _profile(profiles_dir)
+    params = resolve_scoring_params(profile, mode, **overrides)
+    scores = score_matrix(params, coerce_layer_matrix(_ROWS, 4))
+
+    for idx, row in enumerate(_ROWS):
+        expected = run_detection(profile=profile, layer_values=row, mode=mode, **overrides)
+        result = expected["result"]
+        assert scores.m_score[idx] == pytest.approx(result["m_score"])
+        assert list(scores.attribution[idx]) == pytest.approx(
+            list(result["layer_attribution"].values())
+        )
+        if mode == "friction":
+            assert bool(scores.alert[idx]) is (result["alert"] is not None)
+        else:
+            assert bool(scores.alert[idx]) is result["window_detected"]
+        assert params.overrides_applied == result["overrides_applied"]
+        assert scores.coherence[idx] == pytest.approx(result["layer_coupling"]["coherence"])
+        assert (
+            HIERARCHY_LEVELS[scores.dominant_index[idx]] == result["layer_visibility"]["dominant"]
+        )
+
+
+def test_coerce_layer_matrix_clamps_and_promotes_vectors() -> None:
+    matrix = coerce_layer_matrix([1.2, -0.2, 0.5, 0.4], 4)
+    assert matrix.shape == (1, 4)
+    assert matrix.tolist() == [[1.0, 0.0, 0.5, 0.4]]
+
+
+def test_coerce_layer_matrix_rejects_bad_shapes_and_values() -> None:
+    with pytest.raises(ValueError, match="must be \\(rows, 4\\)"):
+        coerce_layer_matrix([[0.1, 0.2, 0.3]], 4)
+    with pytest.raises(ValueError, match="finite"):
+        coerce_layer_matrix(np.array([[0.1, np.nan, 0.3, 0.4]]), 4)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from cip_core.domain_profiles.registry import DomainProfileRegistry
+from cip_core.server.warmup import DEFERRED_MODULES, LAZY_MODULES, import_timings, warm_up
+
+
+def test_warm_up_primes_every_profile_version(profiles_dir) -> None:
+    registry = DomainProfileRegistry.from_directory(profiles_dir)
+    report = warm_up(registry)
+
+    versions = len(registry.list(all_versions=True))
+    assert report["warmed"] is True
+    assert report["profiles_warmed"] == versions
+    assert report["detections"] == versions * 4
+    assert "failures" not in report
+    assert set(report["imports_ms"]) == set(LAZY_MODULES)
+    assert report["warmup_ms"] > 0
+    assert all(value == 0.0 for value in import_timings().values())
+
+
+def test_sdk_import_is_lazy() -> None:
+    probe = (
+        "import sys\n"
+        "import cip_core.sdk as sdk\n"
+        "assert 'cip_core.sdk.wrappers' not in sys.modules\n"
+        "sdk.safe_score_batch\n"
+        "assert 'cip_core.sdk.wrappers' in sys.modules\n"
+        "assert 'cip_core.sdk.async_wrappers' not in sys.modules\n"
+        "assert 'yaml' not in sys.modules\n"
+        "assert 'safe_score_batch' in dir(sdk)\n"
+    )
+    subprocess.run([sys.executable, "-c", probe], check=True)
+
+
+def test_scoring_imports_do_not_load_deferred_modules() -> None:
+    for entry in ("cip_core.mantic.runtime", "cip_core.observability"):
+        timings = import_timings(DEFERRED_MODULES, after=entry)
+        assert set(timings) == set(DEFERRED_MODULES)
+        assert all(value > 0.0 for value in timings.values()), (entry, timings)
+    assert import_timings(("cip_core.observability.profiling",), after="cip_core.server.app") == {
+        "cip_core.observability.profiling": 0.0
+    }
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+import pytest
+
+from cip_core.server.loadgen import local_server
+from cip_core.server.workers import WorkerMetrics, worker_path
+
+
+def test_worker_metrics_aggregate_per_slot_counters() -> None:
+    metrics = WorkerMetrics(2)
+    metrics.mark_started(0, 101)
+    metrics.mark_started(1, 102)
+    metrics.bind(0)
+    metrics.record(ok=True)
+    metrics.record(ok=False)
+    metrics.bind(1)
+    metrics.record(ok=True)
+    metrics.mark_exited(1, restarting=True)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["alive"] == 1
+    assert snapshot["requests"] == 3
+    assert snapshot["errors"] == 1
+    assert snapshot["restarts"] == 1
+    assert [worker["requests"] for worker in snapshot["per_worker"]] == [2, 1]
+    assert snapshot["per_worker"][1]["pid"] == 0
+
+
+def test_worker_metrics_ignore_unbound_process() -> None:
+    metrics = WorkerMetrics(1)
+    metrics.record(ok=True)
+    assert metrics.snapshot()["requests"] == 0
+    with pytest.raises(ValueError):
+        WorkerMetrics(0)
+
+
+def test_worker_path_suffixes_the_file_stem() -> None:
+    assert worker_path("/var/log/cip/audit.jsonl", 3) == "/var/log/cip/audit.worker3.jsonl"
+    assert worker_path("audit", 0) == "audit.worker0"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork mode needs os.fork")
+def test_prefork_workers_write_their_own_audit_files(tmp_path) -> None:
+    from fastmcp import Client
+
+    async def _clamp(url: str) -> None:
+        async with Client(url) as client:
+            for _ in range(6):
+                await client.call_tool(
+                    "mantic_detect",
+                    {"profile_name": "signal_core", "layer_values": [0.5] * 4, "f_time": 9.0},
+                )
+
+    audit_path = tmp_path / "audit.jsonl"
+    env = {"CIP_WORKERS": "2", "CIP_AUDIT_LOG_PATH": str(audit_path)}
+    with local_server(env=env) as url:
+        asyncio.run(_clamp(url))
+
+    # Workers flush their sinks on shutdown; nothing writes the shared base path.
+    assert not audit_path.exists()
+    written = sorted(path.name for path in tmp_path.glob("audit.worker*.jsonl"))
+    assert written and set(written) <= {"audit.worker0.jsonl", "audit.worker1.jsonl"}
+    lines = sum(len(path.read_text().splitlines()) for path in tmp_path.glob("audit.worker*"))
+    assert lines == 6
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork mode needs os.fork")
+def test_prefork_server_reports_pool_from_any_worker() -> None:
+    from fastmcp import Client
+
+    async def _health(url: str) -> dict:
+        async with Client(url) as client:
+            await client.call_tool("list_domain_profiles", {})
+            result = await client.call_tool("health_check", {})
+            return result.structured_content
+
+    with local_server(env={"CIP_WORKERS": "2"}) as url:
+        payload = asyncio.run(_health(url))
+
+    assert payload["status"] == "ok"
+    assert payload["workers"]["workers"] == 2
+    assert payload["workers"]["alive"] == 2
+    assert payload["workers"]["requests"] >= 1
+    # Workers serve the parent's load and warmup timings instead of re-warming.
+    assert payload["startup"]["warmed"] is True
+    assert payload["startup"]["registry_load_ms"] > 0
+    assert payload["startup"]["detections"] > 0